@@ -0,0 +1,47 @@
+""" Benchmarks serial against parallel glyph rasterization.
+
+Usage: python bench_parallel_raster.py [jobs] [cell] [last code]
+Defaults: one job per CPU, 48x48 cells, code points 32-1023 of FreeSerifBold.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+from colossus_ltsm.font_engine import FontEngine, make_params
+
+TTF = Path(__file__).resolve().parents[1] / "ttf" / "FreeSerifBold.ttf"
+
+
+class QuietEngine(FontEngine):
+    """Engine without log output, so only the timings are printed."""
+
+    def _log(self, message, level="info"):
+        pass
+
+
+def run(params):
+    """Convert once with a fresh engine, return (seconds, output)."""
+    started = time.perf_counter()
+    output = QuietEngine().convert_font(str(TTF), params)
+    return time.perf_counter() - started, output
+
+
+def main():
+    """Time both paths and check they agree."""
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    cell = int(sys.argv[2]) if len(sys.argv) > 2 else 48
+    end = int(sys.argv[3]) if len(sys.argv) > 3 else 1023
+    params = make_params(width=cell, height=cell, start=32, end=end)
+    print(f"FreeSerifBold {cell}x{cell}, {end - 31} code points, {jobs} job(s)")
+    serial_time, serial = run(params)
+    parallel_time, parallel = run(dict(params, jobs=jobs))
+    print(f"serial   {serial_time:7.2f} s")
+    print(f"parallel {parallel_time:7.2f} s  speedup x{serial_time / parallel_time:.2f}")
+    print("outputs identical" if serial == parallel else "OUTPUTS DIFFER")
+    return 0 if serial == parallel else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+""" Benchmark suite for the converter and viewer hot paths.
+
+Times ink extent scanning, glyph block generation, the horizontal and
+vertical packers (plus pack/unpack of every registered layout), array
+composition, header parsing and PNG image creation in the viewer, for every
+font in extras/ttf at several cell sizes. Results are saved as JSON so runs
+on different versions can be compared.
+
+Usage:
+    python run_benchmarks.py -o before.json
+    python run_benchmarks.py -o after.json --sizes 16x16 --filter pack
+    python run_benchmarks.py --compare before.json after.json --tolerance 10
+"""
+
+# pylint: disable=protected-access
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+import PIL
+
+from colossus_ltsm import __version__
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_viewer import FontViewer
+from colossus_ltsm.packers import PACKERS
+
+TTF_DIR = Path(__file__).resolve().parents[1] / "ttf"
+DEFAULT_SIZES = "8x8,16x16,32x32"
+
+
+class QuietEngine(FontEngine): # pylint: disable=too-few-public-methods
+    """Engine without log output, so only the timings are printed."""
+
+    def _log(self, message, level="info"):
+        pass
+
+
+def _viewer(layout):
+    """Viewer with just the state the image export needs, no Tk window."""
+    viewer = object.__new__(FontViewer)
+    viewer.addr_mode_var = SimpleNamespace(get=lambda: layout)
+    viewer.cols = 16
+    viewer.glyph_color = "#0078FF"
+    viewer.background_color = "#FFFFFF"
+    return viewer
+
+
+def font_cases(ttf, width, height, workdir):
+    """(name, callable) pairs for one font and cell size."""
+    tag = f"{ttf.stem}/{width}x{height}"
+    params = make_params(width=width, height=height, start=32, end=126,
+                         font_name="bench", output_name="bench")
+    engine = QuietEngine()
+    font = engine.open_font(str(ttf), params)
+    # A fresh engine per call, the rasterization cache would hide the work
+    blocks = QuietEngine()._generate_glyph_blocks(font, params)
+    control = [width, height, 32, 94]
+    header = Path(workdir) / f"{ttf.stem}_{width}x{height}.hpp"
+    header.write_text(engine._compose_output(control, blocks, params), encoding="utf-8")
+    viewer = _viewer("horizontal")
+    font_bytes = viewer._parse_font_file(str(header))
+    return [
+        (f"scan_ink_extents/{tag}", lambda: engine._scan_ink_extents(font, 32, 126)),
+        (f"generate_glyph_blocks/{tag}",
+         lambda: QuietEngine()._generate_glyph_blocks(font, params)),
+        (f"compose_output/{tag}", lambda: engine._compose_output(control, blocks, params)),
+        (f"parse_font_file/{tag}", lambda: viewer._parse_font_file(str(header))),
+        (f"create_font_image/{tag}", lambda: viewer._create_font_image(font_bytes)),
+    ]
+
+
+def packer_cases(ttf, width, height):
+    """(name, callable) pairs packing one font's glyph cells at one size."""
+    tag = f"{width}x{height}"
+    params = make_params(width=width, height=height, start=32, end=126)
+    engine = QuietEngine()
+    cache = engine._rasterize_glyphs(engine.open_font(str(ttf), params), params)
+    images = [engine._threshold_glyph(glyph.gray, params) for glyph in cache.glyphs]
+    cases = [
+        (f"pack_horizontal/{tag}",
+         lambda: [engine._pack_horizontal(img, width, height) for img in images]),
+        (f"pack_vertical/{tag}",
+         lambda: [engine._pack_vertical(img, width, height) for img in images]),
+    ]
+    for packer in PACKERS.values():
+        if width % packer.width_multiple or height % packer.height_multiple:
+            continue
+        data = [packer.pack(img) for img in images]
+        cases.append((f"pack/{packer.name}/{tag}",
+                      lambda p=packer: [p.pack(img) for img in images]))
+        cases.append((f"unpack/{packer.name}/{tag}",
+                      lambda p=packer, d=data: [p.unpack(b, width, height) for b in d]))
+    return cases
+
+
+def measure(func, repeat, min_time):
+    """Best seconds per call over repeat rounds of at least min_time each."""
+    timer = timeit.Timer(func)
+    loops = 1
+    while True:
+        if timer.timeit(loops) >= min_time:
+            break
+        loops *= 2
+    best = min(timer.timeit(loops) for _ in range(repeat)) / loops
+    return {'seconds': best, 'loops': loops, 'repeat': repeat}
+
+
+def parse_sizes(text):
+    """Parse "8x8,16x16" into [(8, 8), (16, 16)]."""
+    return [tuple(int(v) for v in item.lower().split("x")) for item in text.split(",") if item]
+
+
+def run(args):
+    """Run the selected cases, print and save the results."""
+    fonts = [TTF_DIR / name for name in args.fonts] if args.fonts \
+        else sorted(TTF_DIR.glob("*.ttf"))
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        cases = []
+        for width, height in parse_sizes(args.sizes):
+            cases += packer_cases(fonts[0], width, height)
+            for ttf in fonts:
+                cases += font_cases(ttf, width, height, workdir)
+        for name, func in cases:
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = measure(func, args.repeat, args.min_time)
+            print(f"{name:<52} {results[name]['seconds'] * 1e3:10.3f} ms")
+    report = {
+        'meta': {
+            'version': __version__,
+            'python': platform.python_version(),
+            'pillow': PIL.__version__,
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'date': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'results': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved {len(results)} results: {args.output}")
+    return 0
+
+
+def compare(old_path, new_path, tolerance):
+    """Print new/old time ratios, return 1 when a case slowed beyond tolerance %."""
+    old = json.loads(Path(old_path).read_text(encoding="utf-8"))
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))
+    print(f"{old['meta']['version']} -> {new['meta']['version']}")
+    slower = 0
+    for name in sorted(set(old['results']) & set(new['results'])):
+        before = old['results'][name]['seconds']
+        after = new['results'][name]['seconds']
+        change = 100 * (after - before) / before
+        flag = ""
+        if change > tolerance:
+            flag = "  SLOWER"
+            slower += 1
+        elif change < -tolerance:
+            flag = "  faster"
+        print(f"{name:<52} {before * 1e3:9.3f} {after * 1e3:9.3f} ms {change:+7.1f}%{flag}")
+    print(f"{slower} case(s) slower by more than {tolerance}%")
+    return 1 if slower else 0
+
+
+def main():
+    """Run the suite, or compare two result files."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0].strip())
+    parser.add_argument("-o", "--output", help="save results to this JSON file")
+    parser.add_argument("--fonts", nargs="+", help="font files in extras/ttf (default all)")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="cell sizes (default %(default)s)")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5, help="rounds per case (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="minimum seconds per round (default 0.2)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--tolerance", type=float, default=10,
+                        help="percent slowdown reported as a regression (default 10)")
+    args = parser.parse_args()
+    if args.compare:
+        return compare(*args.compare, args.tolerance)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
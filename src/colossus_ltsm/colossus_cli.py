@@ -0,0 +1,457 @@
+"""
+Command line interface for Colossus, converts TTF fonts without the GUI.
+
+Usage:
+    colossus-cli convert FONT.ttf -o my_font.hpp --width 16 --height 16
+    colossus-cli convert FONT.ttf -o my_font.hpp -f gfx -f u8g2 -f lvgl
+    colossus-cli convert FONT.ttf -o my_font.hpp --corpus src/ --corpus lang/de.po
+    colossus-cli convert FONT.ttf -o my_font.hpp --manifest --depfile my_font.hpp.d
+    colossus-cli corpus src/ lang/de.po
+    colossus-cli budget FONT.ttf --budget 4096 --formats array,u8g2
+    colossus-cli ladder FONT.ttf -o my_font.hpp --sizes 8x8,16x16,24x24,32x32
+    colossus-cli layouts
+    colossus-cli diff old_font.hpp new_font.hpp -o changes.png
+    colossus-cli fonts mono --covers 32-126
+    colossus-cli serve --port 8765 -j 4
+    colossus-cli watch fonts.json
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from colossus_ltsm import __version__
+from colossus_ltsm.font_engine import DEFAULT_PARAMS, FontEngine, make_params, write_output
+from colossus_ltsm.packers import PACKERS, layout_names
+from colossus_ltsm.font_exporters import EXPORTERS, export_path
+from colossus_ltsm.font_coverage import MISSING_MODES
+from colossus_ltsm.draw_cost import DRAW_TARGETS
+from colossus_ltsm.font_subset import corpus_files, scan_corpus
+from colossus_ltsm.instrumentation import Instruments, json_sink
+from colossus_ltsm.font_manifest import (build_manifest, is_up_to_date, manifest_path,
+                                         write_depfile, write_manifest)
+from colossus_ltsm.font_ladder import compose_family, convert_ladder, ladder_path, parse_sizes
+from colossus_ltsm.font_service import (DEFAULT_CACHE_SIZE, DEFAULT_PORT, LOCALHOST,
+                                        ConversionService)
+from colossus_ltsm.font_watch import DEFAULT_INTERVAL, DEFAULT_SETTLE, Watcher
+from colossus_ltsm.font_catalog import FontCatalog, default_font_dirs
+from colossus_ltsm.font_diff import diff_fonts, load_glyphs, render_diff
+from colossus_ltsm.font_budget import (BUDGET_FORMATS, DEFAULT_SIZES, BudgetPlanner,
+                                       parse_ranges)
+
+
+def _add_convert_options(parser):
+    """Options shared by every sub-command that runs a conversion."""
+    parser.add_argument("-W", "--width", type=int, default=DEFAULT_PARAMS['width'],
+                        help="cell width in pixels (default %(default)s)")
+    parser.add_argument("-H", "--height", type=int, default=DEFAULT_PARAMS['height'],
+                        help="cell height in pixels (default %(default)s)")
+    parser.add_argument("--start", type=int, default=DEFAULT_PARAMS['start'],
+                        help="first character code (default %(default)s)")
+    parser.add_argument("--end", type=int, default=DEFAULT_PARAMS['end'],
+                        help="last character code (default %(default)s)")
+    parser.add_argument("-l", "--layout", choices=layout_names(),
+                        default=DEFAULT_PARAMS['addr_mode'],
+                        help="glyph byte layout (default %(default)s)")
+    parser.add_argument("--font-size", type=int, default=None,
+                        help="font size in pixels (default: the cell height)")
+    parser.add_argument("--auto-fit", action="store_true",
+                        help="use the largest font size whose ink fits the cell")
+    parser.add_argument("--font-name", default=None,
+                        help="array name, defaults to the output file stem")
+    parser.add_argument("--style", choices=("c", "cpp"),
+                        default=DEFAULT_PARAMS['array_style'],
+                        help="C or C++ array style (default %(default)s)")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_PARAMS['threshold'],
+                        help="grayscale threshold 1-255 (default %(default)s)")
+    parser.add_argument("--antialias", action="store_true",
+                        help="threshold anti-aliased rather than mono-hinted glyphs")
+    parser.add_argument("--embolden", type=int, default=DEFAULT_PARAMS['embolden'],
+                        help="widen strokes by N pixels (default %(default)s)")
+    parser.add_argument("--rotation", type=int, choices=(0, 90, 180, 270),
+                        default=DEFAULT_PARAMS['rotation'],
+                        help="rotate glyph data clockwise (default %(default)s)")
+    parser.add_argument("--mirror", choices=("none", "horizontal", "vertical"),
+                        default=DEFAULT_PARAMS['mirror'],
+                        help="mirror glyph data (default %(default)s)")
+    parser.add_argument("--missing", choices=MISSING_MODES, default=DEFAULT_PARAMS['missing'],
+                        help="code points the font lacks: leave blank, substitute, "
+                             "or keep the font's box (default %(default)s)")
+    parser.add_argument("--substitute", default=DEFAULT_PARAMS['substitute'],
+                        help="character drawn for missing code points with "
+                             "--missing substitute (default %(default)s)")
+    parser.add_argument("--draw-sample", default=None, metavar="TEXT",
+                        help="simulate drawing TEXT on a device and report the cost "
+                             "of every layout and format")
+    parser.add_argument("--draw-target", choices=DRAW_TARGETS, default="pixel",
+                        help="simulated display access (default %(default)s)")
+    parser.add_argument("--corpus", action="append", default=[], metavar="PATH",
+                        help="only convert code points used by these source files, "
+                             "JSON or PO string tables or directories, repeatable")
+
+
+def _add_build_options(parser):
+    """Options for incremental builds driven by Make or Ninja, and build reports."""
+    parser.add_argument("--manifest", action="store_true",
+                        help="write OUTPUT.manifest.json and skip the conversion when "
+                             "inputs, options and outputs are unchanged")
+    parser.add_argument("--depfile", default=None, metavar="PATH",
+                        help="write a Make/Ninja dependency file listing the inputs")
+    parser.add_argument("--force", action="store_true",
+                        help="convert even when the manifest is up to date")
+    parser.add_argument("--stats", default=None, metavar="PATH",
+                        help="append phase timings and counters to PATH as JSON lines")
+
+
+def _build_inputs(args):
+    """Files a conversion reads: the font and every corpus file."""
+    return [args.ttf, *corpus_files(args.corpus)]
+
+
+def _up_to_date(args, params, outputs):
+    """True when --manifest is set and nothing changed since the last run."""
+    if not args.manifest or args.force:
+        return False
+    inputs = _build_inputs(args)
+    if not is_up_to_date(manifest_path(args.output), inputs, params, outputs):
+        return False
+    if args.depfile:
+        write_depfile(args.depfile, outputs, inputs)
+    print(f"[cli] Up to date: {args.output}")
+    return True
+
+
+def _record_build(args, params, outputs):
+    """Write the manifest and dependency file after a conversion."""
+    inputs = _build_inputs(args)
+    if args.manifest:
+        path = manifest_path(args.output)
+        write_manifest(path, build_manifest(inputs, params, outputs))
+        print(f"[cli] Saved manifest: {path}")
+    if args.depfile:
+        write_depfile(args.depfile, outputs, inputs)
+        print(f"[cli] Saved dependencies: {args.depfile}")
+
+
+def params_from_args(args, output):
+    """Build the converter params dict from parsed arguments."""
+    output = Path(output)
+    return make_params(
+        width=args.width,
+        height=args.height,
+        start=args.start,
+        end=args.end,
+        font_name=args.font_name or output.stem,
+        output_name=output.stem,
+        ext=output.suffix.lstrip(".") or "hpp",
+        array_style=args.style,
+        addr_mode=args.layout,
+        threshold=args.threshold,
+        antialias=args.antialias,
+        embolden=args.embolden,
+        rotation=args.rotation,
+        mirror=args.mirror,
+        missing=args.missing,
+        substitute=args.substitute[:1] or DEFAULT_PARAMS['substitute'],
+        codepoints=scan_corpus(args.corpus) if args.corpus else None,
+        font_size=args.font_size,
+        draw_sample=args.draw_sample,
+        draw_target=args.draw_target,
+        auto_fit=args.auto_fit,
+    )
+
+
+def cmd_convert(args):
+    """Convert one TTF file."""
+    params = params_from_args(args, args.output)
+    params['jobs'] = args.jobs
+    params['formats'] = args.formats
+    outputs = [args.output] + [str(export_path(args.output, name)) for name in args.formats]
+    if _up_to_date(args, params, outputs):
+        return 0
+    engine = FontEngine()
+    engine.instruments = Instruments(json_sink(args.stats) if args.stats else None)
+    engine.check_dimensions(params)
+    output = engine.convert_font(args.ttf, params)
+    with engine.instruments.phase("write"):
+        write_output(args.output, output)
+    print(f"[cli] Saved: {args.output}")
+    # Extra formats reuse the same rasterization
+    with engine.instruments.phase("format"):
+        exported = engine.export_formats(args.formats, params)
+    for name, text in exported.items():
+        path = export_path(args.output, name)
+        with engine.instruments.phase("write"):
+            write_output(path, text)
+        print(f"[cli] Saved {EXPORTERS[name].description}: {path}")
+    _record_build(args, params, outputs)
+    engine.report_instruments(command="convert", font=args.ttf, output=args.output)
+    return 0
+
+
+def cmd_ladder(args):
+    """Convert one TTF file at several cell sizes."""
+    params = params_from_args(args, args.output)
+    sizes = parse_sizes(args.sizes)
+    split = args.split or params['ext'] == "bin"
+    outputs = ([str(ladder_path(args.output, width, height)) for width, height in sizes]
+               if split else [args.output])
+    build_params = dict(params, sizes=sizes, split=split)
+    if _up_to_date(args, build_params, outputs):
+        return 0
+    batch = Instruments(json_sink(args.stats) if args.stats else None)
+    results = convert_ladder(args.ttf, params, sizes, args.jobs, instruments=batch)
+    for rung, _, messages in results:
+        for _, message in messages:
+            print(f"[{rung['width']}x{rung['height']}] {message}")
+    if split:
+        for rung, output, _ in results:
+            path = ladder_path(args.output, rung['width'], rung['height'])
+            with batch.phase("write"):
+                write_output(path, output)
+            print(f"[cli] Saved: {path}")
+    else:
+        with batch.phase("write"):
+            write_output(args.output, compose_family(results))
+        print(f"[cli] Saved {len(results)} sizes: {args.output}")
+    _record_build(args, build_params, outputs)
+    print(f"[cli] Batch of {len(results)} sizes, summed over workers: {batch.summary()}")
+    batch.emit(command="ladder", font=args.ttf, output=args.output, sizes=len(results))
+    return 0
+
+
+def _name_list(text, choices, what):
+    names = [name for name in text.replace(" ", "").split(",") if name]
+    for name in names:
+        if name not in choices:
+            raise ValueError(f"Unknown {what} '{name}', choose from: {', '.join(choices)}")
+    return names
+
+
+def cmd_budget(args):
+    """Suggest configurations that fit a flash budget."""
+    params = params_from_args(args, "budget.hpp")
+    layouts = (layout_names() if args.layouts == "all"
+               else _name_list(args.layouts or args.layout, layout_names(), "layout"))
+    candidates = BudgetPlanner().plan(
+        args.ttf, params, args.budget, parse_sizes(args.sizes),
+        ranges=parse_ranges(args.ranges) if args.ranges else None,
+        layouts=layouts, formats=_name_list(args.formats, BUDGET_FORMATS, "format"))
+    if not candidates:
+        print(f"[cli] Nothing fits in {args.budget} bytes, try smaller cells or ranges.")
+        return 1
+    print(f"{'cell':>7} {'range':>9} {'layout':<18} {'format':<6} {'font':>5} "
+          f"{'glyphs':>6} {'bytes':>7} {'budget':>6}")
+    for cand in candidates[:args.top]:
+        print(f"{cand.width:>3}x{cand.height:<3} {cand.start:>4}-{cand.end:<4} "
+              f"{cand.layout:<18} {cand.fmt:<6} {cand.font_size:>3}px {cand.glyphs:>6} "
+              f"{cand.size:>7} {100 * cand.size / args.budget:>5.0f}%")
+    print(f"[cli] Best: {candidates[0].describe()}")
+    return 0
+
+
+def cmd_corpus(args):
+    """Print the code points a corpus uses."""
+    codes = scan_corpus(args.paths)
+    print(f"[cli] {len(codes)} code point(s)")
+    print("".join(chr(code) for code in codes))
+    return 0
+
+
+def cmd_layouts(_args):
+    """List the registered glyph byte layouts."""
+    for packer in PACKERS.values():
+        print(f"{packer.name:<18} {packer.description}")
+    return 0
+
+
+def cmd_diff(args):
+    """Compare two generated fonts glyph by glyph, 1 when they differ."""
+    diff = diff_fonts(load_glyphs(args.old, args.layout), load_glyphs(args.new, args.layout))
+    print(f"[cli] {diff.summary()}")
+    for title, codes in (("Changed", diff.changed), ("Added", diff.added),
+                         ("Removed", diff.removed)):
+        if codes:
+            print(f"{title}: " + " ".join(f"U+{code:04X}" for code in codes[:args.limit])
+                  + (f" ... {len(codes) - args.limit} more" if len(codes) > args.limit else ""))
+    if args.output:
+        sheet = render_diff(diff, scale=args.scale, limit=args.limit)
+        if sheet is None:
+            print("[cli] No changed glyphs to draw.")
+        else:
+            sheet.save(args.output, "PNG")
+            print(f"[cli] Saved: {args.output}")
+    return 0 if diff.identical else 1
+
+
+def cmd_fonts(args):
+    """Search the font catalog, scanning the font directories first."""
+    catalog = FontCatalog(args.index)
+    counts = catalog.scan(default_font_dirs() + args.scan, rescan=args.rescan)
+    print(f"[cli] Catalog: {len(catalog.records)} fonts, {counts['added']} added, "
+          f"{counts['updated']} updated, {counts['removed']} removed, "
+          f"{counts['failed']} unreadable")
+    found = catalog.search(" ".join(args.query), limit=args.limit,
+                           covering=parse_ranges(args.covers) if args.covers else None)
+    for record in found:
+        print(f"{record.describe()}\n    {record.path}")
+    return 0 if found else 1
+
+
+def cmd_serve(args):
+    """Run the local conversion service until interrupted."""
+    service = ConversionService(jobs=args.jobs, cache_size=args.cache_size)
+    where = args.unix or f"http://{LOCALHOST}:{args.port}"
+    print(f"[cli] Conversion service on {where} with {service.jobs} workers, Ctrl+C to stop")
+    try:
+        asyncio.run(service.serve(port=args.port, unix_path=args.unix))
+    except KeyboardInterrupt:
+        print(f"[cli] Stopped after {service.stats['requests']} requests, "
+              f"{service.stats['cache_hits']} from cache")
+    finally:
+        service.close()
+    return 0
+
+
+def cmd_watch(args):
+    """Convert the jobs of a jobs file, again whenever their inputs change."""
+    watcher = Watcher(args.jobs, settle=args.settle)
+    if args.once:
+        return 0 if all(ok for _, _, ok in watcher.start()) else 1
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        print("[cli] Watch stopped")
+    return 0
+
+
+def build_parser():
+    """Return the argument parser for colossus-cli."""
+    parser = argparse.ArgumentParser(
+        prog="colossus-cli",
+        description="Convert TTF fonts to C/C++ bitmap arrays for embedded displays.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    convert = subparsers.add_parser("convert", help="convert a TTF file")
+    convert.add_argument("ttf", help="input .ttf file")
+    convert.add_argument("-o", "--output", required=True,
+                         help="output file, .h/.hpp for an array or .bin for binary")
+    convert.add_argument("-f", "--format", dest="formats", action="append",
+                         choices=list(EXPORTERS), default=[],
+                         help="also export this format beside the output, repeatable")
+    convert.add_argument("-j", "--jobs", type=int, default=1,
+                         help="rasterize across this many worker processes (default 1)")
+    _add_convert_options(convert)
+    _add_build_options(convert)
+    convert.set_defaults(func=cmd_convert)
+
+    ladder = subparsers.add_parser("ladder", help="convert a TTF file at several cell sizes")
+    ladder.add_argument("ttf", help="input .ttf file")
+    ladder.add_argument("-o", "--output", required=True,
+                        help="output header, or name pattern with --split or .bin")
+    ladder.add_argument("--sizes", required=True,
+                        help="comma separated cell sizes, e.g. 8x8,16x16,24x24,32x32")
+    ladder.add_argument("--split", action="store_true",
+                        help="write one file per size, NAME_WxH.ext")
+    ladder.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default one per CPU, 1 = no pool)")
+    _add_convert_options(ladder)
+    _add_build_options(ladder)
+    ladder.set_defaults(func=cmd_ladder)
+
+    budget = subparsers.add_parser("budget",
+                                   help="suggest configurations that fit a flash budget")
+    budget.add_argument("ttf", help="input .ttf file")
+    budget.add_argument("--budget", type=int, required=True, help="flash budget in bytes")
+    budget.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="candidate cell sizes (default %(default)s)")
+    budget.add_argument("--ranges", default=None,
+                        help="candidate code ranges, e.g. 32-126,32-90 (default --start-"
+                             "--end)")
+    budget.add_argument("--layouts", default=None,
+                        help="candidate layouts, comma separated or 'all' (default --layout)")
+    budget.add_argument("--formats", default="array",
+                        help=f"candidate formats from {', '.join(BUDGET_FORMATS)} "
+                             f"(default %(default)s)")
+    budget.add_argument("--top", type=int, default=10,
+                        help="number of suggestions to list (default %(default)s)")
+    _add_convert_options(budget)
+    budget.set_defaults(func=cmd_budget)
+
+    corpus = subparsers.add_parser("corpus", help="list the code points a corpus uses")
+    corpus.add_argument("paths", nargs="+", help="source files, string tables or directories")
+    corpus.set_defaults(func=cmd_corpus)
+
+    layouts = subparsers.add_parser("layouts", help="list glyph byte layouts")
+    layouts.set_defaults(func=cmd_layouts)
+
+    diff = subparsers.add_parser("diff", help="compare two generated fonts glyph by glyph")
+    diff.add_argument("old", help="old header or .bin font")
+    diff.add_argument("new", help="new header or .bin font")
+    diff.add_argument("-o", "--output", default=None,
+                      help="draw the changed glyphs, old, new and overlay, to this PNG")
+    diff.add_argument("--layout", choices=layout_names(), default=None,
+                      help="layout of headers without a layout comment (default horizontal)")
+    diff.add_argument("--scale", type=int, default=4,
+                      help="pixel scale of the PNG (default %(default)s)")
+    diff.add_argument("--limit", type=int, default=256,
+                      help="glyphs to list and draw (default %(default)s)")
+    diff.set_defaults(func=cmd_diff)
+    _add_service_parsers(subparsers)
+    return parser
+
+
+def _add_service_parsers(subparsers):
+    """Subcommands that keep running or keep state: fonts, serve, watch."""
+    fonts = subparsers.add_parser("fonts", help="search the installed fonts")
+    fonts.add_argument("query", nargs="*", help="words of the family, style or file name")
+    fonts.add_argument("--scan", action="append", default=[], metavar="DIR",
+                       help="also index the fonts in this directory, repeatable")
+    fonts.add_argument("--covers", default=None, metavar="RANGE",
+                       help="only fonts with a glyph for every code point, e.g. 32-126,160-255")
+    fonts.add_argument("--rescan", action="store_true",
+                       help="parse every font again instead of only changed ones")
+    fonts.add_argument("--limit", type=int, default=None, help="list at most this many fonts")
+    fonts.add_argument("--index", default=None,
+                       help="catalog file (default ~/.cache/colossus_ltsm/font_catalog.json)")
+    fonts.set_defaults(func=cmd_fonts)
+
+    serve = subparsers.add_parser("serve",
+                                  help="serve conversions over HTTP on localhost")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT,
+                       help=f"port on {LOCALHOST} (default %(default)s)")
+    serve.add_argument("--unix", default=None, metavar="PATH",
+                       help="listen on this Unix socket instead of a port")
+    serve.add_argument("-j", "--jobs", type=int, default=None,
+                       help="worker processes (default one per CPU)")
+    serve.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE,
+                       help="results kept for repeat requests (default %(default)s)")
+    serve.set_defaults(func=cmd_serve)
+
+    watch = subparsers.add_parser("watch",
+                                  help="reconvert the jobs of a jobs file when inputs change")
+    watch.add_argument("jobs", help="JSON jobs file, see the README")
+    watch.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                       help="seconds between polls (default %(default)s)")
+    watch.add_argument("--settle", type=float, default=DEFAULT_SETTLE,
+                       help="quiet seconds after a change before rebuilding "
+                            "(default %(default)s)")
+    watch.add_argument("--once", action="store_true",
+                       help="convert every job once and exit, 1 if any failed")
+    watch.set_defaults(func=cmd_watch)
+
+
+def main(argv=None):
+    """ Entry point for the colossus-cli command."""
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as error:
+        print(f"[cli] Error: {error}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,17 @@
 """
     _summary_  The main application file for Colossus.
     Contains the main application class and page management.
+    Pages are built on first navigation, so the converter and viewer
+    modules, and Pillow with them, are only imported when first opened.
 """
 
+import base64
 import sys
-from pathlib import Path
-import subprocess
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, TclError
-import webbrowser
 
 from colossus_ltsm.settings import settings, CL_CONFIG_PATH
-from colossus_ltsm.font_viewer import FontViewer
-from colossus_ltsm.font_converter import FontConverter
+from colossus_ltsm import desktop_entry
 from colossus_ltsm import __version__
 
 class ColossusApp(tk.Tk):
@@ -22,19 +21,18 @@ class ColossusApp(tk.Tk):
 
     def __init__(self):
         super().__init__()
-        # Set application window icon (Linux)
+        # Set application window icon (Linux) from the packaged icon
         if sys.platform.startswith("linux"):
-            icon_path = Path.home() / ".local/share/icons/colossus.png"
-            if icon_path.exists():
-                try:
-                    icon_img = tk.PhotoImage(file=str(icon_path))
-                    self.iconphoto(True, icon_img)
-                    self._icon_ref = icon_img  # prevent GC
-                except TclError as e:
-                    print("[Main] Warning: could not set window icon "
-                    "(invalid or unsupported image):", e)
-                except OSError as e:   # covers FileNotFound + permission issues
-                    print("[Main] Warning: could not read icon file:", e)
+            try:
+                icon_data = desktop_entry.resource_bytes(desktop_entry.ICON_NAME)
+                icon_img = tk.PhotoImage(data=base64.b64encode(icon_data).decode("ascii"))
+                self.iconphoto(True, icon_img)
+                self._icon_ref = icon_img  # prevent GC
+            except TclError as e:
+                print("[Main] Warning: could not set window icon "
+                "(invalid or unsupported image):", e)
+            except OSError as e:   # covers FileNotFound + permission issues
+                print("[Main] Warning: could not read icon file:", e)
         self.title("Colossus")
         screen_resolution = settings.getstr("Display",
                                             "screen_resolution", fallback=str("1000x800"))
@@ -54,22 +52,22 @@ class ColossusApp(tk.Tk):
         self.option_add("*Button.Relief", "raised")
         self.option_add("*Button.BorderWidth", 5)
 
-        # Pre-create pages that don't need extra arguments
-        for F in (
-                MainMenu, SettingsPage, AboutPage, FontConverter, FontViewer):
-            frame = F(parent=self.container, controller=self)
-            self.frames[F] = frame
-            frame.grid(row=0, column=0, sticky="nsew")
-
-        # Start on MainMenu
+        # Start on MainMenu, other pages are built when first shown
         self.show_frame(MainMenu)
 
     def show_frame(self, page_class):
-        """ Raise the given frame to the top.
+        """ Raise the given frame to the top, building it on first use.
         Args:
-            page_class (class): The class of the frame to show."""
-        frame = self.frames[page_class]
+            page_class (class): The class of the frame to show.
+        Returns:
+            The page instance, cached for later navigation."""
+        frame = self.frames.get(page_class)
+        if frame is None:
+            frame = page_class(parent=self.container, controller=self)
+            frame.grid(row=0, column=0, sticky="nsew")
+            self.frames[page_class] = frame
         frame.tkraise()
+        return frame
 
 
 class MainMenu(tk.Frame):
@@ -140,58 +138,24 @@ class MainMenu(tk.Frame):
             )
 
     def open_font_viewer(self):
-        """ Open the Font Viewer Page dynamically. """
-        # Destroy any previous FontViewerPage (but keep MainMenu
-        # and other static pages)
-        for widget in self.controller.container.winfo_children():
-            if isinstance(widget, FontViewerPage):
-                widget.destroy()
-
-        # Create new FontViewerPage dynamically
-        frame = FontViewerPage(parent=self.controller.container,
-                               controller=self.controller)
-        frame.grid(row=0, column=0, sticky="nsew")
-        self.controller.frames[FontViewerPage] = frame
-        frame.tkraise()
+        """ Open the Font Viewer Page, built on first use then kept. """
+        self.controller.show_frame(FontViewerPage)
 
     def open_settings(self):
-        """ Open the Settings Page dynamically. """
-        # Destroy old SettingsPage if exists
-        for widget in self.controller.container.winfo_children():
-            if isinstance(widget, SettingsPage):
-                widget.destroy()
-        # Create new SettingsPage dynamically
-        frame = SettingsPage(parent=self.controller.container,
-                             controller=self.controller)
-        frame.grid(row=0, column=0, sticky="nsew")
-        self.controller.frames[SettingsPage] = frame
-        frame.tkraise()
+        """ Open the Settings Page, re-reading the config file when the
+        page was already built. """
+        page = self.controller.frames.get(SettingsPage)
+        if page is not None:
+            page.reload()
+        self.controller.show_frame(SettingsPage)
 
     def open_convert(self):
-        """ Open the Font Convert Page dynamically. """
-        # Destroy old convertPage if exists
-        for widget in self.controller.container.winfo_children():
-            if isinstance(widget, ConvertPage):
-                widget.destroy()
-        # Create new ConvertPage dynamically
-        frame = ConvertPage(parent=self.controller.container,
-                            controller=self.controller)
-        frame.grid(row=0, column=0, sticky="nsew")
-        self.controller.frames[ConvertPage] = frame
-        frame.tkraise()
+        """ Open the Font Convert Page, built on first use then kept. """
+        self.controller.show_frame(ConvertPage)
 
     def open_about(self):
-        """ Open the About Page dynamically. """
-        # Destroy old aboutPage if exists
-        for widget in self.controller.container.winfo_children():
-            if isinstance(widget, AboutPage):
-                widget.destroy()
-        # Create new aboutPage dynamically
-        frame = AboutPage(parent=self.controller.container,
-                          controller=self.controller)
-        frame.grid(row=0, column=0, sticky="nsew")
-        self.controller.frames[AboutPage] = frame
-        frame.tkraise()
+        """ Open the About Page, built on first use then kept. """
+        self.controller.show_frame(AboutPage)
 
 
 class ConvertPage(tk.Frame):
@@ -200,6 +164,8 @@ class ConvertPage(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        # Deferred import, Pillow and the engine load on first use
+        from colossus_ltsm.font_converter import FontConverter # pylint: disable=import-outside-toplevel
         # Embed the FontConverter inside this frame
         self.viewer = FontConverter(self, controller)
         self.viewer.pack(fill="both", expand=True)
@@ -216,6 +182,8 @@ class FontViewerPage(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        # Deferred import, Pillow and the viewer load on first use
+        from colossus_ltsm.font_viewer import FontViewer # pylint: disable=import-outside-toplevel
         # Embed the FontViewer inside this frame
         self.viewer = FontViewer(self, controller)
         self.viewer.pack(fill="both", expand=True)
@@ -270,10 +238,9 @@ class SettingsPage(tk.Frame):
     def save(self):
         """ Save the current text area content back to the config file."""
         try:
-            with open(CL_CONFIG_PATH, "w", encoding="utf-8") as f:
-                f.write(self.text.get("1.0", tk.END).strip() + "\n")
+            # Atomic replace, then reload settings to update in memory
+            settings.save_text(self.text.get("1.0", tk.END).strip() + "\n")
             messagebox.showinfo("Saved", "Settings saved successfully.")
-            settings.load()  # Reload settings to update in memory
         except (FileNotFoundError, PermissionError, IsADirectoryError, OSError) as e:
             messagebox.showerror("Error", f"Could not save settings:\n{e}")
 
@@ -299,6 +266,7 @@ class AboutPage(tk.Frame):
 
         # Make URL clickable
         def open_url(_):
+            import webbrowser # pylint: disable=import-outside-toplevel
             webbrowser.open("https://github.com/gavinlyonsrepo/Colossus_LTSM")
 
         text.tag_add("link", "4.5", "4.end")  # line 4, chars 5 to end
@@ -312,7 +280,8 @@ class AboutPage(tk.Frame):
 
 def install_desktop_entry():
     """
-    Install desktop entry and icon locally for Linux.
+    Install desktop entry and icon locally for Linux, from the files
+    packaged with Colossus.
     Returns True if installation succeeded or already exists.
     Returns False on failure.
     """
@@ -322,46 +291,17 @@ def install_desktop_entry():
         return False
 
     try:
-        home = Path.home()
-        icon_path = home / ".local/share/icons"
-        app_path = home / ".local/share/applications"
-        icon_path.mkdir(parents=True, exist_ok=True)
-        app_path.mkdir(parents=True, exist_ok=True)
-        files = [
-            (
-                "colossus.png",
-                icon_path,
-                "https://raw.githubusercontent.com/gavinlyonsrepo/"
-                "Colossus_LTSM/main/extras/desktop/colossus.png"
-            ),
-            (
-                "colossus.desktop",
-                app_path,
-                "https://raw.githubusercontent.com/gavinlyonsrepo/"
-                "Colossus_LTSM/main/extras/desktop/colossus.desktop"
-            )
-        ]
-        for filename, target_dir, url in files:
-            target_file = target_dir / filename
-            if target_file.exists():
-                print(f"[Main] INFO:: {filename} already exists in {target_dir}")
-                continue
-            result = subprocess.run(
-                ["curl", "-L", "-s", "--fail", "-o", str(target_file), url], check=True
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"curl failed downloading {filename}")
-            print(f"[Main] INFO:: {filename} installed in {target_dir}")
+        desktop_entry.install_desktop_entry()
         messagebox.showinfo(
             "Desktop Entry Installation",
             "Desktop entry and icon installed (or already present)."
         )
         return True
-    except Exception as error: # pylint: disable=broad-exception-caught
+    except OSError as error:
         print("[Main] Error installing desktop entry:", error)
         messagebox.showerror(
             "Desktop Entry Installation Failed",
-            "Installation failed.\nCheck network or curl availability."
+            f"Installation failed.\n{error}"
         )
         return False
 
@@ -369,10 +309,7 @@ def desktop_entry_installed():
     """Return True if desktop entry + icon already exist (Linux only)."""
     if not sys.platform.startswith("linux"):
         return False
-    home = Path.home()
-    icon_file = home / ".local/share/icons/colossus.png"
-    desktop_file = home / ".local/share/applications/colossus.desktop"
-    return icon_file.exists() and desktop_file.exists()
+    return desktop_entry.desktop_entry_installed()
 
 
 def main():
@@ -0,0 +1 @@
+"""Package data: desktop entry template and application icon."""
@@ -0,0 +1,81 @@
+"""
+Module installing the Linux desktop entry and icon for Colossus.
+
+Both files ship inside the package (colossus_ltsm/data) and are copied with
+importlib.resources, no network access or subprocess. The Exec line of the
+desktop file is generated for the interpreter running Colossus, so an entry
+installed from a virtual environment launches that environment.
+"""
+
+import sys
+from importlib import resources
+from pathlib import Path
+
+DATA_PACKAGE = "colossus_ltsm.data"
+ICON_NAME = "colossus.png"
+DESKTOP_NAME = "colossus.desktop"
+
+
+def resource_bytes(name):
+    """Contents of a packaged data file."""
+    if hasattr(resources, "files"):
+        return resources.files(DATA_PACKAGE).joinpath(name).read_bytes()
+    return resources.read_binary(DATA_PACKAGE, name)  # Python 3.8
+
+
+def entry_paths(home=None):
+    """(icon path, desktop file path) under home, default the user's."""
+    home = Path(home) if home is not None else Path.home()
+    return (home / ".local/share/icons" / ICON_NAME,
+            home / ".local/share/applications" / DESKTOP_NAME)
+
+
+def _quote(arg):
+    """Quote one Exec argument as the Desktop Entry specification asks."""
+    if not any(char in arg for char in " \t\n\"'\\><~|&;$*?#()`"):
+        return arg
+    escaped = "".join("\\" + char if char in "\"`$\\" else char for char in arg)
+    return f'"{escaped}"'
+
+
+def exec_command(executable=None):
+    """Exec value launching the GUI: the colossus script installed beside
+    the interpreter when there is one, else python -m colossus_ltsm.colossus_main."""
+    executable = Path(executable or sys.executable)
+    script = executable.with_name("colossus")
+    if script.is_file():
+        args = [str(script)]
+    else:
+        args = [str(executable), "-m", "colossus_ltsm.colossus_main"]
+    # A literal % starts a field code in Exec, it is written as %%
+    return " ".join(_quote(arg) for arg in args).replace("%", "%%")
+
+
+def desktop_file_text(executable=None):
+    """The packaged desktop entry with Exec pointing at this install."""
+    lines = resource_bytes(DESKTOP_NAME).decode("utf-8").splitlines()
+    lines = [f"Exec={exec_command(executable)}" if line.startswith("Exec=") else line
+             for line in lines]
+    return "\n".join(lines) + "\n"
+
+
+def install_desktop_entry(home=None):
+    """Write the icon and desktop file, keeping any already installed.
+    Returns the paths written, raises OSError on failure."""
+    icon_path, desktop_path = entry_paths(home)
+    written = []
+    for path, content in ((icon_path, lambda: resource_bytes(ICON_NAME)),
+                          (desktop_path, lambda: desktop_file_text().encode("utf-8"))):
+        if path.exists():
+            print(f"[Main] INFO:: {path.name} already exists in {path.parent}")
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content())
+        print(f"[Main] INFO:: {path.name} installed in {path.parent}")
+        written.append(path)
+    return written
+
+
+def desktop_entry_installed(home=None):
+    """Return True if desktop entry + icon already exist."""
+    return all(path.exists() for path in entry_paths(home))
@@ -0,0 +1,280 @@
+"""
+Module simulating the device-side cost of drawing text with a generated font.
+
+A sample string is replayed from the generated glyph data the way firmware
+would draw it: glyph bytes are fetched, bits are tested one by one, and
+pixels land in a 1-bit page framebuffer. Bytes read, bit operations and
+pixel (or framebuffer byte) writes are counted for every data layout and
+export format, so layouts can be compared on drawing work, not just size.
+
+Targets:
+    pixel  drawPixel for every ink pixel, background left untouched
+    fill   opaque, every pixel of the cell or glyph box is written
+    pages  SSD1306 style page framebuffer, vertical (LSB) cells are copied
+           a byte at a time, everything else is read-modify-write per pixel
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from PIL import Image
+
+from colossus_ltsm.font_exporters import EXPORTERS, glyph_bitstream, u8g2_font_data
+
+DRAW_TARGETS = ("pixel", "fill", "pages")
+DEFAULT_SAMPLE = "Hello, World! 0123456789"
+
+
+@dataclass
+class DrawCost:
+    """Work counted while drawing the sample with one layout or format.
+    skipped holds the reason when the format cannot encode the glyphs."""
+    name: str
+    flash: int
+    bytes_read: int = 0
+    bit_ops: int = 0
+    pixel_writes: int = 0
+    skipped: str = ""
+    image: Optional[Image.Image] = field(default=None, repr=False, compare=False)
+
+
+def _ceil_div(value, step):
+    return -(-value // step)
+
+
+def _word_address(bits):
+    def address(x, y, width):
+        word = y * _ceil_div(width, bits) + x // bits
+        bit = bits - 1 - x % bits
+        # Little-endian words, the high byte of each word comes second
+        return word * (bits // 8) + bit // 8, 1 << bit % 8
+    return address
+
+
+# Layout -> (x, y, cell width) -> (byte index, bit mask), and whether the
+# firmware walks the data in page order (columns of 8 rows) or row order
+_ADDRESS = {
+    "horizontal": (lambda x, y, w: (y * _ceil_div(w, 8) + x // 8, 0x80 >> x % 8), False),
+    "horizontal_lsb": (lambda x, y, w: (y * _ceil_div(w, 8) + x // 8, 1 << x % 8), False),
+    "vertical": (lambda x, y, w: (y // 8 * w + x, 1 << y % 8), True),
+    "vertical_msb": (lambda x, y, w: (y // 8 * w + x, 0x80 >> y % 8), True),
+    "horizontal_word16": (_word_address(16), False),
+    "horizontal_word32": (_word_address(32), False),
+}
+
+
+def simulated_layouts():
+    """Layouts the simulator knows the addressing of."""
+    return list(_ADDRESS)
+
+
+class _Device:
+    """1-bit page framebuffer that counts the work done drawing into it."""
+
+    def __init__(self, width, height, target, cost):
+        self.width = width
+        self.height = height
+        self.target = target
+        self.cost = cost
+        self.pages = [bytearray(width) for _ in range(_ceil_div(height, 8))]
+        self._last_read = None
+
+    def read(self, data, index):
+        """Fetch data[index], counted once per run of reads of the same byte."""
+        if index != self._last_read:
+            self.cost.bytes_read += 1
+            self._last_read = index
+        return data[index]
+
+    def fetch(self, count=1):
+        """Count reads of glyph table or header bytes."""
+        self.cost.bytes_read += count
+        self._last_read = None
+
+    def plot(self, x, y, ink, tested=True):
+        """Draw one pixel according to the target, tested pixels cost a bit
+        operation to extract from the glyph data."""
+        if tested:
+            self.cost.bit_ops += 1
+        if not 0 <= x < self.width or not 0 <= y < self.height:
+            return
+        if self.target == "fill" or ink:
+            self.cost.pixel_writes += 1
+            if self.target == "pages":
+                # Read-modify-write of the page byte
+                self.cost.bit_ops += 1
+        if ink:
+            self.pages[y // 8][x] |= 1 << y % 8
+
+    def copy_page_byte(self, x, page, value):
+        """Store a whole vertical byte, 8 pixels in one write."""
+        self.cost.pixel_writes += 1
+        if 0 <= x < self.width and page < len(self.pages):
+            self.pages[page][x] = value
+
+    def to_image(self):
+        """The framebuffer as a mode "1" image."""
+        image = Image.new("1", (self.width, self.height), 0)
+        for page, row in enumerate(self.pages):
+            for x, value in enumerate(row):
+                for bit in range(8):
+                    if value >> bit & 1 and page * 8 + bit < self.height:
+                        image.putpixel((x, page * 8 + bit), 1)
+        return image
+
+
+def _draw_cell(device, layout, data, x0, size):
+    width, height = size
+    address, page_order = _ADDRESS[layout]
+    if device.target == "pages" and layout == "vertical":
+        for index in range(len(data)):
+            device.copy_page_byte(x0 + index % width, index // width,
+                                  device.read(data, index))
+        return
+    if page_order:
+        order = ((x, page * 8 + bit) for page in range(_ceil_div(height, 8))
+                 for x in range(width) for bit in range(8) if page * 8 + bit < height)
+    else:
+        order = ((x, y) for y in range(height) for x in range(width))
+    for x, y in order:
+        index, mask = address(x, y, width)
+        device.plot(x0 + x, y, device.read(data, index) & mask)
+
+
+def cell_draw_cost(layout, glyph_blocks, size, sample, target="pixel"):
+    """Replay sample from fixed-cell glyph blocks [(char, bytes)] in layout.
+    size is the stored (width, height) of one glyph."""
+    width, height = size
+    flash = 4 + sum(len(data) for _, data in glyph_blocks)
+    by_char = dict(glyph_blocks)
+    cost = DrawCost(layout, flash)
+    device = _Device(width * len(sample), height, target, cost)
+    for pos, char in enumerate(sample):
+        if char in by_char:
+            _draw_cell(device, layout, by_char[char], pos * width, size)
+    cost.image = device.to_image()
+    return cost
+
+
+def _draw_bitstream(device, glyph, data, pen_x, baseline_y):
+    left = pen_x + glyph.x_offset
+    top = baseline_y + glyph.y_offset
+    for bit in range(glyph.width * glyph.height):
+        value = device.read(data, bit // 8)
+        device.plot(left + bit % glyph.width, top + bit // glyph.width,
+                    value & 0x80 >> bit % 8)
+
+
+def bitstream_draw_cost(fmt, export_glyphs, frame, sample, target="pixel"):
+    """Replay sample from a GFX or LVGL 1 bpp font: a per-glyph table
+    entry, then the glyph box as one continuous MSB-first bit stream.
+    frame is the (cell width, cell height, baseline y) of the rendering."""
+    cell_w, cell_h, baseline_y = frame
+    by_code = {glyph.code: glyph for glyph in export_glyphs}
+    entry = 7 if fmt == "gfx" else 8
+    cost = DrawCost(fmt, EXPORTERS[fmt].flash_size(export_glyphs))
+    device = _Device(sum(by_code[ord(c)].advance for c in sample if ord(c) in by_code)
+                     + cell_w, cell_h, target, cost)
+    pen_x = 0
+    for char in sample:
+        glyph = by_code.get(ord(char))
+        if glyph is None:
+            continue
+        device.fetch(entry)
+        _draw_bitstream(device, glyph, glyph_bitstream(glyph), pen_x, baseline_y)
+        pen_x += glyph.advance
+    cost.image = device.to_image()
+    return cost
+
+
+class _U8g2Stream:
+    """LSB-first field reader over a u8g2 glyph, counting the bytes it pulls."""
+
+    def __init__(self, device, data, start):
+        self.device = device
+        self.data = data
+        self.pos = start * 8
+
+    def get(self, bits):
+        """Read one unsigned field, one bit operation per field."""
+        value = 0
+        for i in range(bits):
+            byte = self.device.read(self.data, (self.pos + i) // 8)
+            value |= (byte >> (self.pos + i) % 8 & 1) << i
+        self.pos += bits
+        self.device.cost.bit_ops += 1
+        return value
+
+    def get_signed(self, bits):
+        """Read one signed field, stored offset by half its range."""
+        return self.get(bits) - (1 << (bits - 1))
+
+
+def _u8g2_find(device, font, code):
+    """Walk the u8g2 glyph list like u8g2_font_get_glyph_data."""
+    device.fetch(2)
+    if code >= ord("a"):
+        pos = 23 + (font[19] << 8 | font[20])
+    elif code >= ord("A"):
+        pos = 23 + (font[17] << 8 | font[18])
+    else:
+        pos = 23
+    while True:
+        device.fetch(2)
+        if font[pos + 1] == 0:
+            return None
+        if font[pos] == code:
+            return pos
+        pos += font[pos + 1]
+
+
+def _u8g2_draw_glyph(device, stream, fields, pen_x, baseline_y):
+    width, height = stream.get(fields['w']), stream.get(fields['h'])
+    left = pen_x + stream.get_signed(fields['x'])
+    top = baseline_y - stream.get_signed(fields['y']) - height
+    advance = stream.get_signed(fields['d'])
+    drawn = 0
+    while width and drawn < width * height:
+        zeros, ones = stream.get(fields['r0']), stream.get(fields['r1'])
+        while True:
+            for ink in [0] * zeros + [1] * ones:
+                # Runs are drawn as spans, no per-pixel bit test
+                device.plot(left + drawn % width, top + drawn // width, ink, tested=False)
+                drawn += 1
+            if not stream.get(1):
+                break
+    return advance
+
+
+def u8g2_draw_cost(export_glyphs, frame, sample, target="pixel"):
+    """Replay sample from the u8g2 run-length encoded font. frame is the
+    (cell width, cell height, baseline y) the glyphs were rendered in."""
+    cell_w, cell_h, baseline_y = frame
+    _, font = u8g2_font_data(export_glyphs)
+    fields = dict(zip(("r0", "r1", "w", "h", "x", "y", "d"), font[2:9]))
+    cost = DrawCost("u8g2", len(font))
+    device = _Device(max(1, (cell_w + 1) * len(sample)), cell_h, target, cost)
+    device.fetch(9)
+    pen_x = 0
+    for char in sample:
+        pos = _u8g2_find(device, font, ord(char))
+        if pos is None:
+            continue
+        pen_x += _u8g2_draw_glyph(device, _U8g2Stream(device, font, pos + 2),
+                                  fields, pen_x, baseline_y)
+    cost.image = device.to_image()
+    return cost
+
+
+def format_cost_table(costs, sample, target):
+    """Comparison table of draw costs, one line per layout or format."""
+    lines = [f"Draw cost of \"{sample}\" ({len(sample)} chars, target {target}):",
+             f"  {'layout/format':<18} {'flash':>7} {'bytes read':>10} "
+             f"{'bit ops':>8} {'writes':>7}"]
+    for cost in costs:
+        if cost.skipped:
+            lines.append(f"  {cost.name:<18} skipped: {cost.skipped}")
+            continue
+        lines.append(f"  {cost.name:<18} {cost.flash:>7} {cost.bytes_read:>10} "
+                     f"{cost.bit_ops:>8} {cost.pixel_writes:>7}")
+    return "\n".join(lines)
@@ -0,0 +1,145 @@
+"""
+Module for the raw binary (.bin) font format.
+
+A .bin font is a small little-endian header followed by exactly the bytes
+of the C/C++ array: the 4 control bytes then the glyph data. Devices can
+read it straight from an SD card or flash filesystem, and the viewer maps
+it with mmap instead of parsing text. The control bytes hold values up to
+255; the header keeps the first code and glyph count in 16 bits, so wide
+ranges are read from the header.
+"""
+
+import mmap
+import struct
+from dataclasses import dataclass
+from colossus_ltsm.packers import PACKERS
+
+BIN_MAGIC = b"CLTF"
+BIN_VERSION = 1
+# magic, version, layout + transform, header length, width, height, first code,
+# last offset, glyph count, bytes per glyph, data offset, data length,
+# index offset, index count
+BIN_HEADER = struct.Struct("<4sBBHHHHHHHIIII")
+LAYOUT_IDS = {packer.name: packer.layout_id for packer in PACKERS.values()}
+# The layout byte keeps the layout id in bits 0-3, clockwise quarter turns
+# in bits 4-5 and the mirror mode in bits 6-7.
+MIRROR_IDS = {"none": 0, "horizontal": 1, "vertical": 2}
+
+
+@dataclass
+class BinHeader: # pylint: disable=too-many-instance-attributes
+    """Decoded .bin font header."""
+    version: int
+    layout: str
+    rotation: int
+    mirror: str
+    width: int
+    height: int
+    first_code: int
+    last_offset: int
+    glyph_count: int
+    bytes_per_glyph: int
+    data_offset: int
+    data_len: int
+    index_offset: int
+    index_count: int
+
+
+def pack_font_blob(control, glyph_blocks, params, index=None):
+    """Return the .bin bytes for control bytes plus packed glyph blocks.
+    index is an optional list of 16-bit code points stored after the data.
+    Raises ValueError for a cell wider or taller than 255 pixels."""
+    too_wide = [value for value in list(control) + list(index or []) if value > 0xFFFF]
+    if too_wide:
+        raise ValueError(f"Binary fonts hold code points and glyph counts up to 0xFFFF, "
+                         f"got 0x{max(too_wide):X}.")
+    if max(control[0], control[1]) > 0xFF:
+        # Readers take the cell size from the control bytes, it cannot be capped
+        raise ValueError(f"Binary fonts hold cells up to 255x255 pixels, "
+                         f"got {control[0]}x{control[1]}.")
+    glyph_data = b"".join(bytes(data) for _, data in glyph_blocks)
+    # The header has the full values, the range control bytes are capped at 255
+    data = bytes(min(value, 0xFF) for value in control) + glyph_data
+    bytes_per_glyph = len(glyph_blocks[0][1]) if glyph_blocks else 0
+    index = list(index or [])
+    data_offset = BIN_HEADER.size
+    index_offset = data_offset + len(data) if index else 0
+    layout = (LAYOUT_IDS.get(params['addr_mode'], 0x0F)
+              | (params.get('rotation', 0) // 90) << 4
+              | MIRROR_IDS[params.get('mirror', "none")] << 6)
+    header = BIN_HEADER.pack(
+        BIN_MAGIC, BIN_VERSION, layout,
+        BIN_HEADER.size, control[0], control[1], control[2],
+        control[3], len(glyph_blocks), bytes_per_glyph, data_offset,
+        len(data), index_offset, len(index))
+    return header + data + struct.pack(f"<{len(index)}H", *index)
+
+
+def read_blob_header(buffer):
+    """Decode and validate the header at the start of a .bin buffer."""
+    if len(buffer) < BIN_HEADER.size:
+        raise ValueError("File too short for a Colossus binary font.")
+    fields = BIN_HEADER.unpack_from(buffer, 0)
+    magic, version, layout_id = fields[:3]
+    if magic != BIN_MAGIC:
+        raise ValueError("Not a Colossus binary font (bad magic).")
+    if version > BIN_VERSION:
+        raise ValueError(f"Unsupported binary font version {version}.")
+    layouts = {v: k for k, v in LAYOUT_IDS.items()}
+    mirrors = {v: k for k, v in MIRROR_IDS.items()}
+    header = BinHeader(version, layouts.get(layout_id & 0x0F, "unknown"),
+                       ((layout_id >> 4) & 0x03) * 90,
+                       mirrors.get(layout_id >> 6, "unknown"), *fields[4:])
+    if header.data_offset + header.data_len > len(buffer):
+        raise ValueError("Binary font data runs past the end of the file.")
+    return header
+
+
+class MappedFont:
+    """Read-only memory map of a .bin font.
+
+    font_bytes is a zero-copy view of the control + glyph bytes, laid out
+    like the parsed C/C++ array so the viewer can render it unchanged.
+    """
+
+    def __init__(self, file_path):
+        with open(file_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+        try:
+            self.header = read_blob_header(self._view)
+        except ValueError:
+            self.close()
+            raise
+        start = self.header.data_offset
+        self.font_bytes = self._view[start:start + self.header.data_len]
+
+    def index(self):
+        """Return the code point index table, empty for contiguous ranges."""
+        if not self.header.index_count:
+            return []
+        return list(struct.unpack_from(f"<{self.header.index_count}H",
+                                       self._view, self.header.index_offset))
+
+    def codes(self):
+        """Code point of every glyph, from the index table or the header's
+        16-bit first code and glyph count."""
+        return self.index() or list(range(self.header.first_code,
+                                          self.header.first_code + self.header.glyph_count))
+
+    def close(self):
+        """Release the views and unmap the file."""
+        for view in (getattr(self, "font_bytes", None), self._view):
+            if view is not None:
+                view.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            # A caller still holds a slice, the map closes once it is freed
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,125 @@
+"""
+Module for choosing a font configuration that fits a flash budget.
+
+Candidate configurations (cell size x code range x data layout x output
+format) are sized without writing any file. Colossus arrays and .bin fonts
+are sized exactly from the layout's bytes per glyph, with no rendering.
+Proportional formats are sized from one rasterization per cell size and
+range through each exporter's flash_size. Fidelity is the largest font
+size whose ink fits the cell, found from glyph bounding boxes.
+"""
+
+from dataclasses import dataclass
+
+from colossus_ltsm.font_binary import BIN_HEADER
+from colossus_ltsm.font_engine import FontEngine
+from colossus_ltsm.font_exporters import EXPORTERS
+from colossus_ltsm.packers import get_packer
+
+BUDGET_FORMATS = ("array", "bin", *EXPORTERS)
+DEFAULT_SIZES = "8x8,8x12,8x16,16x16,16x24,24x24,24x32,32x32"
+
+
+@dataclass
+class BudgetCandidate: # pylint: disable=too-many-instance-attributes
+    """One configuration and the flash it needs."""
+    width: int
+    height: int
+    start: int
+    end: int
+    layout: str
+    fmt: str
+    font_size: int
+    glyphs: int
+    size: int
+
+    def describe(self):
+        """Short option summary, as colossus-cli convert arguments."""
+        options = (f"-W {self.width} -H {self.height} --start {self.start} "
+                   f"--end {self.end} --auto-fit")
+        if self.fmt in EXPORTERS:
+            return f"{options} -f {self.fmt}"
+        return f"{options} -l {self.layout}" + (" -o FONT.bin" if self.fmt == "bin" else "")
+
+
+def parse_ranges(text):
+    """Parse "32-126,48-57" into [(32, 126), (48, 57)]."""
+    ranges = []
+    for item in text.replace(" ", "").split(","):
+        if not item:
+            continue
+        first, _, last = item.partition("-")
+        try:
+            ranges.append((int(first, 0), int(last or first, 0)))
+        except ValueError:
+            raise ValueError(f"Bad code range '{item}', use FIRST-LAST such as 32-126.") from None
+    return ranges
+
+
+def array_size(params, glyph_count, fmt="array"):
+    """Exact bytes of a Colossus array or .bin font, control bytes, glyph
+    data, the subset index and the .bin header."""
+    width, height = FontEngine._glyph_dims(params) # pylint: disable=protected-access
+    size = 4 + get_packer(params['addr_mode']).bytes_per_glyph(width, height) * glyph_count
+    if params.get('codepoints') is not None:
+        size += 2 * glyph_count
+    if fmt == "bin":
+        size += BIN_HEADER.size
+    return size
+
+
+class BudgetPlanner(FontEngine):
+    """Size candidate configurations for one font, quietly."""
+
+    def _log(self, message, level="info"):
+        pass
+
+    def plan(self, ttf_path, params, budget, sizes, **options): # pylint: disable=too-many-locals
+        """Return the candidates within budget bytes, best fidelity first:
+        most glyphs, then largest font, then fewest bytes and smallest cell.
+
+        options: ranges [(start, end)], layouts [names], formats [names]."""
+        ranges = options.get('ranges') or [(params['start'], params['end'])]
+        layouts = options.get('layouts') or [params['addr_mode']]
+        formats = options.get('formats') or ["array"]
+        fitting = []
+        for width, height in sizes:
+            for start, end in ranges:
+                rung = dict(params, width=width, height=height, start=start, end=end,
+                            auto_fit=True, font_size=None)
+                if not self._glyph_codes(rung):
+                    continue
+                font = self.open_font(ttf_path, rung)
+                fitting += [c for c in self._rung_candidates(font, rung, layouts, formats)
+                            if c.size <= budget]
+        return sorted(fitting, key=lambda c: (-c.glyphs, -c.font_size, c.size,
+                                              c.width * c.height))
+
+    def _rung_candidates(self, font, rung, layouts, formats):
+        """Candidates for one cell size and range, rasterizing only when a
+        proportional format is asked for."""
+        glyphs = len(self._glyph_codes(rung))
+        candidates = []
+        for layout in layouts:
+            params = dict(rung, addr_mode=layout)
+            try:
+                self.check_dimensions(params)
+            except ValueError:
+                continue
+            candidates += [BudgetCandidate(rung['width'], rung['height'], rung['start'],
+                                           rung['end'], layout, fmt, font.size, glyphs,
+                                           array_size(params, glyphs, fmt))
+                           for fmt in formats if fmt in ("array", "bin")]
+        exported = [fmt for fmt in formats if fmt in EXPORTERS]
+        if exported:
+            self._rasterize_glyphs(font, rung)
+            export_glyphs = self.export_glyphs(rung)
+            for fmt in exported:
+                try:
+                    size = EXPORTERS[fmt].flash_size(export_glyphs)
+                except ValueError:
+                    continue
+                candidates.append(BudgetCandidate(rung['width'], rung['height'], rung['start'],
+                                                  rung['end'], "-", fmt, font.size, glyphs,
+                                                  size))
+        return candidates
@@ -0,0 +1,217 @@
+"""
+Module keeping a searchable catalog of the fonts on this machine.
+
+Font directories are scanned once and each TTF/OTF file's family and style,
+units per em, ascent, descent and line gap and cmap coverage are stored in a
+JSON index. Later scans only parse files whose modification time or size
+changed, so searching thousands of fonts is instant. Metrics come straight
+from the head, hhea and name tables, with no rasterization.
+"""
+
+import json
+import os
+import struct
+import sys
+import tempfile
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from colossus_ltsm.font_coverage import read_cmap, sfnt_tables
+
+FONT_SUFFIXES = (".ttf", ".otf")
+CATALOG_VERSION = 1
+CATALOG_PATH = (Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+                / "colossus_ltsm" / "font_catalog.json")
+
+# name table ids: typographic family/subfamily first, then the legacy ones
+_FAMILY_IDS = (16, 1)
+_STYLE_IDS = (17, 2)
+
+
+def default_font_dirs():
+    """Font directories of the current platform that exist."""
+    home = Path.home()
+    if sys.platform.startswith("win"):
+        dirs = [Path(os.environ.get("WINDIR", "C:/Windows")) / "Fonts",
+                home / "AppData/Local/Microsoft/Windows/Fonts"]
+    elif sys.platform == "darwin":
+        dirs = [Path("/System/Library/Fonts"), Path("/Library/Fonts"), home / "Library/Fonts"]
+    else:
+        dirs = [Path("/usr/share/fonts"), Path("/usr/local/share/fonts"),
+                home / ".local/share/fonts", home / ".fonts"]
+    return [path for path in dirs if path.is_dir()]
+
+
+@dataclass
+class FontRecord: # pylint: disable=too-many-instance-attributes
+    """Catalog entry for one font file."""
+    path: str
+    family: str
+    style: str
+    units_per_em: int
+    ascent: int
+    descent: int
+    line_gap: int
+    glyphs: int
+    ranges: list = field(repr=False)
+    mtime_ns: int = 0
+    size: int = 0
+
+    def covers(self, start, end):
+        """True when every code point in start..end has a glyph."""
+        starts = [first for first, _ in self.ranges]
+        i = bisect_right(starts, start) - 1
+        return i >= 0 and self.ranges[i][1] >= end
+
+    def coverage(self, start, end):
+        """Fraction of start..end that has a glyph."""
+        hit = sum(max(0, min(last, end) - max(first, start) + 1) for first, last in self.ranges)
+        return hit / (end - start + 1)
+
+    def describe(self):
+        """One line summary for lists."""
+        return (f"{self.family} {self.style} | {self.units_per_em} upm, "
+                f"ascent {self.ascent}, descent {self.descent} | {self.glyphs} glyphs")
+
+
+def code_ranges(codes):
+    """Sorted code points as [[first, last], ...] runs."""
+    ranges = []
+    for code in sorted(codes):
+        if ranges and code == ranges[-1][1] + 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ranges
+
+
+def _name_rank(platform, encoding, language):
+    """Preference of a name record, lower first, None to skip it: English
+    Windows names, then Mac Roman, then other languages and Unicode."""
+    if platform == 3:
+        return 0 if language == 0x409 else 2
+    if platform == 1 and encoding == 0:
+        return 1 if language == 0 else 3
+    return 4 if platform == 0 else None
+
+
+def _name_string(data, name_at, wanted):
+    """First of the wanted name ids found, in _name_rank preference."""
+    count, strings_at = struct.unpack_from(">2xHH", data, name_at)
+    best = {}
+    for entry in range(count):
+        record = struct.unpack_from(">6H", data, name_at + 6 + entry * 12)
+        name_id, length, offset = record[3:]
+        rank = _name_rank(*record[:3])
+        if name_id in wanted and rank is not None and rank < best.get(name_id, (5, ""))[0]:
+            offset += name_at + strings_at
+            codec = "mac_roman" if record[0] == 1 else "utf-16-be"
+            best[name_id] = (rank, data[offset:offset + length].decode(codec, errors="replace"))
+    for name_id in wanted:
+        if best.get(name_id, (0, ""))[1]:
+            return best[name_id][1]
+    return ""
+
+
+def read_font_record(path):
+    """Parse one font file into a FontRecord, raises ValueError when it
+    is not a readable TTF/OTF file."""
+    path = Path(path)
+    data = path.read_bytes()
+    stat = path.stat()
+    try:
+        tables = sfnt_tables(data)
+        if "head" not in tables or "hhea" not in tables:
+            raise ValueError(f"{path.name} has no head or hhea table.")
+        units_per_em = struct.unpack_from(">H", data, tables["head"][0] + 18)[0]
+        ascent, descent, line_gap = struct.unpack_from(">hhh", data, tables["hhea"][0] + 4)
+        family = style = ""
+        if "name" in tables:
+            family = _name_string(data, tables["name"][0], _FAMILY_IDS)
+            style = _name_string(data, tables["name"][0], _STYLE_IDS)
+        codes = read_cmap(data)
+    except struct.error as err:
+        raise ValueError(f"Corrupt font file {path}: {err}") from None
+    return FontRecord(str(path), family or path.stem, style or "Regular", units_per_em,
+                      ascent, descent, line_gap, len(codes), code_ranges(codes),
+                      stat.st_mtime_ns, stat.st_size)
+
+
+class FontCatalog:
+    """Index of font files, kept in a JSON file and refreshed by mtime."""
+
+    def __init__(self, index_path=None):
+        self.index_path = Path(index_path) if index_path is not None else CATALOG_PATH
+        self.records = {}
+        self.load()
+
+    def load(self):
+        """Read the index, starting empty when it is missing or outdated."""
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if index.get("version") != CATALOG_VERSION:
+                return
+            self.records = {path: FontRecord(**record)
+                            for path, record in index["fonts"].items()}
+        except (OSError, ValueError, TypeError, KeyError) as err:
+            if self.index_path.exists():
+                print(f"[Catalog] Ignoring unreadable index {self.index_path}: {err}")
+
+    def save(self):
+        """Write the index atomically."""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        index = {"version": CATALOG_VERSION,
+                 "fonts": {path: asdict(record) for path, record in self.records.items()}}
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.index_path.parent,
+                                         suffix=".tmp", delete=False) as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(f.name, self.index_path)
+
+    def scan(self, directories, rescan=False):
+        """Index every font under directories, parsing only new or changed
+        files. Fonts gone from those directories are dropped. Returns
+        {'added', 'updated', 'unchanged', 'removed', 'failed'} counts."""
+        counts = dict.fromkeys(("added", "updated", "unchanged", "removed", "failed"), 0)
+        roots = [str(Path(directory).resolve()) for directory in directories]
+        seen = set()
+        for root in roots:
+            for folder, _, files in os.walk(root):
+                for name in files:
+                    if name.lower().endswith(FONT_SUFFIXES):
+                        path = os.path.join(folder, name)
+                        seen.add(path)
+                        counts[self._refresh(path, rescan)] += 1
+        for path in [p for p in self.records if p not in seen
+                     and any(p.startswith(root + os.sep) for root in roots)]:
+            del self.records[path]
+            counts["removed"] += 1
+        if any(counts[key] for key in ("added", "updated", "removed")):
+            self.save()
+        return counts
+
+    def _refresh(self, path, rescan):
+        old = self.records.get(path)
+        try:
+            stat = os.stat(path)
+            if old and not rescan and (old.mtime_ns, old.size) == (stat.st_mtime_ns,
+                                                                    stat.st_size):
+                return "unchanged"
+            self.records[path] = read_font_record(path)
+        except (OSError, ValueError):
+            self.records.pop(path, None)
+            return "failed"
+        return "updated" if old else "added"
+
+    def search(self, query="", covering=None, limit=None):
+        """Fonts whose family, style or file name contain every word of
+        query, and that cover all the (start, end) ranges of covering."""
+        words = query.lower().split()
+        found = []
+        for record in self.records.values():
+            text = f"{record.family} {record.style} {Path(record.path).name}".lower()
+            if all(word in text for word in words) \
+                    and all(record.covers(*span) for span in covering or ()):
+                found.append(record)
+        found.sort(key=lambda r: (r.family.lower(), r.style.lower(), r.path))
+        return found[:limit] if limit else found
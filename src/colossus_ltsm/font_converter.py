@@ -2,38 +2,48 @@
 Module for converting TTF fonts to C/C++ bitmap arrays."""
 
 import os
-from dataclasses import dataclass
-from pathlib import Path
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageFont, ImageDraw
 from colossus_ltsm.settings import settings
+from colossus_ltsm.font_engine import FontEngine, write_output
+from colossus_ltsm.packers import layout_names
+from colossus_ltsm.font_exporters import EXPORTERS, export_path
+from colossus_ltsm.font_coverage import MISSING_MODES
+from colossus_ltsm.font_subset import CorpusScanner
+from colossus_ltsm.font_catalog import FontCatalog, default_font_dirs
+from colossus_ltsm.draw_cost import DRAW_TARGETS
+from colossus_ltsm.font_preview import PreviewRenderer, preview_png
 
+# Quiet time after the last option change before the preview renders
+PREVIEW_DELAY_MS = 150
+PREVIEW_POLL_MS = 20
 
-@dataclass
-class GlyphRenderCtx: # pylint: disable=too-many-instance-attributes
-    """Lightweight bundle passed to glyph-render helpers."""
-    draw: object
-    char: str
-    code: int
-    glyph_w: int
-    canvas_w: int
-    canvas_h: int
-    params: dict
-    char_list: list
-    debug: bool
 
+def _index_fonts(dirs):
+    """Worker thread: load the font catalog and index dirs, returns the
+    catalog and the scan counts."""
+    catalog = FontCatalog()
+    return catalog, catalog.scan(dirs)
 
-class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
+
+class FontConverter(FontEngine, tk.Frame):  # pylint: disable=too-many-instance-attributes,too-many-ancestors
     """Page for converting TTF fonts to C/C++ bitmap arrays."""
 
     def __init__(self, parent, controller):
-        super().__init__(parent)
+        tk.Frame.__init__(self, parent)
         self.controller = controller
+        # Font catalog indexing, kept off the Tk thread
+        self._catalog_pool = ThreadPoolExecutor(max_workers=1)
         self._create_title()
         self._create_file_selection()
-        self._create_options()
+        options_frame = self._create_options()
+        self._create_export_options(options_frame)
+        self._create_missing_options(options_frame)
+        self._create_subset_options(options_frame)
+        self._create_draw_cost_options(options_frame)
         self._create_buttons()
+        self._create_preview_panel()
         self._create_log_panel()
 
     def _create_title(self):
@@ -42,8 +52,12 @@ class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
 
     def _create_file_selection(self):
         self.ttf_path = tk.StringVar()
-        tk.Button(self, text="Select TTF File",
-                  command=self.select_file).pack(pady=5)
+        buttons = tk.Frame(self)
+        buttons.pack(pady=5)
+        tk.Button(buttons, text="Select TTF File",
+                  command=self.select_file).pack(side="left", padx=5)
+        tk.Button(buttons, text="Search Installed Fonts",
+                  command=self.search_fonts).pack(side="left", padx=5)
         tk.Entry(self, textvariable=self.ttf_path, width=60).pack(pady=5)
 
     def _create_options(self):
@@ -96,7 +110,7 @@ class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
         # Row 4 - File & Array style
         tk.Label(options_frame, text="File Extension:").grid(
             row=3, column=0, sticky="e")
-        tk.OptionMenu(options_frame, self.file_ext, "h", "hpp").grid(
+        tk.OptionMenu(options_frame, self.file_ext, "h", "hpp", "bin").grid(
             row=3, column=1, padx=5)
 
         tk.Label(options_frame, text="Array Style:").grid(
@@ -104,22 +118,185 @@ class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
         tk.OptionMenu(options_frame, self.array_style, "c", "cpp").grid(
             row=3, column=3, padx=5)
 
-        # Row 5 - Addressing mode
+        # Row 5 - Addressing mode, any layout in the packer registry
         tk.Label(options_frame, text="Addressing:").grid(
             row=4, column=0, sticky="e")
-        tk.Radiobutton(options_frame, text="Horizontal",
-                       variable=self.addr_mode,
-                       value="horizontal").grid(row=4, column=1, sticky="w")
-        tk.Radiobutton(options_frame, text="Vertical",
-                       variable=self.addr_mode,
-                       value="vertical").grid(row=4, column=2, sticky="w")
+        layouts = layout_names()
+        tk.OptionMenu(options_frame, self.addr_mode, layouts[0], *layouts[1:]).grid(
+            row=4, column=1, columnspan=2, sticky="w")
+        # Largest font size whose ink fits the cell, no per-glyph scaling
+        self.auto_fit = tk.BooleanVar(value=False)
+        tk.Checkbutton(options_frame, text="Auto-fit size",
+                       variable=self.auto_fit).grid(row=4, column=3, sticky="w")
+
+        # Row 6 - Threshold tuning, re-packs from the cached rasterization
+        self.antialias = tk.BooleanVar(value=False)
+        self.threshold = tk.IntVar(value=128)
+        self.embolden = tk.IntVar(value=0)
+        self._threshold_job = None
+        tk.Checkbutton(options_frame, text="Anti-aliased",
+                       variable=self.antialias).grid(row=5, column=0, sticky="e")
+        # Monochrome cells hold only 0 and 255, the threshold has no effect
+        self.threshold_scale = tk.Scale(options_frame, from_=1, to=255, orient="horizontal",
+                                        label="Threshold", variable=self.threshold,
+                                        command=self._schedule_threshold_change,
+                                        state="disabled")
+        self.threshold_scale.grid(row=5, column=1, padx=5)
+        self.antialias.trace_add("write", lambda *_args: self.threshold_scale.config(
+            state="normal" if self.antialias.get() else "disabled"))
+        tk.Label(options_frame, text="Embolden px:").grid(
+            row=5, column=2, sticky="e")
+        tk.Spinbox(options_frame, from_=0, to=3, width=4,
+                   textvariable=self.embolden,
+                   command=self._schedule_threshold_change).grid(row=5, column=3, padx=5)
+
+        # Row 7 - Pre-rotated / mirrored glyph data for panels mounted at an angle
+        self.rotation = tk.IntVar(value=0)
+        self.mirror = tk.StringVar(value="none")
+        tk.Label(options_frame, text="Rotate (cw):").grid(
+            row=6, column=0, sticky="e")
+        tk.OptionMenu(options_frame, self.rotation, 0, 90, 180, 270).grid(
+            row=6, column=1, padx=5)
+        tk.Label(options_frame, text="Mirror:").grid(
+            row=6, column=2, sticky="e")
+        tk.OptionMenu(options_frame, self.mirror, "none", "horizontal", "vertical").grid(
+            row=6, column=3, padx=5)
+
+        return options_frame
+
+    def _create_export_options(self, options_frame):
+        # Row 8 - Other font formats written from the same rasterization
+        tk.Label(options_frame, text="Also export:").grid(
+            row=7, column=0, sticky="e")
+        export_frame = tk.Frame(options_frame)
+        export_frame.grid(row=7, column=1, columnspan=3, sticky="w")
+        self.export_vars = {}
+        for name, exporter in EXPORTERS.items():
+            self.export_vars[name] = tk.BooleanVar(value=False)
+            tk.Checkbutton(export_frame, text=exporter.description,
+                           variable=self.export_vars[name]).pack(side="left")
+
+    def _create_missing_options(self, options_frame):
+        # Row 9 - Code points the font has no glyph for, found from its cmap
+        self.missing = tk.StringVar(value=MISSING_MODES[0])
+        self.substitute = tk.StringVar(value="?")
+        tk.Label(options_frame, text="Missing glyphs:").grid(
+            row=8, column=0, sticky="e")
+        tk.OptionMenu(options_frame, self.missing, MISSING_MODES[0], *MISSING_MODES[1:]).grid(
+            row=8, column=1, padx=5)
+        tk.Label(options_frame, text="Substitute:").grid(
+            row=8, column=2, sticky="e")
+        tk.Entry(options_frame, textvariable=self.substitute, width=3).grid(
+            row=8, column=3, padx=5, sticky="w")
+
+    def _create_subset_options(self, options_frame):
+        # Row 10 - Only convert code points used by these source/string files
+        self.corpus_paths = tk.StringVar(value="")
+        # Code points per corpus file, re-read only when a file changes
+        self._corpus_scanner = CorpusScanner()
+        tk.Label(options_frame, text="Subset corpus:").grid(
+            row=9, column=0, sticky="e")
+        tk.Entry(options_frame, textvariable=self.corpus_paths, width=40).grid(
+            row=9, column=1, columnspan=2, padx=5, sticky="we")
+        tk.Button(options_frame, text="Browse...", command=self._select_corpus).grid(
+            row=9, column=3, padx=5, sticky="w")
 
     def _create_buttons(self):
         btn_frame = tk.Frame(self)
         btn_frame.pack(pady=20)
+        tk.Button(btn_frame, text="Render",
+                  command=self.render).pack(side="left", padx=10)
         tk.Button(btn_frame, text="Convert",
                   command=self.convert).pack(side="left", padx=10)
 
+    def _create_preview_panel(self):
+        """Live preview of the first glyphs, re-rendered on a worker thread
+        shortly after any option that changes the glyph data."""
+        preview_frame = tk.LabelFrame(self, text="Live Preview")
+        preview_frame.pack(pady=5, padx=10, fill="x")
+        self._preview_label = tk.Label(preview_frame, bg="#000000")
+        self._preview_label.pack(pady=5)
+        self._preview_status = tk.Label(preview_frame, text="Select a TTF file to preview.",
+                                        anchor="w")
+        self._preview_status.pack(fill="x", padx=5)
+        self._preview_photo = None
+        self._preview_job = None
+        self._preview_poll_job = None
+        self._preview_generation = 0
+        # Reads this page's converted cells but never replaces them: the
+        # renderer keeps its own cache, only the Tk thread converts
+        self._preview = PreviewRenderer(self)
+        self._preview_pool = ThreadPoolExecutor(max_workers=1)
+        for var in (self.ttf_path, self.pixel_width, self.pixel_height, self.ascii_start,
+                    self.ascii_end, self.addr_mode, self.auto_fit, self.antialias,
+                    self.threshold, self.embolden, self.rotation, self.mirror,
+                    self.missing, self.substitute, self.corpus_paths):
+            var.trace_add("write", self._schedule_preview)
+
+    def _schedule_preview(self, *_args):
+        """Restart the quiet period, so a burst of edits renders once."""
+        if self._preview_job is not None:
+            self.after_cancel(self._preview_job)
+        self._preview_job = self.after(PREVIEW_DELAY_MS, self._start_preview)
+
+    def _start_preview(self):
+        """Read the options here, Tk variables belong to the main thread,
+        and render on the worker. Older renders still running are ignored."""
+        self._preview_job = None
+        ttf_path = self.ttf_path.get()
+        if not ttf_path:
+            return
+        try:
+            params = self._read_params(scan=False)
+        except (tk.TclError, ValueError):
+            self._preview_status.config(text="Waiting for valid options...")
+            return
+        self._preview_generation += 1
+        future = self._preview_pool.submit(self._render_preview, ttf_path, params,
+                                           self._corpus(), settings.snapshot())
+        if self._preview_poll_job is not None:
+            self.after_cancel(self._preview_poll_job)
+        self._preview_poll_job = self.after(PREVIEW_POLL_MS, self._poll_preview,
+                                            future, self._preview_generation)
+
+    def _render_preview(self, ttf_path, params, corpus, colors):
+        """Worker thread: scan the corpus, then the sheet as PNG data and a
+        status line."""
+        if corpus:
+            params['codepoints'] = self._corpus_scanner.scan(corpus)
+        sheet = self._preview.render(ttf_path, params)
+        data = preview_png(sheet, colors.glyph_color, colors.background_color)
+        instruments = self._preview.instruments
+        cached = "cached cells" if instruments.counters.get("cache_hits") else "rasterized"
+        return data, (f"{params['width']}x{params['height']} {params['addr_mode']}, "
+                      f"{cached}, {instruments.total * 1e3:.1f} ms")
+
+    def _poll_preview(self, future, generation):
+        if not future.done():
+            self._preview_poll_job = self.after(PREVIEW_POLL_MS, self._poll_preview,
+                                                future, generation)
+            return
+        self._preview_poll_job = None
+        if generation != self._preview_generation:
+            return
+        try:
+            data, status = future.result()
+        except (OSError, ValueError) as err:
+            self._preview_status.config(text=f"No preview: {err}")
+            return
+        self._preview_photo = tk.PhotoImage(data=data)
+        self._preview_label.config(image=self._preview_photo)
+        self._preview_status.config(text=status)
+
+    def destroy(self):
+        """Cancel pending callbacks and stop the preview worker with the page."""
+        for job in (self._preview_job, self._preview_poll_job, self._threshold_job):
+            if job is not None:
+                self.after_cancel(job)
+        self._preview_pool.shutdown(wait=False, cancel_futures=True)
+        self._catalog_pool.shutdown(wait=False, cancel_futures=True)
+        super().destroy()
+
     def _create_log_panel(self):
         log_frame = tk.Frame(self)
         log_frame.pack(pady=5, padx=10, fill="x", expand=False)
@@ -175,6 +352,84 @@ class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
         else:
             print("[cview] No file selected, open cancelled.")
 
+    def search_fonts(self):
+        """Pick a font from the catalog of installed fonts and the input
+        directory, filtered as you type. The catalog is indexed on a worker
+        thread, the list fills in when it is done."""
+        input_dir = settings.getstr("Paths", "input_dir", fallback="")
+        dirs = default_font_dirs() + ([input_dir] if os.path.isdir(input_dir) else [])
+        future = self._catalog_pool.submit(_index_fonts, dirs)
+
+        dialog = tk.Toplevel(self)
+        dialog.title("Search Installed Fonts")
+        query = tk.StringVar()
+        entry = tk.Entry(dialog, textvariable=query, width=60)
+        entry.pack(padx=5, pady=5, fill="x")
+        listbox = tk.Listbox(dialog, width=80, height=20)
+        listbox.pack(padx=5, pady=5, fill="both", expand=True)
+        listbox.insert(tk.END, "Indexing fonts...")
+        found = []
+        catalog = []
+
+        def refresh(*_args):
+            if not catalog:
+                return
+            found[:] = catalog[0].search(query.get())
+            listbox.delete(0, tk.END)
+            for record in found:
+                listbox.insert(tk.END, record.describe())
+
+        def poll():
+            if not dialog.winfo_exists():
+                return
+            if not future.done():
+                self.after(PREVIEW_POLL_MS, poll)
+                return
+            try:
+                result, counts = future.result()
+            except OSError as err:
+                listbox.delete(0, tk.END)
+                listbox.insert(tk.END, f"Font catalog failed: {err}")
+                return
+            print(f"[cview] Font catalog: {len(result.records)} fonts, "
+                  f"{counts['added'] + counts['updated']} indexed now.")
+            catalog.append(result)
+            refresh()
+
+        def choose(_event=None):
+            selection = listbox.curselection()
+            if selection and found:
+                self.ttf_path.set(found[selection[0]].path)
+                dialog.destroy()
+
+        query.trace_add("write", refresh)
+        listbox.bind("<Double-Button-1>", choose)
+        listbox.bind("<Return>", choose)
+        tk.Button(dialog, text="Select", command=choose).pack(pady=5)
+        entry.focus_set()
+        poll()
+
+    def _create_draw_cost_options(self, options_frame):
+        # Row 11 - Simulated device drawing cost, reported in the log
+        self.draw_sample = tk.StringVar(value="")
+        self.draw_target = tk.StringVar(value=DRAW_TARGETS[0])
+        tk.Label(options_frame, text="Draw-cost sample:").grid(
+            row=10, column=0, sticky="e")
+        tk.Entry(options_frame, textvariable=self.draw_sample, width=40).grid(
+            row=10, column=1, columnspan=2, padx=5, sticky="we")
+        tk.OptionMenu(options_frame, self.draw_target, DRAW_TARGETS[0], *DRAW_TARGETS[1:]).grid(
+            row=10, column=3, padx=5, sticky="w")
+
+    def _select_corpus(self):
+        """Choose source and string table files whose text sets the subset."""
+        paths = filedialog.askopenfilenames(
+            title="Select Source or String Files",
+            filetypes=[("Sources and string tables", "*.c *.h *.cpp *.hpp *.ino *.json *.po"),
+                       ("All Files", "*.*")]
+        )
+        if paths:
+            self.corpus_paths.set(";".join(paths))
+
     def convert(self):
         """Convert the selected TTF font to a C/C++ bitmap array."""
         if not self.ttf_path.get():
@@ -198,26 +453,23 @@ class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
             if not self._validate_dimensions(params):
                 messagebox.showerror(
                 "Error", "Invalid dimensions for addressing mode, conversion cancelled. " \
-                "Pixel width  must be a multiple of 8 for horizontal mode." \
-                "Pixel height must be a multiple of 8 for vertical mode.")
+                "Pixel width  must be a multiple of 8 for horizontal modes." \
+                "Pixel height must be a multiple of 8 for vertical modes. " \
+                "Width and height swap when rotated 90 or 270 degrees.")
                 print("[cview] Invalid dimensions for addressing mode, conversion cancelled.")
                 return
-            font = ImageFont.truetype(self.ttf_path.get(), params['height'])
-            font_name, font_style = font.getname()
-            ascent, descent = font.getmetrics()
-            self._log(f"Font: {font_name} {font_style} | "
-                      f"Size: {params['width']}x{params['height']} | "
-                      f"Ascent: {ascent}px  Descent: {descent}px")
-            if settings.getbool("Debug", "debugOnOff", False):
-                print(f"Font selected: {font_name} , {font_style}")
-                print(f"Font metrics: ascent={ascent}px, descent={descent}px")
-
-            control = [params['width'], params['height'], params['start'],
-                       params['end'] - params['start']]
-            glyph_blocks = self._generate_glyph_blocks(font, params)
-            output = self._compose_output(control, glyph_blocks, params)
-            Path(save_path).write_text(output, encoding="utf-8")
+            output = self.convert_font(self.ttf_path.get(), params)
+            with self.instruments.phase("write"):
+                write_output(save_path, output)
             self._log(f"Saved: {save_path}", "success")
+            with self.instruments.phase("format"):
+                exported = self.export_formats(params['formats'], params)
+            for name, text in exported.items():
+                path = export_path(save_path, name)
+                with self.instruments.phase("write"):
+                    write_output(path, text)
+                self._log(f"Saved {EXPORTERS[name].description}: {path}", "success")
+            self.report_instruments(output=save_path)
             messagebox.showinfo("Success", f"Font converted:\n{save_path}")
             print(f"Font conversion successful. Output saved to: {save_path}")
 
@@ -225,37 +477,94 @@ class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
             self._log(f"Conversion failed: {e}", "error")
             messagebox.showerror("Error", f"Conversion failed:\n{e}")
 
+    def render(self):
+        """Rasterize the selected font into the grayscale cache, so the
+        threshold and embolden controls can re-pack it live."""
+        if not self.ttf_path.get():
+            messagebox.showerror("Error", "Please select a TTF file first.")
+            return
+        params = self._get_params()
+        if not params:
+            return
+        try:
+            self._log_clear()
+            self.instruments.reset()
+            with self.instruments.phase("load"):
+                font = self.open_font(self.ttf_path.get(), params)
+            self._rasterize_glyphs(font, params)
+            self._on_threshold_change()
+            self.report_instruments()
+        except Exception as e: # pylint: disable=broad-exception-caught
+            self._log(f"Render failed: {e}", "error")
+
+    def _schedule_threshold_change(self, _value=None):
+        """Re-pack and report once the slider rests, not on every step."""
+        if self._threshold_job is not None:
+            self.after_cancel(self._threshold_job)
+        self._threshold_job = self.after(PREVIEW_DELAY_MS, self._on_threshold_change)
+
+    def _on_threshold_change(self):
+        """Re-pack the cached cells with the current threshold and embolden."""
+        self._threshold_job = None
+        if self._glyph_cache is None:
+            return
+        try:
+            params = self._get_params()
+            glyph_blocks = self.repack_glyph_blocks(params)
+        except (tk.TclError, ValueError, TypeError):
+            return
+        ink = sum(bin(b).count("1") for _, data in glyph_blocks for b in data)
+        self._log(f"Threshold {params['threshold']}, embolden {params['embolden']}px: "
+                  f"{ink} ink pixels in {len(glyph_blocks)} glyphs")
+
     def _get_params(self):
         """Get and validate parameters from UI."""
         try:
-            width = self.pixel_width.get()
-            height = self.pixel_height.get()
-            start = self.ascii_start.get()
-            end = self.ascii_end.get()
-            font_name = self.font_name.get()
-            output_name = self.output_name.get()
-            if not font_name:
-                font_name = "CustomFont"
-            if not output_name:
-                output_name = "font_output"
-            ext = self.file_ext.get()
-            array_style = self.array_style.get()
-            addr_mode = self.addr_mode.get()
-            return {
-                'width': width,
-                'height': height,
-                'start': start,
-                'end': end,
-                'font_name': font_name,
-                'output_name': output_name,
-                'ext': ext,
-                'array_style': array_style,
-                'addr_mode': addr_mode
-            }
+            return self._read_params()
+        except OSError as error:
+            messagebox.showerror("Error", f"Cannot read subset corpus:\n{error}")
+            return None
         except (tk.TclError, ValueError):
             messagebox.showerror("Error", "Invalid parameters.")
             return None
 
+    def _corpus(self):
+        return [p for p in self.corpus_paths.get().split(";") if p.strip()]
+
+    def _read_params(self, scan=True):
+        """Parameters from the UI, raises tk.TclError or ValueError for
+        invalid entries and OSError for an unreadable corpus. With scan
+        False 'codepoints' is left None for the caller to fill in."""
+        font_name = self.font_name.get()
+        output_name = self.output_name.get()
+        if not font_name:
+            font_name = "CustomFont"
+        if not output_name:
+            output_name = "font_output"
+        corpus = self._corpus() if scan else None
+        return {
+            'width': self.pixel_width.get(),
+            'height': self.pixel_height.get(),
+            'start': self.ascii_start.get(),
+            'end': self.ascii_end.get(),
+            'font_name': font_name,
+            'output_name': output_name,
+            'ext': self.file_ext.get(),
+            'array_style': self.array_style.get(),
+            'addr_mode': self.addr_mode.get(),
+            'threshold': self.threshold.get(),
+            'embolden': self.embolden.get(),
+            'antialias': self.antialias.get(),
+            'rotation': self.rotation.get(),
+            'mirror': self.mirror.get(),
+            'formats': [name for name, var in self.export_vars.items() if var.get()],
+            'missing': self.missing.get(),
+            'substitute': self.substitute.get()[:1] or "?",
+            'codepoints': self._corpus_scanner.scan(corpus) if corpus else None,
+            'auto_fit': self.auto_fit.get(),
+            'draw_sample': self.draw_sample.get() or None,
+            'draw_target': self.draw_target.get(),
+        }
 
     def _ask_save_path(self, output_name, ext):
         """Ask user where to save output file."""
@@ -267,238 +576,8 @@ class FontConverter(tk.Frame):  # pylint: disable=too-many-instance-attributes
             initialdir=output_dir,
             defaultextension=f".{ext}",
             initialfile=f"{output_name}.{ext}",
-            filetypes=[("Header files", f"*.{ext}")]
-        )
-
-    def _validate_dimensions(self, params):
-        """Validate width/height multiples for addressing mode."""
-        width = params.get("width", 0)
-        height = params.get("height", 0)
-
-        if width <= 0 or height <= 0:
-            return False
-        if params["addr_mode"] == "horizontal" and width % 8 != 0:
-            return False
-        if params["addr_mode"] == "vertical" and height % 8 != 0:
-            return False
-        return True
-
-    def _calculate_baseline(self, font, canvas_h, ascii_start=32, ascii_end=126):
-        """Calculate baseline_y by measuring the actual ink extents of all glyphs
-        in the ASCII range and fitting the baseline so nothing is clipped at
-        either the top or the bottom of the canvas.
-        """
-        max_above, max_below = self._scan_ink_extents(font, ascii_start, ascii_end)
-        total_ink_h = max_above + max_below
-
-        if total_ink_h == 0:
-            # No ink found — fall back to metric-based calculation
-            ascent, descent = font.getmetrics()
-            font_cell_h = ascent + descent
-            return round(ascent * canvas_h / font_cell_h) if font_cell_h > 0 else canvas_h - 1
-
-        if total_ink_h <= canvas_h:
-            spare = canvas_h - total_ink_h
-            baseline_y = spare // 2 + max_above
-        else:
-            baseline_y = max_above - (total_ink_h - canvas_h) // 2
-            self._log(
-                f"Warning: font ink height ({total_ink_h}px) exceeds canvas "
-                f"({canvas_h}px). Some clipping may be unavoidable — "
-                f"try a smaller font size or larger cell height.",
-                "warning"
-            )
-
-        if settings.getbool("Debug", "debugOnOff", False):
-            print(f"  Baseline calc: max_above={max_above}, max_below={max_below}, "
-                  f"total_ink={total_ink_h}, canvas_h={canvas_h}, "
-                  f"baseline_y={baseline_y}")
-
-        return baseline_y
-
-    def _scan_ink_extents(self, font, ascii_start, ascii_end):
-        """Return (max_above, max_below) ink extents across the ASCII range."""
-        max_above = 0
-        max_below = 0
-        for code in range(ascii_start, ascii_end + 1):
-            try:
-                bbox = font.getbbox(chr(code), anchor="ls")
-                if bbox is None:
-                    continue
-                # bbox format: (left, top, right, bottom)
-                max_above = max(max_above, -bbox[1])   # -top   (distance above baseline)
-                max_below = max(max_below, bbox[3])    # bottom (distance below baseline)
-            except (ValueError, OSError):
-                continue
-        return max_above, max_below
-
-    def _generate_glyph_blocks(self, font, params): # pylint: disable=too-many-locals
-        """Generate glyph blocks with baseline anchoring, with horizontal fit protection."""
-        glyph_blocks = []
-        canvas_w = params['width']
-        canvas_h = params['height']
-        baseline_y = self._calculate_baseline(
-            font, canvas_h, params['start'], params['end']
+            filetypes=[("Binary font" if ext == "bin" else "Header files", f"*.{ext}")]
         )
-        debug = settings.getbool("Debug", "debugOnOff", False)
-        scaled_chars = []
-        centred_chars = []
-
-        for code in range(params['start'], params['end'] + 1):
-            char = chr(code)
-            img = Image.new("1", (canvas_w, canvas_h), 0)
-            draw = ImageDraw.Draw(img)
-            try:
-                bbox = font.getbbox(char, anchor="ls")
-                if bbox is None:
-                    glyph_blocks.append((char, self._extract_glyph_bytes(img, params)))
-                    continue
-                glyph_w = bbox[2] - bbox[0]
-                ctx = GlyphRenderCtx(draw, char, code, glyph_w,
-                                     canvas_w, canvas_h, params,
-                                     scaled_chars if glyph_w > canvas_w else centred_chars,
-                                     debug)
-                if glyph_w > canvas_w:
-                    self._render_scaled_glyph(ctx)
-                else:
-                    self._render_centered_glyph(ctx, font, baseline_y)
-            except (OSError, ValueError) as err:
-                if debug:
-                    print(f"  Char '{char}' fallback render: {err}")
-                draw.text((0, 0), char, fill=1, font=font)
-
-            glyph_blocks.append((char, self._extract_glyph_bytes(img, params)))
-
-        self._report_glyph_stats(canvas_w, scaled_chars, centred_chars, debug)
-        return glyph_blocks
-
-    def _render_scaled_glyph(self, ctx: GlyphRenderCtx):
-        """Render a glyph that is wider than the cell by scaling the font down."""
-        scale = ctx.canvas_w / ctx.glyph_w
-        scaled_size = max(1, int(ctx.params['height'] * scale))
-        scaled_font = ImageFont.truetype(self.ttf_path.get(), scaled_size)
-        baseline = self._calculate_baseline(
-            scaled_font, ctx.canvas_h, ctx.params['start'], ctx.params['end']
-        )
-        ctx.draw.text((0, baseline), ctx.char, fill=1, font=scaled_font, anchor="ls")
-        ctx.char_list.append(f"'{ctx.char}'(0x{ctx.code:02X})")
-        if ctx.debug:
-            print(
-                f"Scaled '{ctx.char}' (0x{ctx.code:02X}) "
-                f"glyph_w={ctx.glyph_w} > canvas_w={ctx.canvas_w}, "
-                f"new size={scaled_size}"
-            )
-
-    def _render_centered_glyph(self, ctx: GlyphRenderCtx, font, baseline_y):
-        """Render a glyph centred horizontally within the cell."""
-        x_offset = (ctx.canvas_w - ctx.glyph_w) // 2
-        if x_offset > 0:
-            ctx.char_list.append(f"'{ctx.char}'(0x{ctx.code:02X})")
-        ctx.draw.text((x_offset, baseline_y), ctx.char, fill=1, font=font, anchor="ls")
-        if ctx.debug and ctx.glyph_w > ctx.canvas_w * 0.9:
-            print(
-                f"Char '{ctx.char}' (0x{ctx.code:02X}) "
-                f"glyph_w={ctx.glyph_w}, canvas_w={ctx.canvas_w} (tight fit)"
-            )
-
-    def _report_glyph_stats(self, canvas_w, scaled_chars, centred_chars, debug):
-        if scaled_chars:
-            self._log(
-                f"Width-scaled {len(scaled_chars)} glyph(s) to fit {canvas_w}px cell: "
-                f"{', '.join(scaled_chars)}",
-                "warning"
-            )
-            self._log(
-                "Tip: increase Pixel Width or reduce font size to avoid scaling.",
-                "warning"
-            )
-        else:
-            self._log(
-                "All glyphs fit within the cell width — no scaling needed.",
-                "info"
-            )
-        if debug and centred_chars:
-            preview = ", ".join(centred_chars[:10])
-            if len(centred_chars) > 10:
-                preview += " ..."
-
-            self._log(
-                f"Horizontally centred {len(centred_chars)} glyph(s): {preview}",
-                "info"
-            )
-
-    def _extract_glyph_bytes(self, img, params):
-        """Extract glyph bytes from image according to addressing mode."""
-        width  = params['width']
-        height = params['height']
-        if params['addr_mode'] == "vertical":
-            return self._pack_vertical(img, width, height)
-        return self._pack_horizontal(img, width, height)
-
-    @staticmethod
-    def _pack_vertical(img, width, height):
-        """Pack pixels column-major, 8 rows per byte (vertical addressing)."""
-        glyph_bytes = []
-        for y_block in range(0, height, 8):
-            for x in range(width):
-                byte_val = 0
-                for bit in range(8):
-                    yy = y_block + bit
-                    if yy < height:
-                        pixel = img.getpixel((x, yy))
-                        byte_val |= (1 if pixel else 0) << bit
-                glyph_bytes.append(byte_val)
-        return glyph_bytes
-
-    @staticmethod
-    def _pack_horizontal(img, width, height):
-        """Pack pixels row-major, 8 columns per byte (horizontal addressing)."""
-        glyph_bytes = []
-        for y in range(height):
-            for x_block in range(0, width, 8):
-                byte_val = 0
-                for bit in range(8):
-                    xx = x_block + bit
-                    pixel = img.getpixel((xx, y)) if xx < width else 0
-                    byte_val = (byte_val << 1) | (1 if pixel else 0)
-                glyph_bytes.append(byte_val)
-        return glyph_bytes
-
-    def _compose_output(self, control, glyph_blocks, params):
-        """Compose the output string for the font array."""
-        lines = []
-        control_line = ",".join(f"0x{b:02X}" for b in control) + ","
-        lines.append(control_line)
-        for char, glyph_bytes in glyph_blocks:
-            chunk = ",".join(f"0x{b:02X}" for b in glyph_bytes)
-            if 32 <= ord(char) <= 126:
-                line = chunk + ", // '" + char + "'"
-            else:
-                line = chunk
-            lines.append(line)
-        header = (
-            f"// Auto-generated monospaced bitmap font (C++/C array)\n"
-            f"// Format: [width, height, ASCII offset, last char- ASCII offset]\n"
-            f"// Data layout: {params['addr_mode']}-addressed byte rows per glyph\n"
-            f"// Generated by Colossus_LTSM\n"
-            f"// Generated font: {params['font_name']}\n"
-            f"// Size: {params['width']}x{params['height']}\n"
-            f"// ASCII range: 0x{params['start']:02X} → 0x{params['end']:02X}\n"
-            f"// Total size: {len(control) + sum(len(g) for _, g in glyph_blocks)} bytes \n"
-        )
-        if params['array_style'] == "cpp":
-            array_header = (
-                f"static const std::array<uint8_t, "
-                f"{len(control) + sum(len(g) for _, g in glyph_blocks)}>"
-                f" {params['font_name']} = {{"
-            )
-        else:
-            array_header = (
-                f"static const unsigned char {params['output_name']}["
-                f"{len(control) + sum(len(g) for _, g in glyph_blocks)}] = {{"
-            )
-        footer = "};\n"
-        return header + "\n" + array_header + "\n" + "\n".join(lines) + "\n" + footer
 
 
 if __name__ == "__main__":
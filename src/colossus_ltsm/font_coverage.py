@@ -0,0 +1,140 @@
+"""
+Module for reading which code points a font actually contains.
+
+The character map (cmap) table of the TTF/OTF file is parsed directly with
+struct, so coverage is known before any glyph is rasterized. Results are
+cached per file path and modification time.
+"""
+
+import os
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+
+MISSING_MODES = ("skip", "substitute", "flag")
+
+# (platform id, encoding id) in order of preference, Unicode tables first
+_CMAP_PREFERENCE = ((3, 10), (0, 6), (0, 4), (3, 1), (0, 3), (0, 2), (0, 1), (0, 0), (3, 0))
+_SFNT_VERSIONS = (b"\x00\x01\x00\x00", b"OTTO", b"true")
+
+
+@dataclass(frozen=True)
+class FontCoverage:
+    """Code points mapped to a real glyph by a font's cmap."""
+    path: str
+    codepoints: frozenset
+
+    def __contains__(self, code):
+        return code in self.codepoints
+
+    def missing(self, start, end):
+        """Code points in start..end the font has no glyph for."""
+        return [code for code in range(start, end + 1) if code not in self.codepoints]
+
+
+def _read_format0(data, offset):
+    glyph_ids = data[offset + 6:offset + 6 + 256]
+    return {code for code, gid in enumerate(glyph_ids) if gid}
+
+
+def _read_format4(data, offset): # pylint: disable=too-many-locals
+    seg_count = struct.unpack_from(">H", data, offset + 6)[0] // 2
+    ends_at = offset + 14
+    starts_at = ends_at + seg_count * 2 + 2
+    deltas_at = starts_at + seg_count * 2
+    ranges_at = deltas_at + seg_count * 2
+    ends = struct.unpack_from(f">{seg_count}H", data, ends_at)
+    starts = struct.unpack_from(f">{seg_count}H", data, starts_at)
+    deltas = struct.unpack_from(f">{seg_count}h", data, deltas_at)
+    range_offsets = struct.unpack_from(f">{seg_count}H", data, ranges_at)
+    codes = set()
+    for seg, (first, last) in enumerate(zip(starts, ends)):
+        if first == 0xFFFF:
+            continue
+        if range_offsets[seg] == 0:
+            codes.update(code for code in range(first, last + 1)
+                         if (code + deltas[seg]) & 0xFFFF)
+            continue
+        # idRangeOffset is relative to its own slot in the array
+        base = ranges_at + seg * 2 + range_offsets[seg]
+        for code in range(first, last + 1):
+            pos = base + (code - first) * 2
+            if pos + 2 <= len(data) and struct.unpack_from(">H", data, pos)[0]:
+                codes.add(code)
+    return codes
+
+
+def _read_format6(data, offset):
+    first, count = struct.unpack_from(">HH", data, offset + 6)
+    glyph_ids = struct.unpack_from(f">{count}H", data, offset + 10)
+    return {first + i for i, gid in enumerate(glyph_ids) if gid}
+
+
+def _read_format12(data, offset):
+    groups = struct.unpack_from(">I", data, offset + 12)[0]
+    codes = set()
+    for group in range(groups):
+        first, last, gid = struct.unpack_from(">III", data, offset + 16 + group * 12)
+        # Glyph 0 is .notdef, only the first code of a group can map to it
+        codes.update(range(first + (gid == 0), last + 1))
+    return codes
+
+
+_CMAP_READERS = {0: _read_format0, 4: _read_format4, 6: _read_format6, 12: _read_format12}
+
+
+def sfnt_tables(data):
+    """Return {tag: (offset, length)} from the table directory of a TTF/OTF file."""
+    if data[:4] not in _SFNT_VERSIONS:
+        raise ValueError("Not a TrueType/OpenType font file.")
+    num_tables = struct.unpack_from(">H", data, 4)[0]
+    tables = {}
+    for table in range(num_tables):
+        tag, _, table_offset, length = struct.unpack_from(">4sIII", data, 12 + table * 16)
+        tables[tag.decode("latin-1")] = (table_offset, length)
+    return tables
+
+
+def read_cmap(data):
+    """Return the set of code points the cmap in a TTF/OTF file maps to a glyph."""
+    cmap_at = sfnt_tables(data).get("cmap", (None, 0))[0]
+    if cmap_at is None:
+        raise ValueError("Font has no cmap table.")
+
+    subtables = {}
+    count = struct.unpack_from(">H", data, cmap_at + 2)[0]
+    for entry in range(count):
+        platform, encoding, sub_offset = struct.unpack_from(">HHI", data, cmap_at + 4 + entry * 8)
+        offset = cmap_at + sub_offset
+        fmt = struct.unpack_from(">H", data, offset)[0]
+        if fmt in _CMAP_READERS:
+            subtables.setdefault((platform, encoding), (fmt, offset))
+    for key in _CMAP_PREFERENCE:
+        if key in subtables:
+            fmt, offset = subtables[key]
+            return _CMAP_READERS[fmt](data, offset)
+    if subtables:
+        # Symbol or legacy encodings, take whatever is there
+        fmt, offset = next(iter(subtables.values()))
+        return _CMAP_READERS[fmt](data, offset)
+    raise ValueError("Font has no supported cmap subtable.")
+
+
+@lru_cache(maxsize=32)
+def _load_coverage(path, _mtime_ns):
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return FontCoverage(path, frozenset(read_cmap(data)))
+    except struct.error as err:
+        raise ValueError(f"Corrupt cmap table in {path}: {err}") from None
+
+
+def font_coverage(path):
+    """Return the FontCoverage for the font file at path, cached until the
+    file changes. Returns None when the file cannot be read or parsed."""
+    try:
+        path = os.path.abspath(path)
+        return _load_coverage(path, os.stat(path).st_mtime_ns)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,158 @@
+"""
+Module comparing two generated fonts glyph by glyph, without Tk.
+
+Each font is read into one bytes object and sliced into a dict of code
+point -> glyph bytes, so finding the changed glyphs is a dict lookup and
+a byte comparison per glyph: thousands of glyphs compare in milliseconds
+and nothing is decoded. Only the changed glyphs are then decoded and
+drawn, old and new side by side with an overlay of the pixels that were
+removed and added.
+"""
+
+from dataclasses import dataclass, field
+from PIL import Image, ImageChops, ImageDraw
+from colossus_ltsm.font_binary import MappedFont
+from colossus_ltsm.font_header import HeaderFont
+from colossus_ltsm.packers import get_packer
+
+# Overlay colours: pixels in both fonts, only in the old, only in the new
+KEPT_COLOR = (110, 110, 110)
+REMOVED_COLOR = (230, 40, 40)
+ADDED_COLOR = (40, 200, 70)
+BACKGROUND_COLOR = (0, 0, 0)
+GAP = 4
+LABEL_HEIGHT = 12
+
+
+@dataclass
+class FontGlyphs:
+    """Glyph bytes of a font by code point."""
+    path: str
+    width: int
+    height: int
+    layout: str
+    glyphs: dict = field(default_factory=dict)
+
+    def image(self, code):
+        """1-bit image of the glyph for code."""
+        return get_packer(self.layout).unpack(self.glyphs[code], self.width, self.height)
+
+
+def load_glyphs(path, layout=None):
+    """Glyphs of a header or .bin font. The layout is read from the .bin
+    header or the header's layout comment, layout is the fallback."""
+    path = str(path)
+    if path.lower().endswith(".bin"):
+        with MappedFont(path) as font:
+            font_bytes = list(font.font_bytes)
+            codes = font.codes()
+            layout = font.header.layout
+    else:
+        header = HeaderFont(path)
+        font_bytes = header.font_bytes
+        codes = header.index()
+        layout = header.layout or layout or "horizontal"
+    if len(font_bytes) < 4:
+        raise ValueError(f"{path}: invalid font data, no control bytes.")
+    # Headers of long ranges hold the glyph count in a wider control value
+    width, height, first, last = font_bytes[:4]
+    data = bytes(font_bytes[4:])
+    size = get_packer(layout).bytes_per_glyph(width, height)
+    count = len(data) // size
+    if len(codes) != count:
+        # A contiguous range, or an unrelated array after the font
+        codes = range(first, first + min(last + 1, count))
+    return FontGlyphs(path, width, height, layout,
+                      {code: data[i * size:(i + 1) * size] for i, code in enumerate(codes)})
+
+
+@dataclass
+class FontDiff:
+    """Code points changed, added and removed between two fonts."""
+    old: FontGlyphs
+    new: FontGlyphs
+    changed: list
+    added: list
+    removed: list
+
+    @property
+    def identical(self):
+        """True when no glyph differs."""
+        return not (self.changed or self.added or self.removed)
+
+    def summary(self):
+        """One line description of the differences."""
+        return (f"{len(self.changed)} changed, {len(self.added)} added, "
+                f"{len(self.removed)} removed of {len(self.old.glyphs)} -> "
+                f"{len(self.new.glyphs)} glyphs")
+
+
+def diff_fonts(old, new):
+    """Compare two FontGlyphs. Glyph bytes are compared directly when both
+    fonts share a cell size and layout, decoded images otherwise."""
+    common = old.glyphs.keys() & new.glyphs.keys()
+    if (old.width, old.height, old.layout) == (new.width, new.height, new.layout):
+        changed = [code for code in common if old.glyphs[code] != new.glyphs[code]]
+    elif (old.width, old.height) == (new.width, new.height):
+        changed = [code for code in common
+                   if old.image(code).tobytes() != new.image(code).tobytes()]
+    else:
+        changed = list(common)
+    return FontDiff(old, new, sorted(changed), sorted(new.glyphs.keys() - old.glyphs.keys()),
+                    sorted(old.glyphs.keys() - new.glyphs.keys()))
+
+
+def _cell(image, size):
+    """image on a blank 1-bit canvas of size, top left aligned."""
+    if image.size == size:
+        return image
+    cell = Image.new("1", size, 0)
+    cell.paste(image, (0, 0))
+    return cell
+
+
+def overlay(old_glyph, new_glyph):
+    """RGB image of two glyphs: kept pixels grey, removed red, added green."""
+    size = (max(old_glyph.width, new_glyph.width), max(old_glyph.height, new_glyph.height))
+    old_glyph, new_glyph = _cell(old_glyph, size), _cell(new_glyph, size)
+    changed = ImageChops.logical_xor(old_glyph, new_glyph)
+    image = Image.new("RGB", size, BACKGROUND_COLOR)
+    image.paste(KEPT_COLOR, (0, 0), ImageChops.logical_and(old_glyph, new_glyph))
+    image.paste(REMOVED_COLOR, (0, 0), ImageChops.logical_and(old_glyph, changed))
+    image.paste(ADDED_COLOR, (0, 0), ImageChops.logical_and(new_glyph, changed))
+    return image
+
+
+def _tiles(diff, code, scale):
+    """Old, new and overlay of one glyph, scaled up."""
+    size = (max(diff.old.width, diff.new.width), max(diff.old.height, diff.new.height))
+    old_glyph, new_glyph = diff.old.image(code), diff.new.image(code)
+    tiles = (_cell(old_glyph, size).convert("RGB"), _cell(new_glyph, size).convert("RGB"),
+             overlay(old_glyph, new_glyph))
+    return [tile.resize((size[0] * scale, size[1] * scale), Image.Resampling.NEAREST)
+            for tile in tiles]
+
+
+def render_diff(diff, scale=4, columns=4, limit=256):
+    """Sheet of the changed glyphs, at most limit of them: old, new and the
+    overlay side by side, columns entries per row. None when nothing
+    changed."""
+    codes = diff.changed[:limit]
+    if not codes:
+        return None
+    entry_w = 3 * max(diff.old.width, diff.new.width) * scale + 4 * GAP
+    entry_h = max(diff.old.height, diff.new.height) * scale + LABEL_HEIGHT + 2 * GAP
+    columns = max(1, min(columns, len(codes)))
+    sheet = Image.new("RGB", (columns * entry_w, -(-len(codes) // columns) * entry_h),
+                      BACKGROUND_COLOR)
+    draw = ImageDraw.Draw(sheet)
+    for i, code in enumerate(codes):
+        x, y = (i % columns) * entry_w + GAP, (i // columns) * entry_h + GAP
+        draw.text((x, y), _label(code), fill=(255, 255, 255))
+        for j, tile in enumerate(_tiles(diff, code, scale)):
+            sheet.paste(tile, (x + j * (tile.width + GAP), y + LABEL_HEIGHT))
+    return sheet
+
+
+def _label(code):
+    return f"U+{code:04X} '{chr(code)}'" if 32 <= code <= 126 else f"U+{code:04X}"
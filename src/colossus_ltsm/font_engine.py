@@ -0,0 +1,755 @@
+"""
+Module containing the Tk-free engine that rasterizes TTF fonts and packs
+them into C/C++ bitmap arrays. The FontConverter page builds on this."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from pathlib import Path
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+from colossus_ltsm.settings import settings
+from colossus_ltsm.font_binary import pack_font_blob
+from colossus_ltsm.font_coverage import MISSING_MODES, font_coverage
+from colossus_ltsm.draw_cost import (DrawCost, bitstream_draw_cost, cell_draw_cost,
+                                     format_cost_table, simulated_layouts, u8g2_draw_cost)
+from colossus_ltsm.font_exporters import get_exporter, make_export_glyph
+from colossus_ltsm.instrumentation import Instruments
+from colossus_ltsm.packers import PACKERS, get_packer
+
+DEFAULT_PARAMS = {
+    'width': 16,
+    'height': 16,
+    'start': 32,
+    'end': 126,
+    'font_name': "MyFontName",
+    'output_name': "my_font_file",
+    'ext': "hpp",
+    'array_style': "cpp",
+    'addr_mode': "horizontal",
+    'threshold': 128,
+    'embolden': 0,
+    'antialias': False,
+    'rotation': 0,
+    'mirror': "none",
+    'formats': [],
+    'missing': "skip",
+    'substitute': "?",
+    'codepoints': None,
+    'font_size': None,
+    'auto_fit': False,
+    'draw_sample': None,
+    'draw_target': "pixel",
+    'jobs': 1,
+}
+# Below this many glyphs starting worker processes costs more than it saves
+PARALLEL_MIN_GLYPHS = 64
+
+# Clockwise rotation in degrees -> PIL transpose, which rotates anti-clockwise
+ROTATIONS = {
+    0: None,
+    90: Image.Transpose.ROTATE_270,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+MIRRORS = {
+    "none": None,
+    "horizontal": Image.Transpose.FLIP_LEFT_RIGHT,
+    "vertical": Image.Transpose.FLIP_TOP_BOTTOM,
+}
+
+
+def make_params(**overrides):
+    """Return a full conversion parameter dict, defaults plus overrides."""
+    params = DEFAULT_PARAMS.copy()
+    params['formats'] = []
+    params.update(overrides)
+    return params
+
+
+def write_output(path, output):
+    """Write converter output, text for headers or bytes for .bin files."""
+    path = Path(path)
+    if isinstance(output, bytes):
+        path.write_bytes(output)
+    else:
+        path.write_text(output, encoding="utf-8")
+
+
+@dataclass
+class GlyphRenderCtx: # pylint: disable=too-many-instance-attributes
+    """Lightweight bundle passed to glyph-render helpers."""
+    draw: object
+    char: str
+    code: int
+    glyph_w: int
+    canvas_w: int
+    canvas_h: int
+    params: dict
+    char_list: list
+    debug: bool
+    font: object = None
+
+
+@dataclass
+class CachedGlyph:
+    """Grayscale rasterization of one glyph cell, kept for re-thresholding."""
+    code: int
+    char: str
+    gray: Image.Image
+    origin_x: int = 0
+    advance: int = 0
+
+
+@dataclass
+class GlyphCache:
+    """All grayscale glyph cells for one font, cell size and code range."""
+    key: tuple
+    baseline_y: int
+    glyphs: list
+    scaled_chars: list
+    centred_chars: list
+
+
+class FontEngine:
+    """Rasterize a TTF into glyph cells and pack them into byte arrays.
+
+    Glyphs are rendered once into 8-bit grayscale cells which are cached,
+    so threshold and emboldening changes only re-pack from the cache and
+    make no FreeType calls.
+    """
+
+    _glyph_cache = None
+    _instruments = None
+
+    def _log(self, message, level="info"): # pylint: disable=unused-argument
+        """Report a conversion message, the GUI overrides this."""
+        print(message)
+
+    @property
+    def instruments(self):
+        """Phase timers and counters of the current conversion."""
+        if self._instruments is None:
+            self._instruments = Instruments()
+        return self._instruments
+
+    @instruments.setter
+    def instruments(self, instruments):
+        self._instruments = instruments
+
+    def report_instruments(self, **extra):
+        """Log the timing summary of the last conversion and hand the
+        figures, with any extra fields, to the instruments' sink."""
+        self._log(self.instruments.summary())
+        self.instruments.emit(**extra)
+
+    def convert_font(self, ttf_path, params):
+        """Convert the TTF at ttf_path and return the output file contents,
+        text for C/C++ headers or bytes for the .bin format."""
+        self.instruments.reset()
+        with self.instruments.phase("load"):
+            font = self.open_font(ttf_path, params)
+        font_name, font_style = font.getname()
+        ascent, descent = font.getmetrics()
+        self._log(f"Font: {font_name} {font_style} | "
+                  f"Size: {params['width']}x{params['height']} | "
+                  f"Ascent: {ascent}px  Descent: {descent}px")
+        if settings.snapshot().debug:
+            print(f"Font selected: {font_name} , {font_style}")
+            print(f"Font metrics: ascent={ascent}px, descent={descent}px")
+
+        glyph_w, glyph_h = self._glyph_dims(params)
+        codes = self._glyph_codes(params)
+        if not codes:
+            raise ValueError(f"No code points to convert between "
+                             f"0x{params['start']:02X} and 0x{params['end']:02X}.")
+        # For a subset the last byte counts glyphs, codes come from the index
+        control = [glyph_w, glyph_h, codes[0], len(codes) - 1]
+        glyph_blocks = self._generate_glyph_blocks(font, params)
+        if params.get('codepoints') is not None:
+            self._report_subset(control, glyph_blocks, params)
+        if params.get('draw_sample'):
+            self._report_draw_cost(params)
+        with self.instruments.phase("format"):
+            if params['ext'] == "bin":
+                output = self._compose_binary(control, glyph_blocks, params)
+            else:
+                output = self._compose_output(control, glyph_blocks, params)
+        self.instruments.count("output_bytes", len(output))
+        return output
+
+    def _report_draw_cost(self, params):
+        """Log the simulated device draw cost of params['draw_sample']."""
+        target = params.get('draw_target', "pixel")
+        with self.instruments.phase("draw_cost"):
+            costs = self.draw_costs(params, params['draw_sample'], target)
+        self._log(format_cost_table(costs, params['draw_sample'], target))
+
+    def open_font(self, ttf_path, params):
+        """Open the TTF at the point size to render: the cell height unless
+        params['font_size'] is set, or the auto-fitted size."""
+        font = ImageFont.truetype(ttf_path, params.get('font_size') or params['height'])
+        if params.get('auto_fit', False):
+            font = font.font_variant(size=self.fit_font_size(font, params))
+        return font
+
+    def fit_font_size(self, font, params):
+        """Binary search the largest point size whose ink fits the cell for
+        every code point converted, measuring bounding boxes only."""
+        codes = self._glyph_codes(params)
+        probes = 0
+
+        def fits(size):
+            nonlocal probes
+            probes += 1
+            with self.instruments.phase("scan"):
+                above, below, width = self._scan_ink_bounds(font.font_variant(size=size), codes)
+            return above + below <= params['height'] and width <= params['width']
+
+        # Ink is normally smaller than the em, so 2x the cell bounds the search
+        low, high = 1, 2 * max(params['width'], params['height'])
+        while low < high:
+            mid = (low + high + 1) // 2
+            if fits(mid):
+                low = mid
+            else:
+                high = mid - 1
+        self._log(f"Auto-fit: {low}px font fits the {params['width']}x{params['height']} "
+                  f"cell ({probes} sizes measured)")
+        return low
+
+    @staticmethod
+    def _glyph_codes(params):
+        """Code points to convert: the start..end range, or the corpus
+        subset in params['codepoints'] clipped to that range."""
+        if params.get('codepoints') is None:
+            return list(range(params['start'], params['end'] + 1))
+        return sorted({code for code in params['codepoints']
+                       if params['start'] <= code <= params['end']})
+
+    def _report_subset(self, control, glyph_blocks, params):
+        """Log the corpus subset against the full start..end range."""
+        dropped = sorted(set(params['codepoints']) - {ord(c) for c, _ in glyph_blocks})
+        if dropped:
+            preview = ", ".join(f"0x{code:02X}" for code in dropped[:16])
+            self._log(f"Corpus uses {len(dropped)} code point(s) outside "
+                      f"0x{params['start']:02X}-0x{params['end']:02X}, not converted: "
+                      f"{preview}{' ...' if len(dropped) > 16 else ''}", "warning")
+        per_glyph = len(glyph_blocks[0][1])
+        full = len(control) + per_glyph * (params['end'] - params['start'] + 1)
+        subset = len(control) + per_glyph * len(glyph_blocks) + 2 * len(glyph_blocks)
+        self._log(f"Subset: {len(glyph_blocks)} of {params['end'] - params['start'] + 1} "
+                  f"glyphs, {subset} bytes incl. index vs {full} bytes for the full "
+                  f"range, saved {full - subset} bytes ({100 * (full - subset) / full:.0f}%)")
+
+    @staticmethod
+    def _glyph_dims(params):
+        """Return (width, height) of the stored glyphs, swapped by a
+        quarter-turn rotation."""
+        if params.get('rotation', 0) in (90, 270):
+            return params['height'], params['width']
+        return params['width'], params['height']
+
+    def check_dimensions(self, params):
+        """Raise ValueError unless the cell size suits the data layout."""
+        if params.get('missing', "skip") not in MISSING_MODES:
+            raise ValueError(f"Unknown missing-glyph mode '{params.get('missing')}', "
+                             f"choose from: {', '.join(MISSING_MODES)}")
+        if self._validate_dimensions(params):
+            return
+        packer = PACKERS.get(params.get('addr_mode'))
+        if packer is None:
+            raise ValueError(f"Unknown data layout '{params.get('addr_mode')}'.")
+        raise ValueError(
+            f"Invalid dimensions for layout '{packer.name}': width must be a "
+            f"multiple of {packer.width_multiple} and height a multiple of "
+            f"{packer.height_multiple}, after any 90/270 degree rotation.")
+
+    def _validate_dimensions(self, params):
+        """Validate width/height multiples for addressing mode,
+        checked against the stored (rotated) glyph size."""
+        packer = PACKERS.get(params["addr_mode"])
+        if (packer is None or params.get('rotation', 0) not in ROTATIONS
+                or params.get('mirror', "none") not in MIRRORS):
+            return False
+        width = params.get("width", 0)
+        height = params.get("height", 0)
+        if params.get('rotation', 0) in (90, 270):
+            width, height = height, width
+
+        if width <= 0 or height <= 0:
+            return False
+        if width % packer.width_multiple != 0:
+            return False
+        if height % packer.height_multiple != 0:
+            return False
+        return True
+
+    def _calculate_baseline(self, font, canvas_h, ascii_start=32, ascii_end=126, codes=None):
+        """Calculate baseline_y by measuring the actual ink extents of all glyphs
+        in the ASCII range (or just codes) and fitting the baseline so nothing
+        is clipped at either the top or the bottom of the canvas.
+        """
+        max_above, max_below = self._scan_ink_extents(font, ascii_start, ascii_end, codes)
+        total_ink_h = max_above + max_below
+
+        if total_ink_h == 0:
+            # No ink found — fall back to metric-based calculation
+            ascent, descent = font.getmetrics()
+            font_cell_h = ascent + descent
+            return round(ascent * canvas_h / font_cell_h) if font_cell_h > 0 else canvas_h - 1
+
+        if total_ink_h <= canvas_h:
+            spare = canvas_h - total_ink_h
+            baseline_y = spare // 2 + max_above
+        else:
+            baseline_y = max_above - (total_ink_h - canvas_h) // 2
+            self._log(
+                f"Warning: font ink height ({total_ink_h}px) exceeds canvas "
+                f"({canvas_h}px). Some clipping may be unavoidable — "
+                f"try a smaller font size or larger cell height.",
+                "warning"
+            )
+
+        if settings.snapshot().debug:
+            print(f"  Baseline calc: max_above={max_above}, max_below={max_below}, "
+                  f"total_ink={total_ink_h}, canvas_h={canvas_h}, "
+                  f"baseline_y={baseline_y}")
+
+        return baseline_y
+
+    def _font_coverage(self, font):
+        """Return the cmap coverage of a font loaded from a file, or None
+        when it is unknown and every code point is assumed present."""
+        path = getattr(font, "path", None)
+        return font_coverage(path) if isinstance(path, str) else None
+
+    def _scan_ink_extents(self, font, ascii_start, ascii_end, codes=None):
+        """Return (max_above, max_below) ink extents across the ASCII range,
+        or only codes when given, ignoring code points the font has no glyph for."""
+        if codes is None:
+            codes = range(ascii_start, ascii_end + 1)
+        return self._scan_ink_bounds(font, codes)[:2]
+
+    def _scan_ink_bounds(self, font, codes):
+        """Return (max_above, max_below, max_width) of the ink of codes."""
+        max_above = 0
+        max_below = 0
+        max_width = 0
+        coverage = self._font_coverage(font)
+        for code in codes:
+            if coverage is not None and code not in coverage:
+                continue
+            try:
+                bbox = font.getbbox(chr(code), anchor="ls")
+                if bbox is None:
+                    continue
+                # bbox format: (left, top, right, bottom)
+                max_above = max(max_above, -bbox[1])   # -top   (distance above baseline)
+                max_below = max(max_below, bbox[3])    # bottom (distance below baseline)
+                max_width = max(max_width, bbox[2] - bbox[0])
+            except (ValueError, OSError):
+                continue
+        return max_above, max_below, max_width
+
+    @staticmethod
+    def _cache_key(font, params):
+        """Key identifying the grayscale cells a font and params produce.
+        A font file's modification time and size are part of it, so a file
+        overwritten in place is rasterized again."""
+        path = font.path if isinstance(getattr(font, "path", None), str) else id(font)
+        try:
+            stat = os.stat(path) if isinstance(path, str) else None
+        except OSError:
+            stat = None
+        stamp = (stat.st_mtime_ns, stat.st_size) if stat else None
+        return (path, stamp, getattr(font, "size", None), params['width'], params['height'],
+                params['start'], params['end'], bool(params.get('antialias', False)),
+                params.get('missing', "skip"), params.get('substitute', "?"),
+                FontEngine._subset_key(params))
+
+    @staticmethod
+    def _subset_key(params):
+        codepoints = params.get('codepoints')
+        return None if codepoints is None else tuple(sorted(set(codepoints)))
+
+    def _missing_codes(self, font, params):
+        """Look up the code points the font lacks, before rasterizing, and
+        report them. Returns a set, empty when coverage is unknown."""
+        coverage = self._font_coverage(font)
+        if coverage is None:
+            return set()
+        missing = [code for code in self._glyph_codes(params) if code not in coverage]
+        if missing:
+            mode = params.get('missing', "skip")
+            preview = ", ".join(f"0x{code:02X}" for code in missing[:16])
+            if len(missing) > 16:
+                preview += " ..."
+            action = {"skip": "left blank",
+                      "substitute": f"drawn as '{params.get('substitute', '?')}'",
+                      "flag": "rendered as the font's missing-glyph box"}[mode]
+            self._log(f"Font has no glyph for {len(missing)} code point(s), "
+                      f"{action}: {preview}", "warning")
+        return set(missing)
+
+    def _rasterize_glyphs(self, font, params):
+        """Render the code range into grayscale cells, reusing the cache when
+        the font, cell size and range are unchanged. With params['jobs'] > 1
+        the range is split across worker processes, output is identical."""
+        key = self._cache_key(font, params)
+        if self._glyph_cache is not None and self._glyph_cache.key == key:
+            self.instruments.count("cache_hits")
+            return self._glyph_cache
+        self.instruments.count("cache_misses")
+        codes, baseline_y, missing = self._scan_codes(font, params)
+        debug = settings.snapshot().debug
+        jobs = params.get('jobs') or 1
+        with self.instruments.phase("rasterize"):
+            if jobs > 1 and isinstance(getattr(font, "path", None), str) \
+                    and len(codes) >= PARALLEL_MIN_GLYPHS:
+                self.instruments.count("workers", jobs)
+                glyphs, scaled_chars, centred_chars = rasterize_parallel(
+                    font, params, codes, baseline_y, missing)
+            else:
+                glyphs, scaled_chars, centred_chars = self._render_cells(
+                    font, params, codes, baseline_y, missing)
+        self.instruments.count("glyphs", len(glyphs))
+        if missing:
+            self.instruments.count("missing", len(missing))
+
+        self._glyph_cache = GlyphCache(key, baseline_y, glyphs,
+                                       scaled_chars, centred_chars)
+        self._report_glyph_stats(params['width'], scaled_chars, centred_chars, debug)
+        return self._glyph_cache
+
+    def _scan_codes(self, font, params):
+        """Code points to convert, the baseline fitted to the ink bounds of
+        all of them and the set the font lacks. Measures bounding boxes only."""
+        codes = self._glyph_codes(params)
+        with self.instruments.phase("scan"):
+            baseline_y = self._calculate_baseline(
+                font, params['height'], params['start'], params['end'], codes
+            )
+            missing = self._missing_codes(font, params)
+        return codes, baseline_y, missing
+
+    def _render_cells(self, font, params, codes, baseline_y, missing): # pylint: disable=too-many-locals
+        """Render codes into grayscale cells, returns (glyphs, scaled chars,
+        centred chars). Runs in the worker processes for parallel renders."""
+        canvas_w = params['width']
+        canvas_h = params['height']
+        debug = settings.snapshot().debug
+        mode = params.get('missing', "skip")
+        glyphs = []
+        scaled_chars = []
+        centred_chars = []
+
+        for code in codes:
+            char = chr(code)
+            img = Image.new("L", (canvas_w, canvas_h), 0)
+            if code in missing and mode == "skip":
+                glyphs.append(CachedGlyph(code, char, img, 0, 0))
+                continue
+            if code in missing and mode == "substitute":
+                char = params.get('substitute', "?")[:1] or " "
+            draw = ImageDraw.Draw(img)
+            if not params.get('antialias', False):
+                # FreeType monochrome hinting, cells hold only 0 or 255
+                draw.fontmode = "1"
+            glyph = CachedGlyph(code, chr(code), img, 0, canvas_w)
+            try:
+                bbox = font.getbbox(char, anchor="ls")
+                if bbox is None:
+                    glyphs.append(glyph)
+                    continue
+                glyph_w = bbox[2] - bbox[0]
+                ctx = GlyphRenderCtx(draw, char, code, glyph_w,
+                                     canvas_w, canvas_h, params,
+                                     scaled_chars if glyph_w > canvas_w else centred_chars,
+                                     debug, font)
+                if glyph_w > canvas_w:
+                    self._render_scaled_glyph(ctx)
+                    glyph.advance = canvas_w
+                else:
+                    glyph.origin_x = self._render_centered_glyph(ctx, font, baseline_y)
+                    glyph.advance = round(font.getlength(char))
+            except (OSError, ValueError) as err:
+                if debug:
+                    print(f"  Char '{char}' fallback render: {err}")
+                draw.text((0, 0), char, fill=255, font=font)
+
+            glyphs.append(glyph)
+        return glyphs, scaled_chars, centred_chars
+
+    @staticmethod
+    def _threshold_glyph(gray, params):
+        """Threshold a grayscale cell to 1-bit and optionally embolden it."""
+        threshold = min(255, max(1, int(params.get('threshold', 128))))
+        lut = [0] * threshold + [255] * (256 - threshold)
+        mono = gray.point(lut, "1")
+        # Emboldening widens every stroke to the right by n pixels
+        bold = mono
+        for shift in range(1, int(params.get('embolden', 0)) + 1):
+            shifted = Image.new("1", mono.size, 0)
+            shifted.paste(mono, (shift, 0))
+            bold = ImageChops.logical_or(bold, shifted)
+        return bold
+
+    def _generate_glyph_blocks(self, font, params):
+        """Generate glyph blocks with baseline anchoring, with horizontal fit protection."""
+        cache = self._rasterize_glyphs(font, params)
+        return self._pack_cached_glyphs(cache, params)
+
+    def repack_glyph_blocks(self, params):
+        """Re-threshold and re-pack the cached cells, no FreeType calls."""
+        cache = self._glyph_cache
+        if cache is None or cache.key[3:7] != (params['width'], params['height'],
+                                               params['start'], params['end']) \
+                or cache.key[-1] != self._subset_key(params):
+            raise ValueError("No cached rasterization for these parameters.")
+        return self._pack_cached_glyphs(cache, params)
+
+    def export_formats(self, formats, params):
+        """Export the cached rasterization to other font formats, returns
+        {format name: file text}. Call after convert_font, no FreeType calls."""
+        glyphs = self.export_glyphs(params)
+        return {name: get_exporter(name).export(glyphs, params, self._glyph_cache.baseline_y)
+                for name in formats}
+
+    def draw_costs(self, params, sample, target="pixel"):
+        """Simulate drawing sample on a device with every layout that suits
+        the cell size and every export format, from the cached rasterization."""
+        cache = self._glyph_cache
+        if cache is None:
+            raise ValueError("No cached rasterization to simulate.")
+        size = self._glyph_dims(params)
+        costs = []
+        for layout in simulated_layouts():
+            layout_params = dict(params, addr_mode=layout)
+            if not self._validate_dimensions(layout_params):
+                continue
+            blocks = self._pack_cached_glyphs(cache, layout_params)
+            costs.append(cell_draw_cost(layout, blocks, size, sample, target))
+        glyphs = self.export_glyphs(params)
+        frame = (params['width'], params['height'], cache.baseline_y)
+        for fmt, simulate in (("gfx", partial(bitstream_draw_cost, "gfx")),
+                              ("lvgl", partial(bitstream_draw_cost, "lvgl")),
+                              ("u8g2", u8g2_draw_cost)):
+            try:
+                costs.append(simulate(glyphs, frame, sample, target))
+            except ValueError as err:
+                # Formats the exporter rejects for these glyphs are listed as skipped
+                costs.append(DrawCost(fmt, 0, skipped=str(err)))
+        return costs
+
+    def export_glyphs(self, params):
+        """Thresholded cached cells cropped to their ink, for the exporters."""
+        cache = self._glyph_cache
+        if cache is None:
+            raise ValueError("No cached rasterization to export.")
+        return [make_export_glyph(glyph.code, self._threshold_glyph(glyph.gray, params),
+                                  glyph.origin_x, cache.baseline_y, glyph.advance)
+                for glyph in cache.glyphs]
+
+    def _pack_cached_glyphs(self, cache, params):
+        with self.instruments.phase("pack"):
+            return [(glyph.char,
+                     self._extract_glyph_bytes(
+                         self._transform_glyph(
+                             self._threshold_glyph(glyph.gray, params), params),
+                         params))
+                    for glyph in cache.glyphs]
+
+    @staticmethod
+    def _transform_glyph(img, params):
+        """Mirror then rotate a glyph cell clockwise for panels mounted at
+        an angle, as whole-image transposes before any packing."""
+        mirror = MIRRORS[params.get('mirror', "none")]
+        rotation = ROTATIONS[params.get('rotation', 0)]
+        if mirror is not None:
+            img = img.transpose(mirror)
+        if rotation is not None:
+            img = img.transpose(rotation)
+        return img
+
+    def _render_scaled_glyph(self, ctx: GlyphRenderCtx):
+        """Render a glyph that is wider than the cell by scaling the font down."""
+        scale = ctx.canvas_w / ctx.glyph_w
+        scaled_size = max(1, int(ctx.font.size * scale))
+        scaled_font = ctx.font.font_variant(size=scaled_size)
+        baseline = self._calculate_baseline(
+            scaled_font, ctx.canvas_h, ctx.params['start'], ctx.params['end'],
+            self._glyph_codes(ctx.params)
+        )
+        ctx.draw.text((0, baseline), ctx.char, fill=255, font=scaled_font, anchor="ls")
+        ctx.char_list.append(f"'{ctx.char}'(0x{ctx.code:02X})")
+        if ctx.debug:
+            print(
+                f"Scaled '{ctx.char}' (0x{ctx.code:02X}) "
+                f"glyph_w={ctx.glyph_w} > canvas_w={ctx.canvas_w}, "
+                f"new size={scaled_size}"
+            )
+
+    def _render_centered_glyph(self, ctx: GlyphRenderCtx, font, baseline_y):
+        """Render a glyph centred horizontally within the cell, return the pen x."""
+        x_offset = (ctx.canvas_w - ctx.glyph_w) // 2
+        if x_offset > 0:
+            ctx.char_list.append(f"'{ctx.char}'(0x{ctx.code:02X})")
+        ctx.draw.text((x_offset, baseline_y), ctx.char, fill=255, font=font, anchor="ls")
+        if ctx.debug and ctx.glyph_w > ctx.canvas_w * 0.9:
+            print(
+                f"Char '{ctx.char}' (0x{ctx.code:02X}) "
+                f"glyph_w={ctx.glyph_w}, canvas_w={ctx.canvas_w} (tight fit)"
+            )
+        return x_offset
+
+    def _report_glyph_stats(self, canvas_w, scaled_chars, centred_chars, debug):
+        if scaled_chars:
+            self._log(
+                f"Width-scaled {len(scaled_chars)} glyph(s) to fit {canvas_w}px cell: "
+                f"{', '.join(scaled_chars)}",
+                "warning"
+            )
+            self._log(
+                "Tip: increase Pixel Width or reduce font size to avoid scaling.",
+                "warning"
+            )
+        else:
+            self._log(
+                "All glyphs fit within the cell width — no scaling needed.",
+                "info"
+            )
+        if debug and centred_chars:
+            preview = ", ".join(centred_chars[:10])
+            if len(centred_chars) > 10:
+                preview += " ..."
+
+            self._log(
+                f"Horizontally centred {len(centred_chars)} glyph(s): {preview}",
+                "info"
+            )
+
+    def _extract_glyph_bytes(self, img, params):
+        """Extract glyph bytes from image with the packer registered for
+        the addressing mode."""
+        return get_packer(params['addr_mode']).pack(img)
+
+    @staticmethod
+    def _pack_vertical(img, width, height):
+        """Pack pixels column-major, 8 rows per byte (vertical addressing)."""
+        if img.size != (width, height):
+            img = img.crop((0, 0, width, height))
+        return get_packer("vertical").pack(img)
+
+    @staticmethod
+    def _pack_horizontal(img, width, height):
+        """Pack pixels row-major, 8 columns per byte (horizontal addressing)."""
+        if img.size != (width, height):
+            img = img.crop((0, 0, width, height))
+        return get_packer("horizontal").pack(img)
+
+    def _compose_output(self, control, glyph_blocks, params):
+        """Compose the output string for the font array."""
+        lines = []
+        control_line = ",".join(f"0x{b:02X}" for b in control) + ","
+        lines.append(control_line)
+        for char, glyph_bytes in glyph_blocks:
+            chunk = ",".join(f"0x{b:02X}" for b in glyph_bytes)
+            if 32 <= ord(char) <= 126:
+                line = chunk + ", // '" + char + "'"
+            else:
+                line = chunk
+            lines.append(line)
+        header = (
+            f"// Auto-generated monospaced bitmap font (C++/C array)\n"
+            f"// Format: [width, height, ASCII offset, last char- ASCII offset]\n"
+            f"// Data layout: {params['addr_mode']}-addressed byte rows per glyph\n"
+            f"// Generated by Colossus_LTSM\n"
+            f"// Generated font: {params['font_name']}\n"
+            f"// Size: {params['width']}x{params['height']}\n"
+            f"// ASCII range: 0x{params['start']:02X} → 0x{params['end']:02X}\n"
+            f"// Total size: {len(control) + sum(len(g) for _, g in glyph_blocks)} bytes \n"
+        )
+        if params.get('codepoints') is not None:
+            header += (f"// Subset: {len(glyph_blocks)} glyphs, code point of glyph i "
+                       f"is index[i], last control byte = glyph count - 1\n")
+        if params.get('rotation', 0) or params.get('mirror', "none") != "none":
+            header += (f"// Glyphs pre-transformed: mirror {params.get('mirror', 'none')}, "
+                       f"rotated {params.get('rotation', 0)} deg clockwise, "
+                       f"stored {control[0]}x{control[1]}\n")
+        if params['array_style'] == "cpp":
+            array_header = (
+                f"static const std::array<uint8_t, "
+                f"{len(control) + sum(len(g) for _, g in glyph_blocks)}>"
+                f" {params['font_name']} = {{"
+            )
+        else:
+            array_header = (
+                f"static const unsigned char {params['output_name']}["
+                f"{len(control) + sum(len(g) for _, g in glyph_blocks)}] = {{"
+            )
+        footer = "};\n"
+        return (header + "\n" + array_header + "\n" + "\n".join(lines) + "\n" + footer
+                + self._compose_index(glyph_blocks, params))
+
+    @staticmethod
+    def _compose_index(glyph_blocks, params):
+        """Compose the code point index array that follows a subset font."""
+        if params.get('codepoints') is None:
+            return ""
+        codes = [ord(char) for char, _ in glyph_blocks]
+        values = ",".join(f"0x{code:02X}" for code in codes)
+        if params['array_style'] == "cpp":
+            array_header = (f"static const std::array<uint16_t, {len(codes)}>"
+                            f" {params['font_name']}_index = {{")
+        else:
+            array_header = (f"static const unsigned short "
+                            f"{params['output_name']}_index[{len(codes)}] = {{")
+        return "\n" + array_header + "\n" + values + "\n};\n"
+
+    def _compose_binary(self, control, glyph_blocks, params):
+        """Compose the raw .bin output, header then control and glyph bytes."""
+        index = None
+        if params.get('codepoints') is not None:
+            index = [ord(char) for char, _ in glyph_blocks]
+        blob = pack_font_blob(control, glyph_blocks, params, index)
+        data_len = len(control) + sum(len(g) for _, g in glyph_blocks) + 2 * len(index or [])
+        self._log(f"Binary font: {len(blob)} bytes ({len(blob) - data_len} byte header)")
+        return blob
+
+
+@lru_cache(maxsize=8)
+def _worker_font(path, size):
+    """Face opened once per worker process and reused for every chunk."""
+    return ImageFont.truetype(path, size)
+
+
+class _QuietEngine(FontEngine):
+    def _log(self, message, level="info"):
+        pass
+
+
+def _render_chunk(job):
+    path, size, params, codes, baseline_y, missing = job
+    return _QuietEngine()._render_cells(_worker_font(path, size), params, codes,  # pylint: disable=protected-access
+                                        baseline_y, missing)
+
+
+def rasterize_parallel(font, params, codes, baseline_y, missing):
+    """Render codes in contiguous chunks across params['jobs'] worker
+    processes and merge them in code order."""
+    jobs = params['jobs']
+    step = -(-len(codes) // (jobs * 4))
+    chunks = [(font.path, font.size, params, codes[i:i + step], baseline_y, missing)
+              for i in range(0, len(codes), step)]
+    glyphs, scaled_chars, centred_chars = [], [], []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for chunk_glyphs, chunk_scaled, chunk_centred in pool.map(_render_chunk, chunks):
+            glyphs += chunk_glyphs
+            scaled_chars += chunk_scaled
+            centred_chars += chunk_centred
+    return glyphs, scaled_chars, centred_chars
+
+
+if __name__ == "__main__":
+    print("[cview] This is a module, not a standalone script.")
@@ -0,0 +1,401 @@
+"""
+Module for exporting converted glyphs to established embedded font formats:
+Adafruit GFX (GFXfont), u8g2 and LVGL (lv_font_fmt_txt, 1 bpp).
+
+Exporters take the thresholded cells of the converter's rasterization pass,
+so one render feeds the Colossus array and any number of these formats.
+"""
+
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Callable, Optional
+
+from PIL import Image
+
+from colossus_ltsm import __version__
+
+
+@dataclass
+class ExportGlyph: # pylint: disable=too-many-instance-attributes
+    """One glyph cropped to its ink box, metrics relative to the pen position.
+    y_offset is the box top relative to the baseline, negative above it."""
+    code: int
+    char: str
+    bitmap: Optional[Image.Image]
+    width: int
+    height: int
+    x_offset: int
+    y_offset: int
+    advance: int
+
+
+@dataclass(frozen=True)
+class Exporter:
+    """A registered export format. flash_size(glyphs) returns the bytes the
+    font takes on the device, without generating the source text."""
+    name: str
+    suffix: str
+    description: str
+    export: Callable
+    flash_size: Callable
+
+
+EXPORTERS = {}
+
+
+def register_exporter(exporter):
+    """Add an exporter to the registry, keyed by its name."""
+    EXPORTERS[exporter.name] = exporter
+    return exporter
+
+
+def get_exporter(name):
+    """Return the registered exporter called name."""
+    try:
+        return EXPORTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown export format '{name}', "
+                         f"choose from: {', '.join(EXPORTERS)}") from None
+
+
+def export_path(save_path, name):
+    """Path for an exported format written beside the main output file."""
+    exporter = get_exporter(name)
+    stem, _, _ = str(save_path).rpartition(".")
+    return f"{stem or save_path}{exporter.suffix}"
+
+
+def make_export_glyph(code, mono, origin_x, baseline_y, advance):
+    """Crop a thresholded cell to its ink box and measure it from the pen."""
+    bbox = mono.getbbox()
+    if bbox is None:
+        return ExportGlyph(code, chr(code), None, 0, 0, 0, 0, advance)
+    left, top, right, bottom = bbox
+    return ExportGlyph(code, chr(code), mono.crop(bbox), right - left, bottom - top,
+                       left - origin_x, top - baseline_y, advance)
+
+
+def glyph_bitstream(glyph):
+    """Glyph pixels as one MSB-first bit stream, rows not padded,
+    the glyph padded to a whole byte (GFX and LVGL 1 bpp)."""
+    if glyph.bitmap is None:
+        return []
+    stride = (glyph.width + 7) // 8
+    raw = glyph.bitmap.tobytes()
+    bits = "".join(
+        "".join(f"{b:08b}" for b in raw[y * stride:(y + 1) * stride])[:glyph.width]
+        for y in range(glyph.height))
+    bits += "0" * (-len(bits) % 8)
+    return [int(bits[i:i + 8], 2) for i in range(0, len(bits), 8)]
+
+
+def _hex_lines(data, per_line=12, indent="  "):
+    return ",\n".join(
+        indent + ", ".join(f"0x{b:02X}" for b in data[i:i + per_line])
+        for i in range(0, len(data), per_line))
+
+
+def _char_comment(code):
+    char = chr(code)
+    return char if 32 <= code < 127 and char not in "\\*/" else ""
+
+
+def _banner(kind, params):
+    return (f"// {kind} font generated by Colossus_LTSM {__version__}\n"
+            f"// Font: {params['font_name']}, cell {params['width']}x{params['height']}\n")
+
+
+def _full_range(glyphs):
+    """Glyphs for every code first..last, empty entries for gaps."""
+    by_code = {g.code: g for g in glyphs}
+    first, last = glyphs[0].code, glyphs[-1].code
+    return [by_code.get(code) or ExportGlyph(code, chr(code), None, 0, 0, 0, 0, 0)
+            for code in range(first, last + 1)]
+
+
+def export_gfx(glyphs, params, baseline_y): # pylint: disable=unused-argument
+    """Adafruit GFX library GFXfont."""
+    name = params['font_name']
+    bitmap = []
+    entries = []
+    for glyph in _full_range(glyphs):
+        data = glyph_bitstream(glyph)
+        entries.append(
+            f"  {{ {len(bitmap):5d}, {glyph.width:3d}, {glyph.height:3d}, "
+            f"{glyph.advance:3d}, {glyph.x_offset:4d}, {glyph.y_offset:4d} }}"
+            f",   // 0x{glyph.code:02X} '{_char_comment(glyph.code)}'")
+        bitmap.extend(data)
+        if bitmap and len(bitmap) > 0xFFFF:
+            raise ValueError("GFX bitmap exceeds the 16 bit bitmapOffset limit.")
+    first, last = glyphs[0].code, glyphs[-1].code
+    size = gfx_flash_size(glyphs)
+    return (
+        _banner("Adafruit GFX", params) + "\n"
+        f"const uint8_t {name}Bitmaps[] PROGMEM = {{\n{_hex_lines(bitmap) or '  0x00'}\n}};\n\n"
+        f"const GFXglyph {name}Glyphs[] PROGMEM = {{\n" + "\n".join(entries) + "\n};\n\n"
+        f"const GFXfont {name} PROGMEM = {{\n"
+        f"  (uint8_t  *){name}Bitmaps,\n"
+        f"  (GFXglyph *){name}Glyphs,\n"
+        f"  0x{first:02X}, 0x{last:02X}, {params['height']} }};\n\n"
+        f"// Approx. {size} bytes\n")
+
+
+class _BitWriter:
+    """LSB-first bit writer matching u8g2's glyph decoder."""
+
+    def __init__(self):
+        self.value = 0
+        self.length = 0
+
+    def put(self, value, bits):
+        """Append the low bits of an unsigned value."""
+        self.value |= (value & ((1 << bits) - 1)) << self.length
+        self.length += bits
+
+    def put_signed(self, value, bits):
+        """Append a signed value, stored offset by half the field range."""
+        self.put(value + (1 << (bits - 1)), bits)
+
+    def to_bytes(self):
+        """Written bits as a list of bytes, last byte zero padded."""
+        return list(self.value.to_bytes((self.length + 7) // 8, "little"))
+
+
+def _unsigned_bits(values):
+    return max(1, max(v.bit_length() for v in values))
+
+
+def _signed_bits(values):
+    return max(2, max((v if v >= 0 else ~v).bit_length() + 1 for v in values))
+
+
+def _pixel_runs(glyph):
+    """Maximal (zeros, ones) run pairs over the glyph pixels row by row."""
+    if glyph.bitmap is None:
+        return []
+    runs = []
+    zeros = 0
+    for lit, group in groupby(glyph.bitmap.convert("L").tobytes()):
+        length = len(list(group))
+        if lit:
+            runs.append((zeros, length))
+            zeros = 0
+        else:
+            zeros = length
+    if zeros:
+        runs.append((zeros, 0))
+    return runs
+
+
+def _rle_pairs(runs, max_0, max_1):
+    """Split maximal runs into pairs that fit the u8g2 run-length fields."""
+    pairs = []
+    for zeros, ones in runs:
+        while zeros > max_0:
+            pairs.append((max_0, 0))
+            zeros -= max_0
+        step = min(ones, max_1)
+        pairs.append((zeros, step))
+        ones -= step
+        while ones > 0:
+            step = min(ones, max_1)
+            pairs.append((0, step))
+            ones -= step
+    return pairs
+
+
+def _u8g2_glyph(glyph, runs, fmt):
+    """Encode one glyph's u8g2 bit stream, returns its bytes."""
+    writer = _BitWriter()
+    writer.put(glyph.width, fmt['w'])
+    writer.put(glyph.height, fmt['h'])
+    # u8g2 measures the box from its bottom-left corner, y upwards
+    writer.put_signed(glyph.x_offset, fmt['x'])
+    writer.put_signed(-(glyph.y_offset + glyph.height), fmt['y'])
+    writer.put_signed(glyph.advance, fmt['d'])
+    if glyph.width > 0:
+        previous = None
+        for pair in _rle_pairs(runs, (1 << fmt['r0']) - 1, (1 << fmt['r1']) - 1):
+            if pair == previous:
+                writer.put(1, 1)
+                continue
+            if previous is not None:
+                writer.put(0, 1)
+            writer.put(pair[0], fmt['r0'])
+            writer.put(pair[1], fmt['r1'])
+            previous = pair
+        writer.put(0, 1)
+    return writer.to_bytes()
+
+
+def _u8g2_metric(glyphs, code, attr):
+    for glyph in glyphs:
+        if glyph.code == code and glyph.bitmap is not None:
+            if attr == "ascent":
+                return -glyph.y_offset
+            return -(glyph.y_offset + glyph.height)
+    return 0
+
+
+def gfx_flash_size(glyphs):
+    """Bitmap bytes plus 7 byte GFXglyph entries and the GFXfont struct."""
+    full = _full_range(glyphs)
+    return sum(len(glyph_bitstream(g)) for g in full) + 7 * len(full) + 7
+
+
+def u8g2_font_data(glyphs): # pylint: disable=too-many-locals
+    """Encode glyphs up to code 255 as u8g2 font bytes, returns (glyphs, data)."""
+    glyphs = [g for g in glyphs if g.code <= 0xFF]
+    if not glyphs:
+        raise ValueError("u8g2 export needs at least one code point up to 255.")
+    fmt = {
+        'w': _unsigned_bits([g.width for g in glyphs]),
+        'h': _unsigned_bits([g.height for g in glyphs]),
+        'x': _signed_bits([g.x_offset for g in glyphs]),
+        'y': _signed_bits([-(g.y_offset + g.height) for g in glyphs]),
+        'd': _signed_bits([g.advance for g in glyphs]),
+    }
+    # Pick the run-length field widths giving the smallest font
+    runs = [_pixel_runs(g) for g in glyphs]
+    trials = [dict(fmt, r0=r0, r1=r1) for r0 in range(2, 10) for r1 in range(1, 8)]
+    encodings = [[_u8g2_glyph(g, r, trial) for g, r in zip(glyphs, runs)]
+                 for trial in trials]
+    best = min(range(len(trials)),
+               key=lambda i: sum(len(data) + 2 for data in encodings[i]))
+    fmt, encoded = trials[best], encodings[best]
+
+    body = []
+    start_upper = start_lower = None
+    for glyph, data in zip(glyphs, encoded):
+        if len(data) + 2 > 0xFF:
+            raise ValueError(f"Glyph 0x{glyph.code:02X} is too large for u8g2 (>255 bytes).")
+        if start_upper is None and glyph.code >= ord("A"):
+            start_upper = len(body)
+        if start_lower is None and glyph.code >= ord("a"):
+            start_lower = len(body)
+        body += [glyph.code, len(data) + 2] + data
+    end = len(body)
+    # Glyph list terminator, then an empty unicode lookup table
+    body += [0x00, 0x00, 0x00, 0x04, 0xFF, 0xFF, 0x00, 0x00]
+    inked = [g for g in glyphs if g.bitmap is not None] or glyphs
+    box_x = min(g.x_offset for g in inked)
+    box_y = min(-(g.y_offset + g.height) for g in inked)
+    box_w = max(g.x_offset + g.width for g in inked) - box_x
+    box_h = max(-g.y_offset for g in inked) - box_y
+    header = [
+        len(glyphs), 0, fmt['r0'], fmt['r1'], fmt['w'], fmt['h'], fmt['x'], fmt['y'],
+        fmt['d'], box_w & 0xFF, box_h & 0xFF, box_x & 0xFF, box_y & 0xFF,
+        _u8g2_metric(glyphs, ord("A"), "ascent") & 0xFF,
+        _u8g2_metric(glyphs, ord("g"), "descent") & 0xFF,
+        _u8g2_metric(glyphs, ord("("), "ascent") & 0xFF,
+        _u8g2_metric(glyphs, ord("("), "descent") & 0xFF,
+    ]
+    for pos in (start_upper, start_lower, end + 2):
+        pos = end if pos is None else pos
+        header += [pos >> 8, pos & 0xFF]
+    return glyphs, header + body
+
+
+def u8g2_flash_size(glyphs):
+    """Exact u8g2 font size, the same encoding the export writes."""
+    return len(u8g2_font_data(glyphs)[1])
+
+
+def export_u8g2(glyphs, params, baseline_y): # pylint: disable=unused-argument
+    """u8g2 proportional font (bbx mode 0), codes up to 255."""
+    glyphs, data = u8g2_font_data(glyphs)
+    name = f"u8g2_font_{params['font_name']}"
+    return (
+        _banner("u8g2", params) +
+        f"// Glyphs: {len(glyphs)}, size {len(data)} bytes\n\n"
+        f"const uint8_t {name}[{len(data)}] U8G2_FONT_SECTION(\"{name}\") = {{\n"
+        f"{_hex_lines(data)}\n}};\n")
+
+
+def _lvgl_cmap(glyphs):
+    first = glyphs[0].code
+    codes = [g.code for g in glyphs]
+    if codes == list(range(first, first + len(codes))):
+        return (f"        .range_start = {first}, .range_length = {len(codes)}, "
+                f".glyph_id_start = 1,\n"
+                f"        .unicode_list = NULL, .glyph_id_ofs_list = NULL, "
+                f".list_length = 0, .type = LV_FONT_FMT_TXT_CMAP_FORMAT0_TINY\n"), ""
+    offsets = ", ".join(f"0x{c - first:X}" for c in codes)
+    return (f"        .range_start = {first}, .range_length = {codes[-1] - first + 1}, "
+            f".glyph_id_start = 1,\n"
+            f"        .unicode_list = unicode_list_0, .glyph_id_ofs_list = NULL, "
+            f".list_length = {len(codes)}, .type = LV_FONT_FMT_TXT_CMAP_SPARSE_TINY\n"), (
+                f"static const uint16_t unicode_list_0[] = {{\n    {offsets}\n}};\n\n")
+
+
+def export_lvgl(glyphs, params, baseline_y): # pylint: disable=too-many-locals
+    """LVGL lv_font_fmt_txt font, 1 bpp, for LVGL 8 and 9."""
+    name = f"lv_font_{params['font_name']}"
+    guard = name.upper()
+    bitmap = []
+    bitmap_lines = []
+    dsc = ["    {.bitmap_index = 0, .adv_w = 0, .box_w = 0, .box_h = 0, "
+           ".ofs_x = 0, .ofs_y = 0} /* id = 0 reserved */"]
+    for glyph in glyphs:
+        data = glyph_bitstream(glyph)
+        char = _char_comment(glyph.code)
+        bitmap_lines.append(f"    /* U+{glyph.code:04X} \"{char}\" */")
+        if data:
+            bitmap_lines.append(_hex_lines(data, indent="    ") + ",")
+        bitmap_lines.append("")
+        dsc.append(
+            f"    {{.bitmap_index = {len(bitmap)}, .adv_w = {glyph.advance * 16}, "
+            f".box_w = {glyph.width}, .box_h = {glyph.height}, "
+            f".ofs_x = {glyph.x_offset}, .ofs_y = {-(glyph.y_offset + glyph.height)}}}")
+        bitmap.extend(data)
+    cmap, unicode_list = _lvgl_cmap(glyphs)
+    return (
+        "/" + "*" * 79 + "\n"
+        f" * Size: {params['height']} px\n"
+        " * Bpp: 1\n"
+        f" * Generated by Colossus_LTSM {__version__} from {params['font_name']}\n"
+        " " + "*" * 78 + "/\n\n"
+        "#ifdef LV_LVGL_H_INCLUDE_SIMPLE\n#include \"lvgl.h\"\n#else\n"
+        "#include \"lvgl/lvgl.h\"\n#endif\n\n"
+        f"#ifndef {guard}\n#define {guard} 1\n#endif\n\n#if {guard}\n\n"
+        "static LV_ATTRIBUTE_LARGE_CONST const uint8_t glyph_bitmap[] = {\n"
+        + "\n".join(bitmap_lines) + "};\n\n"
+        "static const lv_font_fmt_txt_glyph_dsc_t glyph_dsc[] = {\n"
+        + ",\n".join(dsc) + "\n};\n\n"
+        + unicode_list +
+        "static const lv_font_fmt_txt_cmap_t cmaps[] = {\n    {\n" + cmap + "    }\n};\n\n"
+        "#if LVGL_VERSION_MAJOR == 8\nstatic lv_font_fmt_txt_glyph_cache_t cache;\n#endif\n\n"
+        "static const lv_font_fmt_txt_dsc_t font_dsc = {\n"
+        "    .glyph_bitmap = glyph_bitmap,\n    .glyph_dsc = glyph_dsc,\n"
+        "    .cmaps = cmaps,\n    .kern_dsc = NULL,\n    .kern_scale = 0,\n"
+        "    .cmap_num = 1,\n    .bpp = 1,\n    .kern_classes = 0,\n"
+        "    .bitmap_format = 0,\n"
+        "#if LVGL_VERSION_MAJOR == 8\n    .cache = &cache\n#endif\n};\n\n"
+        f"const lv_font_t {name} = {{\n"
+        "    .get_glyph_dsc = lv_font_get_glyph_dsc_fmt_txt,\n"
+        "    .get_glyph_bitmap = lv_font_get_bitmap_fmt_txt,\n"
+        f"    .line_height = {params['height']},\n"
+        f"    .base_line = {params['height'] - baseline_y},\n"
+        "    .subpx = LV_FONT_SUBPX_NONE,\n"
+        "    .underline_position = -1,\n    .underline_thickness = 1,\n"
+        "    .dsc = &font_dsc,\n"
+        "#if LVGL_VERSION_MAJOR >= 9\n    .fallback = NULL,\n#endif\n"
+        "    .user_data = NULL,\n};\n\n"
+        f"#endif /*#if {guard}*/\n")
+
+
+def lvgl_flash_size(glyphs):
+    """Estimated LVGL size: bitmap, 8 byte glyph descriptors, the cmap with
+    its sparse list, and roughly 64 bytes of font and descriptor structs."""
+    codes = [g.code for g in glyphs]
+    sparse = codes != list(range(codes[0], codes[0] + len(codes)))
+    return (sum(len(glyph_bitstream(g)) for g in glyphs) + 8 * (len(glyphs) + 1)
+            + 20 + (2 * len(glyphs) if sparse else 0) + 64)
+
+
+register_exporter(Exporter("gfx", "_gfx.h", "Adafruit GFX GFXfont",
+                           export_gfx, gfx_flash_size))
+register_exporter(Exporter("u8g2", "_u8g2.h", "u8g2 proportional font",
+                           export_u8g2, u8g2_flash_size))
+register_exporter(Exporter("lvgl", "_lvgl.c", "LVGL lv_font_fmt_txt, 1 bpp",
+                           export_lvgl, lvgl_flash_size))
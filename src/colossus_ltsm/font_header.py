@@ -0,0 +1,143 @@
+"""
+Module reading the font array of a generated C/C++ header and patching it
+in place.
+
+The array is tokenized on the raw file bytes, so the file offset of every
+value is known. Changing glyph bytes then writes just those values back:
+a value keeps its width ("0x3C" -> "0x7E"), so each one is overwritten
+where it stands and the rest of the file, comments and all, is neither
+reformatted nor rewritten. Only when a value would change width, as for
+hand-written decimal arrays, is the text spliced and the file replaced.
+"""
+
+import os
+import re
+from pathlib import Path
+
+# Comments are blanked before searching, keeping every offset, so that a
+# "// '}'" glyph comment cannot end the array early
+_COMMENT = re.compile(rb"//[^\n]*|/\*.*?\*/", re.S)
+_ARRAY = re.compile(rb"\{([^}]*)\}")
+_VALUE = re.compile(rb"0[xX][0-9A-Fa-f]+|\d+")
+_LAYOUT = re.compile(rb"Data layout: (\w+)-addressed")
+
+
+def _value(token):
+    return int(token, 16) if token[1:2] in (b"x", b"X") else int(token)
+
+
+def _values(body):
+    """Values of an array body. Generated arrays hold only comma separated
+    hex values, converted in one pass; anything else is tokenized."""
+    tokens = body.replace(b",", b" ").split()
+    if body.count(b"x") + body.count(b"X") == len(tokens):
+        try:
+            return [int(token, 16) for token in tokens]
+        except ValueError:
+            pass
+    return [_value(token) for token in _VALUE.findall(body)]
+
+
+def _format_like(token, value):
+    """value written the way token is: same base, prefix, case and width."""
+    if token[1:2] not in (b"x", b"X"):
+        return str(value).encode("ascii")
+    digits = f"{value:0{len(token) - 2}X}"
+    if token[2:].lower() == token[2:] and not token[2:].isdigit():
+        digits = digits.lower()
+    return token[:2] + digits.encode("ascii")
+
+
+def _stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class HeaderFont: # pylint: disable=too-many-instance-attributes
+    """The font array of a header, with the file offset of each value.
+
+    font_bytes holds the control bytes and the glyph data, as the viewer
+    reads them. layout is the glyph layout named in the generator's
+    comment, None when the header does not say.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._load()
+
+    def _load(self):
+        data = self.path.read_bytes()
+        self._stamp = _stamp(self.path)
+        self._masked = bytearray(_COMMENT.sub(lambda match: b" " * len(match.group()), data))
+        match = _ARRAY.search(self._masked)
+        if not match:
+            raise ValueError("No font data found in file.")
+        self._body = match.span(1)
+        self._spans = None
+        self.font_bytes = _values(match.group(1))
+        layout = _LAYOUT.search(data)
+        self.layout = layout.group(1).decode("ascii") if layout else None
+        index = _ARRAY.search(self._masked, match.end())
+        self._index = _values(index.group(1)) if index else []
+
+    @property
+    def spans(self):
+        """File offsets (start, end) of every value, found on first use:
+        only saving needs them."""
+        if self._spans is None:
+            self._spans = [token.span() for token in _VALUE.finditer(self._masked, *self._body)]
+        return self._spans
+
+    def _token(self, position):
+        start, end = self.spans[position]
+        return bytes(self._masked[start:end])
+
+    def index(self):
+        """Code point index array following a subset font, empty when the
+        header has none."""
+        return list(self._index)
+
+    def glyph_range(self, index, size):
+        """Positions in font_bytes of glyph index, size bytes per glyph."""
+        start = 4 + index * size
+        return range(start, start + size)
+
+    def write(self, changes):
+        """Store changed values, a dict of position in font_bytes -> byte.
+
+        Values are overwritten in place when they keep their width, the
+        file is replaced otherwise. Raises ValueError when the file was
+        changed on disk since it was read. Returns the positions written.
+        """
+        changes = {pos: value for pos, value in changes.items()
+                   if self.font_bytes[pos] != value}
+        if not changes:
+            return []
+        if _stamp(self.path) != self._stamp:
+            raise ValueError(f"{self.path} was changed on disk, reopen it before saving.")
+        texts = {pos: _format_like(self._token(pos), value) for pos, value in changes.items()}
+        if all(len(text) == len(self._token(pos)) for pos, text in texts.items()):
+            with open(self.path, "r+b") as f:
+                for pos in sorted(texts):
+                    f.seek(self.spans[pos][0])
+                    f.write(texts[pos])
+            for pos, value in changes.items():
+                start, end = self.spans[pos]
+                self._masked[start:end] = texts[pos]
+                self.font_bytes[pos] = value
+            self._stamp = _stamp(self.path)
+        else:
+            self._replace(texts)
+        return sorted(changes)
+
+    def _replace(self, texts):
+        """Splice the new values into the file text and replace the file,
+        then re-read the offsets that moved."""
+        data = self.path.read_bytes()
+        for pos in sorted(texts, reverse=True):
+            start, end = self.spans[pos]
+            data = data[:start] + texts[pos] + data[end:]
+        temp = self.path.with_name(self.path.name + ".tmp")
+        temp.write_bytes(data)
+        os.replace(temp, self.path)
+        self._load()
@@ -0,0 +1,106 @@
+"""
+Module for converting one TTF at several cell sizes in a single run.
+
+The font file is read and its cmap coverage parsed once, then each size
+is rasterized in its own worker process from the in-memory font. The
+results are written as one header holding every array, or one file per
+size.
+"""
+
+import io
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from colossus_ltsm.font_coverage import font_coverage
+from colossus_ltsm.font_engine import FontEngine
+
+# Shared font data for the worker processes, set by _init_worker
+_SHARED = {}
+
+
+def parse_sizes(text):
+    """Parse "8x8,16x16,24" into [(8, 8), (16, 16), (24, 24)]."""
+    sizes = []
+    for item in text.replace(" ", "").split(","):
+        if not item:
+            continue
+        width, _, height = item.lower().partition("x")
+        try:
+            sizes.append((int(width), int(height or width)))
+        except ValueError:
+            raise ValueError(f"Bad cell size '{item}', use WxH such as 16x16.") from None
+    if not sizes:
+        raise ValueError("No cell sizes given.")
+    return sizes
+
+
+def size_params(params, width, height):
+    """Params for one rung of the ladder, names suffixed with the size."""
+    return dict(params, width=width, height=height,
+                font_name=f"{params['font_name']}_{width}x{height}",
+                output_name=f"{params['output_name']}_{width}x{height}",
+                formats=[])
+
+
+def ladder_path(save_path, width, height):
+    """File path for one size when writing a file per size."""
+    path = Path(save_path)
+    return path.with_name(f"{path.stem}_{width}x{height}{path.suffix}")
+
+
+class _LadderEngine(FontEngine):
+    """Engine for one size, reading the shared coverage and keeping its log."""
+
+    def __init__(self, coverage):
+        self.coverage = coverage
+        self.messages = []
+
+    def _log(self, message, level="info"):
+        self.messages.append((level, message))
+
+    def _font_coverage(self, font):
+        return self.coverage
+
+
+def _init_worker(font_data, coverage):
+    _SHARED['font_data'] = font_data
+    _SHARED['coverage'] = coverage
+
+
+def _convert_size(params):
+    engine = _LadderEngine(_SHARED['coverage'])
+    output = engine.convert_font(io.BytesIO(_SHARED['font_data']), params)
+    engine.report_instruments()
+    return params, output, engine.messages, engine.instruments.as_dict()
+
+
+def convert_ladder(ttf_path, params, sizes, jobs=None, instruments=None):
+    """Convert ttf_path at every (width, height) in sizes, in parallel when
+    jobs is not 1. Returns [(params, output, log messages)] in size order.
+    The timings and counters of every size are added to instruments if given."""
+    rungs = [size_params(params, width, height) for width, height in sizes]
+    for rung in rungs:
+        FontEngine().check_dimensions(rung)
+    font_data = Path(ttf_path).read_bytes()
+    coverage = font_coverage(ttf_path)
+    if jobs == 1 or len(rungs) == 1:
+        _init_worker(font_data, coverage)
+        results = [_convert_size(rung) for rung in rungs]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(font_data, coverage)) as pool:
+            results = list(pool.map(_convert_size, rungs))
+    for *_, stats in results:
+        if instruments is not None:
+            instruments.merge(stats)
+    return [(rung, output, messages) for rung, output, messages, _ in results]
+
+
+def compose_family(results):
+    """Join the per-size arrays into one header."""
+    if any(isinstance(output, bytes) for _, output, _ in results):
+        raise ValueError("Binary .bin fonts are written one file per size.")
+    names = ", ".join(rung['font_name'] for rung, _, _ in results)
+    banner = (f"// Font family generated by Colossus_LTSM\n"
+              f"// Arrays: {names}\n\n")
+    return banner + "\n".join(output for _, output, _ in results)
@@ -0,0 +1,127 @@
+"""
+Module for incremental builds: manifests and Make/Ninja dependency files.
+
+A manifest is a JSON file written next to the outputs of a conversion. It
+records the tool version, a SHA-256 of every input file (the font and any
+corpus files), the parameters that shape the output and a SHA-256 of every
+output. A conversion whose manifest still matches is skipped.
+
+A dependency file lists the outputs as targets of the input files in Make
+syntax, which Ninja reads too (depfile = $out.d, deps = gcc), so the build
+tool itself can skip the conversion when no input changed.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from colossus_ltsm import __version__
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Params that only change what is logged or how fast it runs, not the output
+_VOLATILE_PARAMS = ("jobs", "draw_sample", "draw_target")
+
+
+def manifest_path(output):
+    """Default manifest path for an output: font.hpp -> font.hpp.manifest.json."""
+    output = Path(output)
+    return output.with_name(output.name + MANIFEST_SUFFIX)
+
+
+def file_digest(path):
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stable_params(params):
+    stable = {key: value for key, value in params.items() if key not in _VOLATILE_PARAMS}
+    if stable.get('codepoints') is not None:
+        # The corpus files are hashed as inputs, a digest keeps this short
+        codes = ",".join(map(str, stable['codepoints'])).encode("ascii")
+        stable['codepoints'] = hashlib.sha256(codes).hexdigest()
+    return stable
+
+
+def build_manifest(inputs, params, outputs=()):
+    """Manifest dict for a conversion of inputs with params. Outputs are
+    hashed when given, that is after they have been written."""
+    return {
+        'tool': "colossus-ltsm",
+        'version': __version__,
+        'inputs': {str(path): file_digest(path) for path in inputs},
+        'params': _stable_params(params),
+        'outputs': {str(path): file_digest(path) for path in outputs},
+    }
+
+
+def conversion_key(font_digest, params):
+    """SHA-256 naming the output of this tool version converting the font
+    with SHA-256 font_digest using params, wherever the font is stored."""
+    text = json.dumps({'version': __version__, 'font': font_digest,
+                       'params': _stable_params(params)}, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def read_manifest(path):
+    """Stored manifest dict, None when missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+def write_manifest(path, manifest):
+    """Write a manifest as indented JSON."""
+    Path(path).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+                          encoding="utf-8")
+
+
+def is_up_to_date(path, inputs, params, outputs):
+    """True when the manifest at path was written by this tool version for
+    the same inputs and params, and every output is still as it wrote it."""
+    stored = read_manifest(path)
+    if stored is None:
+        return False
+    current = build_manifest(inputs, params)
+    for key in ("tool", "version", "inputs", "params"):
+        # Round-trip through JSON so tuples and lists compare equal
+        if json.loads(json.dumps(current[key])) != stored.get(key):
+            return False
+    recorded = stored.get('outputs') or {}
+    if sorted(recorded) != sorted(str(path) for path in outputs):
+        return False
+    try:
+        return all(file_digest(output) == digest for output, digest in recorded.items())
+    except OSError:
+        return False
+
+
+def _make_escape(path):
+    """Escape a path for a Make rule, also understood by Ninja."""
+    return str(path).replace("$", "$$").replace("#", "\\#").replace(" ", "\\ ")
+
+
+def depfile_text(targets, dependencies):
+    """Make rule naming targets as built from dependencies."""
+    deps = " \\\n  ".join(_make_escape(dep) for dep in dependencies)
+    return f"{' '.join(_make_escape(target) for target in targets)}: \\\n  {deps}\n"
+
+
+def write_depfile(path, targets, dependencies):
+    """Write a .d file, left untouched when the content is unchanged so
+    its timestamp does not trigger a rebuild by itself."""
+    text = depfile_text(targets, dependencies)
+    path = Path(path)
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    path.write_text(text, encoding="utf-8")
@@ -0,0 +1,110 @@
+"""
+Module rendering the converter's live preview, without Tk.
+
+The preview packs a sample of glyphs in the chosen data layout and decodes
+the bytes again with the layout's unpacker, so it shows exactly what the
+device receives, rotation and mirroring included. The opened face and the
+grayscale cells are kept between renders: threshold, layout, rotation and
+mirror changes only re-pack, and a cell size change opens no file. Only
+the sampled code points are rasterized, the baseline still comes from the
+ink bounds of the whole range, so the preview matches the converted font.
+The cells of the last conversion by the engine passed in, such as the
+converter page, are read but never replaced: previews render on a worker
+thread while conversions own that cache.
+"""
+
+import os
+from PIL import Image, ImageOps
+from colossus_ltsm.font_engine import FontEngine, GlyphCache
+from colossus_ltsm.framebuffer import png_data
+from colossus_ltsm.packers import get_packer
+
+PREVIEW_GLYPHS = 64
+PREVIEW_COLUMNS = 16
+# Widest preview in screen pixels, the sheet is scaled up by whole pixels to fit
+PREVIEW_WIDTH = 640
+
+
+class PreviewRenderer(FontEngine):
+    """Render the first glyphs of the current settings as a 1-bit sheet.
+    Cells converted by engine are reused when they match, the sampled
+    cells are cached by the renderer itself."""
+
+    def __init__(self, engine=None):
+        self._face_key = None
+        self._face = None
+        self._engine = engine
+
+    def _log(self, message, level="info"):
+        """Previews run on every change, keep conversion messages quiet."""
+
+    def face(self, ttf_path, params):
+        """The font opened for params, reused while the file, point size
+        and, when auto-fitting, the cell and code points are unchanged."""
+        key = (ttf_path, os.stat(ttf_path).st_mtime_ns, params.get('font_size'),
+               params['height'], bool(params.get('auto_fit', False)))
+        if params.get('auto_fit', False):
+            key += (params['width'], params['start'], params['end'], self._subset_key(params))
+        if key != self._face_key:
+            self._face = self.open_font(ttf_path, params)
+            self._face_key = key
+        return self._face
+
+    def render(self, ttf_path, params, count=PREVIEW_GLYPHS, columns=PREVIEW_COLUMNS):
+        """Sheet of the first count glyphs as the device will draw them,
+        one pixel of grid between cells. Raises ValueError when the cell
+        size does not suit the layout."""
+        self.check_dimensions(params)
+        self.instruments.reset()
+        with self.instruments.phase("load"):
+            font = self.face(ttf_path, params)
+        sample = self._sample_glyphs(font, params, count)
+        if not sample.glyphs:
+            raise ValueError("No code points to preview.")
+        blocks = self._pack_cached_glyphs(sample, params)
+        with self.instruments.phase("decode"):
+            return self._compose_sheet(blocks, params, min(columns, len(blocks)))
+
+    def _sample_glyphs(self, font, params, count):
+        """Cells of the first count code points: the engine's converted
+        cells when their key matches, else the sample rasterized here."""
+        key = self._cache_key(font, params)
+        # One read of the reference, the engine may replace it meanwhile
+        converted = getattr(self._engine, "_glyph_cache", None)
+        if converted is not None and converted.key == key:
+            self.instruments.count("cache_hits")
+            return GlyphCache(key, converted.baseline_y, converted.glyphs[:count], [], [])
+        key += (count,)
+        if self._glyph_cache is None or self._glyph_cache.key != key:
+            self.instruments.count("cache_misses")
+            # The baseline from the whole range's bounding boxes, cells for the sample
+            codes, baseline_y, missing = self._scan_codes(font, params)
+            with self.instruments.phase("rasterize"):
+                glyphs, _, _ = self._render_cells(font, params, codes[:count],
+                                                  baseline_y, missing)
+            self._glyph_cache = GlyphCache(key, baseline_y, glyphs, [], [])
+        else:
+            self.instruments.count("cache_hits")
+        return self._glyph_cache
+
+    def _compose_sheet(self, blocks, params, columns):
+        """Decode packed glyphs with the layout's unpacker into a grid."""
+        width, height = self._glyph_dims(params)
+        unpack = get_packer(params['addr_mode']).unpack
+        rows = -(-len(blocks) // columns)
+        sheet = Image.new("1", (columns * (width + 1) + 1, rows * (height + 1) + 1), 0)
+        for i, (_, data) in enumerate(blocks):
+            row, column = divmod(i, columns)
+            sheet.paste(unpack(data, width, height),
+                        (1 + column * (width + 1), 1 + row * (height + 1)))
+        return sheet
+
+
+def preview_png(sheet, glyph_color="#0078FF", background_color="#000000",
+                max_width=PREVIEW_WIDTH):
+    """Colour the sheet, scale it up by whole pixels to fit max_width and
+    return it as base64 PNG data for tk.PhotoImage(data=...)."""
+    scale = max(1, max_width // sheet.width)
+    image = ImageOps.colorize(sheet.convert("L"), black=background_color, white=glyph_color)
+    return png_data(image.resize((sheet.width * scale, sheet.height * scale),
+                                 Image.Resampling.NEAREST))
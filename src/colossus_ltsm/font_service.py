@@ -0,0 +1,290 @@
+"""
+Module with a local conversion service for build machines.
+
+Build jobs POST a conversion request, a font path or the font itself plus
+the converter parameters, as JSON over HTTP on 127.0.0.1 or a Unix socket:
+
+    POST /convert   {"ttf": "fonts/ui.ttf", "params": {"width": 16, ...}}
+                    {"ttf_base64": "...", "params": {...}}
+    GET  /stats     request, conversion, cache hit and in-flight counts
+    GET  /health    {"status": "ok", "version": ...}
+
+Conversions run on a bounded process pool. Requests are keyed by the font's
+SHA-256, the output-shaping params and the draw-cost sample whose table is
+in the log: a repeat is answered from an LRU result cache and an identical
+request still in flight waits for the first one instead of converting
+twice. Fonts are hashed on a worker thread, never on the event loop.
+Nothing listens on other interfaces.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from colossus_ltsm import __version__
+from colossus_ltsm.font_engine import DEFAULT_PARAMS, FontEngine, make_params
+from colossus_ltsm.font_manifest import conversion_key, file_digest
+
+LOCALHOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 256
+MAX_BODY_BYTES = 32 << 20
+REQUEST_TIMEOUT = 30.0
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(ValueError):
+    """A request the service rejects, with the HTTP status to answer."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class _CollectingEngine(FontEngine):
+    """Engine keeping its log messages for the response."""
+
+    def __init__(self):
+        self.messages = []
+
+    def _log(self, message, level="info"):
+        self.messages.append([level, message])
+
+
+def convert_job(ttf_path, params):
+    """Convert in a worker process, returns the JSON response body. Header
+    output is returned as 'output', .bin output base64 encoded as
+    'output_base64', other formats as {name: text} in 'exports'."""
+    engine = _CollectingEngine()
+    output = engine.convert_font(ttf_path, params)
+    result = {
+        'ext': params['ext'],
+        'exports': engine.export_formats(params['formats'], params),
+        'log': engine.messages,
+        'stats': engine.instruments.as_dict(),
+    }
+    if isinstance(output, bytes):
+        result['output_base64'] = base64.b64encode(output).decode("ascii")
+    else:
+        result['output'] = output
+    return json.dumps(result).encode("utf-8")
+
+
+def request_params(overrides):
+    """Full conversion params from a request's 'params' object, raises
+    RequestError for unknown names or a cell size the layout cannot hold."""
+    if not isinstance(overrides, dict):
+        raise RequestError("'params' must be a JSON object.")
+    unknown = sorted(set(overrides) - set(DEFAULT_PARAMS))
+    if unknown:
+        raise RequestError(f"Unknown params: {', '.join(unknown)}")
+    # Workers of the pool are the parallelism, no nested pools
+    params = make_params(**dict(overrides, jobs=1))
+    try:
+        FontEngine().check_dimensions(params)
+    except (KeyError, TypeError, ValueError) as err:
+        raise RequestError(str(err)) from None
+    return params
+
+
+class ConversionService: # pylint: disable=too-many-instance-attributes
+    """Conversion requests over HTTP, de-duplicated and cached."""
+
+    def __init__(self, jobs=None, cache_size=DEFAULT_CACHE_SIZE, spool_dir=None):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.in_flight = {}
+        self.stats = dict.fromkeys(("requests", "converted", "cache_hits", "shared",
+                                    "errors"), 0)
+        self._own_spool = spool_dir is None
+        self.spool_dir = Path(spool_dir or tempfile.mkdtemp(prefix="colossus_service_"))
+        self._digests = OrderedDict()
+        self._pool = None
+
+    def close(self):
+        """Stop the worker processes and remove uploaded fonts."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+        if self._own_spool:
+            shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    async def _font_digest(self, path):
+        """SHA-256 of a font file, hashed on a worker thread and hashed
+        again only when it changed. Requests for a file being hashed share
+        that hash. The last cache_size files are kept."""
+        stat = os.stat(path)
+        stamp = (str(Path(path).resolve()), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            digest = asyncio.get_running_loop().run_in_executor(None, file_digest, path)
+            self._digests[stamp] = digest
+            while len(self._digests) > self.cache_size:
+                self._digests.popitem(last=False)
+        else:
+            self._digests.move_to_end(stamp)
+        try:
+            return await digest
+        except OSError:
+            self._digests.pop(stamp, None)
+            raise
+
+    def _store_upload(self, text):
+        """Decode an uploaded font and store it once under its digest in
+        the spool directory, returns (path, digest). Runs on a worker thread."""
+        try:
+            data = base64.b64decode(text, validate=True)
+        except (binascii.Error, TypeError, ValueError):
+            raise RequestError("'ttf_base64' is not valid base64.") from None
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.spool_dir / f"{digest}.ttf"
+        if not path.is_file():
+            temp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            temp.write_bytes(data)
+            os.replace(temp, path)
+        return path, digest
+
+    async def _font_source(self, request):
+        """(path, SHA-256) of the request's font, uploaded or named."""
+        if "ttf_base64" in request:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self._store_upload, request["ttf_base64"])
+        if not isinstance(request.get("ttf"), str):
+            raise RequestError("Give the font as 'ttf' (a path) or 'ttf_base64'.")
+        path = Path(request["ttf"])
+        if not path.is_file():
+            raise RequestError(f"Font file not found: {path}")
+        return path, await self._font_digest(path)
+
+    async def convert(self, request):
+        """Answer a conversion request, returns (JSON body, source) where
+        source is 'cache', 'shared' (joined an identical request in flight)
+        or 'converted'."""
+        if not isinstance(request, dict):
+            raise RequestError("The request must be a JSON object.")
+        params = request_params(request.get("params", {}))
+        path, digest = await self._font_source(request)
+        # The draw-cost table is part of the logged reply, unlike a manifest
+        key = (conversion_key(digest, params), params['draw_sample'], params['draw_target'])
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return self.cache[key], "cache"
+        if key in self.in_flight:
+            self.stats["shared"] += 1
+            return await asyncio.shield(self.in_flight[key]), "shared"
+        task = asyncio.ensure_future(self._run(key, str(path), params))
+        self.in_flight[key] = task
+        return await asyncio.shield(task), "converted"
+
+    async def _run(self, key, path, params):
+        """Convert on the pool and cache the result, shielded from
+        cancellation so waiting requests still get it."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.jobs)
+        try:
+            body = await asyncio.get_running_loop().run_in_executor(
+                self._pool, convert_job, path, params)
+        except BrokenProcessPool:
+            # A worker died, start a fresh pool for the next request
+            self._pool = None
+            raise
+        finally:
+            del self.in_flight[key]
+        self.stats["converted"] += 1
+        self.cache[key] = body
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return body
+
+    def status(self):
+        """Counters for GET /stats."""
+        return dict(self.stats, in_flight=len(self.in_flight), cached=len(self.cache),
+                    jobs=self.jobs)
+
+    async def _route(self, method, target, body):
+        """(status, JSON body, source) for one request."""
+        if target == "/health" and method == "GET":
+            return 200, json.dumps({'status': "ok", 'version': __version__}).encode(), None
+        if target == "/stats" and method == "GET":
+            return 200, json.dumps(self.status()).encode(), None
+        if target != "/convert":
+            raise RequestError(f"No such endpoint: {target}", 404)
+        if method != "POST":
+            raise RequestError("Use POST for /convert.", 405)
+        try:
+            request = json.loads(body)
+        except ValueError:
+            raise RequestError("The request body is not valid JSON.") from None
+        result, source = await self.convert(request)
+        return 200, result, source
+
+    async def _read_request(self, reader):
+        """(method, target, body) of an HTTP/1.1 request."""
+        method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise RequestError(f"Request body over {MAX_BODY_BYTES} bytes.", 413)
+        return method, target.split("?")[0], await reader.readexactly(length)
+
+    async def handle(self, reader, writer):
+        """Serve one connection, one request per connection."""
+        source = None
+        try:
+            method, target, body = await asyncio.wait_for(self._read_request(reader),
+                                                          REQUEST_TIMEOUT)
+            if target == "/convert":
+                self.stats["requests"] += 1
+            status, payload, source = await self._route(method, target, body)
+        except asyncio.TimeoutError:
+            status, payload = 408, json.dumps({'error': "Request timed out."}).encode()
+        except RequestError as err:
+            status, payload = err.status, json.dumps({'error': str(err)}).encode()
+        except (OSError, ValueError, asyncio.IncompleteReadError) as err:
+            status, payload = 400, json.dumps({'error': str(err)}).encode()
+        except Exception as err: # pylint: disable=broad-exception-caught
+            status, payload = 500, json.dumps({'error': repr(err)}).encode()
+        if status != 200:
+            self.stats["errors"] += 1
+        head = [f"HTTP/1.1 {status} {_REASONS[status]}", "Content-Type: application/json",
+                f"Content-Length: {len(payload)}", "Connection: close"]
+        if source is not None:
+            head.append(f"X-Colossus-Source: {source}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def start(self, port=DEFAULT_PORT, unix_path=None):
+        """Listen on 127.0.0.1:port, or on the Unix socket unix_path."""
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle, path=str(unix_path))
+        return await asyncio.start_server(self.handle, LOCALHOST, port)
+
+    async def serve(self, port=DEFAULT_PORT, unix_path=None):
+        """Serve until cancelled."""
+        server = await self.start(port, unix_path)
+        async with server:
+            await server.serve_forever()
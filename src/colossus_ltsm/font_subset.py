@@ -0,0 +1,138 @@
+"""
+Module for finding the code points a firmware actually displays.
+
+Source files and string tables are scanned for text: string and character
+literals in C/C++ sources, every string in JSON files, msgid/msgstr entries
+in gettext PO files, and the whole content of any other text file. Files
+named directly are always read; directories are searched for source and
+text suffixes only, so object files, images and build output are skipped.
+The resulting code point set is passed to the converter as
+params['codepoints'].
+"""
+
+import json
+import re
+import threading
+from pathlib import Path
+
+C_SUFFIXES = {".c", ".h", ".cc", ".cpp", ".hpp", ".cxx", ".hxx", ".ino"}
+PO_SUFFIXES = {".po", ".pot"}
+# Plain text files, read whole, that a directory search picks up
+TEXT_SUFFIXES = {".txt", ".md", ".csv", ".tsv", ".xml", ".html", ".yaml", ".yml",
+                 ".ini", ".properties", ".strings"}
+CORPUS_SUFFIXES = C_SUFFIXES | PO_SUFFIXES | TEXT_SUFFIXES | {".json"}
+
+# Comments, or "..." / '...' literals with escapes and an optional u8/u/U/L
+# prefix, matched together so quotes in comments and // in strings are safe
+_C_TOKEN = re.compile(r'//[^\n]*|/\*.*?\*/|(?:u8|[uUL])?(["\'])((?:\\.|(?!\1)[^\\\n])*)\1', re.S)
+_C_INCLUDE = re.compile(r'^\s*#\s*include[^\n]*', re.M)
+_PO_STRING = re.compile(r'^\s*(?:msgid|msgstr(?:\[\d+\])?|msgid_plural)?\s*"((?:\\.|[^"\\])*)"',
+                        re.M)
+
+
+def _unescape(text):
+    """Decode C style escapes, falling back to the raw text."""
+    try:
+        # Non-Latin-1 characters become \uXXXX first so they survive the codec
+        return text.encode("latin-1", "backslashreplace").decode("unicode_escape")
+    except UnicodeDecodeError:
+        return text
+
+
+def _c_strings(text):
+    text = _C_INCLUDE.sub("", text)
+    return [_unescape(match.group(2)) for match in _C_TOKEN.finditer(text) if match.group(1)]
+
+
+def _json_strings(value):
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for item in value.values() for s in _json_strings(item)]
+    if isinstance(value, list):
+        return [s for item in value for s in _json_strings(item)]
+    return []
+
+
+def _po_strings(text):
+    # Skip the header entry, msgid "" with the metadata msgstr
+    strings = []
+    for entry in re.split(r'\n\s*\n', text):
+        if re.search(r'^\s*msgid\s+""\s*$', entry, re.M) and "Content-Type" in entry:
+            continue
+        strings.extend(_unescape(s) for s in _PO_STRING.findall(entry))
+    return strings
+
+
+def corpus_strings(path):
+    """Return the displayable strings found in one corpus file."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8", errors="replace")
+    suffix = path.suffix.lower()
+    if suffix in C_SUFFIXES:
+        return _c_strings(text)
+    if suffix == ".json":
+        try:
+            return _json_strings(json.loads(text))
+        except json.JSONDecodeError as err:
+            raise ValueError(f"Invalid JSON in {path}: {err}") from None
+    if suffix in PO_SUFFIXES:
+        return _po_strings(text)
+    return [text]
+
+
+def corpus_files(paths):
+    """Expand corpus paths to the files they name, directories recursively
+    keeping the files with a CORPUS_SUFFIXES suffix."""
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files += sorted(p for p in path.rglob("*")
+                            if p.suffix.lower() in CORPUS_SUFFIXES and p.is_file())
+        else:
+            files.append(path)
+    return files
+
+
+def _file_codes(path):
+    return {ord(char) for string in corpus_strings(path) for char in string}
+
+
+def _displayable(codes):
+    return sorted(code for code in codes if code >= 0x20 and code != 0x7F)
+
+
+def scan_corpus(paths):
+    """Return the sorted code points used by all corpus files, control
+    characters excluded. Directories are searched recursively."""
+    codes = set()
+    for file in corpus_files(paths):
+        codes |= _file_codes(file)
+    return _displayable(codes)
+
+
+class CorpusScanner: # pylint: disable=too-few-public-methods
+    """scan_corpus that keeps the code points of each file, so a repeat
+    scan only stats the files and re-reads those whose modification time
+    or size changed. Scans may run on several threads, one at a time."""
+
+    def __init__(self):
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def scan(self, paths):
+        """Sorted code points of the corpus, as scan_corpus returns them."""
+        codes = set()
+        files = {}
+        with self._lock:
+            for file in corpus_files(paths):
+                stat = file.stat()
+                stamp = (stat.st_mtime_ns, stat.st_size)
+                entry = self._files.get(file)
+                if entry is None or entry[0] != stamp:
+                    entry = (stamp, frozenset(_file_codes(file)))
+                files[file] = entry
+                codes |= entry[1]
+            self._files = files
+        return _displayable(codes)
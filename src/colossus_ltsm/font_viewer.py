@@ -6,21 +6,20 @@ allowing users to see the glyphs and their addressing modes.
 import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import re
 import math
+import time
 from dataclasses import dataclass
 from PIL import Image
 from colossus_ltsm.settings import settings
+from colossus_ltsm.font_binary import MappedFont
+from colossus_ltsm.font_diff import diff_fonts, load_glyphs, render_diff
+from colossus_ltsm.font_header import HeaderFont
+from colossus_ltsm.glyph_editor import GlyphEditor
+from colossus_ltsm.packers import get_packer, layout_names
+from colossus_ltsm.framebuffer import DISPLAYS, FramebufferEmulator, GlyphAtlas, png_data
 
-@dataclass
-class GlyphRenderContext:
-    """ Context for rendering a single glyph, used in PNG export."""
-    pixels: any
-    x_size: int
-    y_size: int
-    x_offset: int
-    y_offset: int
-    color: tuple
+# Widest emulated screen in screen pixels, the settings scale is capped to fit
+EMULATOR_WIDTH = 640
 
 @dataclass
 class FontMeta:
@@ -44,10 +43,10 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
         addr_frame = tk.Frame(self)
         addr_frame.grid(row=0, column=0, columnspan=3, pady=5)
         tk.Label(addr_frame, text="Addressing:").pack(side="left", padx=5)
-        tk.Radiobutton(addr_frame, text="Horizontal", variable=self.addr_mode_var,
-                       value="horizontal").pack(side="left", padx=5)
-        tk.Radiobutton(addr_frame, text="Vertical", variable=self.addr_mode_var,
-                       value="vertical").pack(side="left", padx=5)
+        layouts = layout_names()
+        tk.OptionMenu(addr_frame, self.addr_mode_var, layouts[0],
+                      *layouts[1:]).pack(side="left", padx=5)
+        self.addr_mode_var.trace_add("write", self._on_layout_change)
         # Load from settings
         self.scale = settings.getint("Display", "scale", 4)
         self.cols = settings.getint("Display", "cols", 16)
@@ -68,6 +67,14 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
             state="disabled"
         )
         self.export_btn.pack(side="left", padx=5)
+        self.compare_btn = tk.Button(
+            btn_frame,
+            text="Compare With...",
+            command=self.compare_file,
+            state="disabled"
+        )
+        self.compare_btn.pack(side="left", padx=5)
+        self._create_edit_buttons(btn_frame)
         # Show current settings for scale and columns
         self.info_label = tk.Label(
             self, text=f"Scale: {self.scale}, Cols: {self.cols}")
@@ -94,13 +101,63 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
         # Expand the whole widget in parent
         self.grid_rowconfigure(3, weight=1)
         self.grid_columnconfigure(0, weight=1)
-        # Current font data.
+        # Current font data, and the memory map backing it for .bin files.
         self.current_font_bytes = None
+        self._font_map = None
+        self._header = None
+        self._editor = None
+        self._font_path = None
+        # Layout the shown glyphs, atlas and editor were decoded with
+        self._layout = None
+        self.canvas.bind("<Button-1>", self._on_canvas_click)
+        self.canvas.bind("<Control-z>", lambda _event: self.undo_edit())
+        self.canvas.bind("<Control-y>", lambda _event: self.redo_edit())
+        self._create_emulator()
+
+    def _create_edit_buttons(self, frame):
+        """Pixel editing of header fonts: click a pixel to toggle it."""
+        self.edit_var = tk.BooleanVar(value=False)
+        self.edit_check = tk.Checkbutton(frame, text="Edit Pixels", variable=self.edit_var,
+                                         state="disabled")
+        self.edit_check.pack(side="left", padx=5)
+        self.undo_btn = tk.Button(frame, text="Undo", command=self.undo_edit, state="disabled")
+        self.undo_btn.pack(side="left", padx=5)
+        self.redo_btn = tk.Button(frame, text="Redo", command=self.redo_edit, state="disabled")
+        self.redo_btn.pack(side="left", padx=5)
+        self.save_btn = tk.Button(frame, text="Save Edits", command=self.save_edits,
+                                  state="disabled")
+        self.save_btn.pack(side="left", padx=5)
+
+    def _create_emulator(self):
+        """Display emulator: sample text drawn with the loaded glyph bytes
+        into the framebuffer of a simulated panel."""
+        frame = tk.LabelFrame(self, text="Display Emulator")
+        frame.grid(row=4, column=0, columnspan=3, sticky="ew", padx=5, pady=5)
+        names = list(DISPLAYS)
+        self.display_var = tk.StringVar(value=names[0])
+        tk.OptionMenu(frame, self.display_var, names[0], *names[1:]).grid(
+            row=0, column=0, sticky="w", padx=5)
+        self.sample_text = tk.Text(frame, height=4, width=40)
+        self.sample_text.insert("1.0", "Hello, world!\n0123456789")
+        self.sample_text.grid(row=1, column=0, sticky="nw", padx=5)
+        self.emulator_status = tk.Label(frame, anchor="w", justify="left")
+        self.emulator_status.grid(row=2, column=0, sticky="w", padx=5)
+        self.emulator_label = tk.Label(frame, bg=self.background_color)
+        self.emulator_label.grid(row=0, column=1, rowspan=3, padx=5, pady=5)
+        self.sample_text.bind("<KeyRelease>", self._draw_emulator)
+        self.display_var.trace_add("write", self._draw_emulator)
+        self._atlas = None
+        self._emulator = None
+        self._emulator_photo = None
 
     def open_file(self):
         """ Open a C/C++ header file, parse font data, and render it on the canvas."""
         self.export_btn.config(state="disabled")
+        self.compare_btn.config(state="disabled")
         self.current_font_bytes = None
+        self._close_font_map()
+        self._header = None
+        self._editor = None
         file_path = self._select_file()
         if not file_path:
             print("[fview] No file selected, open cancelled.")
@@ -108,6 +165,8 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
         try:
             font_bytes = self._parse_font_file(file_path)
             self._validate_and_render(font_bytes)
+            self._font_path = file_path
+            self.compare_btn.config(state="normal")
         except Exception as e:  # pylint: disable=broad-exception-caught
             messagebox.showerror("Error: open_file", str(e))
             print(f"[fview] Error opening file: {e}")
@@ -123,22 +182,33 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
         return filedialog.askopenfilename(
             title="Open File",
             initialdir=output_dir,
-            filetypes=[("C++ Header", "*.hpp"), ("C++ Header", "*.h")],
+            filetypes=[("C++ Header", "*.hpp"), ("C++ Header", "*.h"),
+                       ("Binary font", "*.bin")],
         )
 
     def _parse_font_file(self, file_path):
         """ Parse the selected header file to extract font byte data."""
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = f.read()
-        data = re.sub(r"//.*", "", data)
-        data = re.sub(r"/\*.*?\*/", "", data, flags=re.S)
-        match = re.search(r"\{([^}]*)\}", data, re.S)
-        if not match:
-            raise ValueError("No font data found in file.")
-        raw_data = match.group(1)
-        raw_data = raw_data.replace("\n", " ").replace("\r", " ").strip()
-        raw_bytes = raw_data.split(",")
-        return [int(b.strip(), 16) for b in raw_bytes if b.strip()]
+        if file_path.lower().endswith(".bin"):
+            return self._map_font_file(file_path)
+        # The header keeps the file offset of every byte for saving edits
+        self._header = HeaderFont(file_path)
+        if self._header.layout in layout_names():
+            self.addr_mode_var.set(self._header.layout)
+        return list(self._header.font_bytes)
+
+    def _map_font_file(self, file_path):
+        """ Memory-map a .bin font, returning a zero-copy view of its bytes.
+        The addressing mode is taken from the file header."""
+        self._close_font_map()
+        self._font_map = MappedFont(file_path)
+        if self._font_map.header.layout in layout_names():
+            self.addr_mode_var.set(self._font_map.header.layout)
+        return self._font_map.font_bytes
+
+    def _close_font_map(self):
+        if getattr(self, "_font_map", None) is not None:
+            self._font_map.close()
+            self._font_map = None
 
     def _validate_and_render(self, font_bytes):
         if len(font_bytes) < 4:
@@ -147,25 +217,74 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
             return
         x_size = font_bytes[0]
         y_size = font_bytes[1]
-        first_char = font_bytes[2]
-        last_char = first_char + font_bytes[3]
-        num_chars = last_char - first_char + 1
-        if self.addr_mode_var.get() == "horizontal":
-            bytes_per_char = math.ceil(x_size / 8) * y_size
-        else:
-            bytes_per_char = math.ceil(y_size / 8) * x_size
-        expected = 4 + num_chars * bytes_per_char
+        codes = self._glyph_codes() or list(range(font_bytes[2],
+                                                  font_bytes[2] + font_bytes[3] + 1))
+        bytes_per_char = self._calc_bytes_per_char(x_size, y_size)
+        expected = 4 + len(codes) * bytes_per_char
         if len(font_bytes) != expected:
             messagebox.showwarning(
                 "Warning",
                 f"Byte count mismatch.\nExpected {expected}, got {len(font_bytes)}",
             )
         self.current_font_bytes = font_bytes
-        self.render_font(font_bytes)
+        self._layout = self.addr_mode_var.get()
+        self.render_font(font_bytes, codes)
         self.export_btn.config(state="normal")
+        # Decode every glyph once for the emulator
+        self._atlas = GlyphAtlas(font_bytes, self.addr_mode_var.get(), codes)
+        self._emulator = None
+        self._draw_emulator()
+        if self._header is not None:
+            self._editor = GlyphEditor(self._header, self.addr_mode_var.get())
+        self._update_edit_buttons()
+
+    def _on_layout_change(self, *_args):
+        """Decode the open font again with the selected addressing mode.
+        Unsaved pixel edits are packed in the old one, so the change is
+        refused until they are saved or undone."""
+        layout = self.addr_mode_var.get()
+        if self.current_font_bytes is None or layout == self._layout:
+            return
+        if self._editor is not None and self._editor.dirty():
+            messagebox.showwarning(
+                "Warning", "Save or undo the pixel edits before changing the addressing mode.")
+            self.addr_mode_var.set(self._layout)
+            return
+        print(f"[fview] Addressing changed to {layout}, decoding the font again")
+        self._validate_and_render(self.current_font_bytes)
 
-    def render_font(self, font_bytes):
-        """Render the font data on the canvas."""
+    def _glyph_codes(self):
+        """Code points of a subset font's glyphs from the .bin header or the
+        header's index array, None for a contiguous range."""
+        if self._font_map is not None:
+            return self._font_map.codes()
+        if self._header is not None:
+            return self._header.index() or None
+        return None
+
+    def _draw_emulator(self, *_args):
+        """Redraw the sample text on the emulated display."""
+        if self._atlas is None:
+            return
+        display = DISPLAYS[self.display_var.get()]
+        if self._emulator is None or self._emulator.display != display:
+            self._emulator = FramebufferEmulator(display, self._atlas)
+        started = time.perf_counter()
+        cells = self._emulator.draw_text(self.sample_text.get("1.0", "end-1c"))
+        image = self._emulator.to_image(self.glyph_color, self.background_color,
+                                        scale=max(1, min(self.scale,
+                                                         EMULATOR_WIDTH // display.width)))
+        self._emulator_photo = tk.PhotoImage(data=png_data(image))
+        self.emulator_label.config(image=self._emulator_photo)
+        status = (f"{display.description}\n{cells} glyphs, {display.buffer_size} byte "
+                  f"framebuffer, {(time.perf_counter() - started) * 1e3:.1f} ms")
+        if self._emulator.missing:
+            status += f"\nNo glyph for: {''.join(sorted(self._emulator.missing))}"
+        self.emulator_status.config(text=status)
+
+    def render_font(self, font_bytes, codes=None):
+        """Render the font data on the canvas. codes lists the code point
+        of each glyph, the range of the control bytes by default."""
         self.canvas.delete("all")
         meta = FontMeta(
             x_size=font_bytes[0],
@@ -173,11 +292,11 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
             ascii_offset=font_bytes[2],
             last_offset=font_bytes[3],
         )
-        num_chars = meta.last_offset + 1
+        if codes is None:
+            codes = range(meta.ascii_offset, meta.ascii_offset + meta.last_offset + 1)
         bytes_per_char = self._calc_bytes_per_char(meta.x_size, meta.y_size)
         # Loop through characters
-        for idx in range(num_chars):
-            char_code = meta.ascii_offset + idx
+        for idx, char_code in enumerate(codes):
             start = 4 + idx * bytes_per_char
             end = 4 + (idx + 1) * bytes_per_char
             glyph_data = font_bytes[start:end]
@@ -189,10 +308,9 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
             if len(glyph_data) < bytes_per_char:
                 print("[fview] Warning: glyph too short, skipping")
                 continue
-            if self.addr_mode_var.get() == "horizontal":
-                self._render_horizontal(glyph_data, x_offset, y_offset)
-            else:
-                self._render_vertical(glyph_data, x_offset, y_offset)
+            self._render_glyph_canvas(
+                self._decode_glyph(glyph_data, meta.x_size, meta.y_size),
+                x_offset, y_offset, f"glyph{idx}")
 
         # Track max extents for scrolling
         self.canvas.config(scrollregion=self.canvas.bbox("all"))
@@ -204,47 +322,145 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
             text=chr(char_code)
         )
 
-    def _render_horizontal(self, glyph_data, x_offset, y_offset):
-        x_size = self.current_font_bytes[0]
-        y_size = self.current_font_bytes[1]
-        for y in range(y_size):
-            for byte_index in range(x_size // 8):
-                idx = y * (x_size // 8) + byte_index
-                if idx >= len(glyph_data):
-                    continue
-                byte_val = glyph_data[idx]
-                for bit in range(8):
-                    if (byte_val >> (7 - bit)) & 1:
-                        px = x_offset + (byte_index * 8 + bit) * self.scale
-                        py = y_offset + y * self.scale
-                        self.canvas.create_rectangle(px, py,
-                                                     px + self.scale,
-                                                     py + self.scale,
-                                                     fill=self.glyph_color,
-                                                     outline="")
-
-    def _render_vertical(self, glyph_data, x_offset, y_offset):
-        x_size = self.current_font_bytes[0]
-        y_size = self.current_font_bytes[1]
-        if y_size % 8 != 0:
-            print("Error: render_font: vertical fonts "
-                  "must have height divisible by 8")
+    def _decode_glyph(self, glyph_data, x_size, y_size):
+        """Decode one glyph's bytes into a 1-bit image with the packer
+        registered for the selected addressing mode."""
+        return get_packer(self.addr_mode_var.get()).unpack(glyph_data, x_size, y_size)
+
+    def _render_glyph_canvas(self, glyph, x_offset, y_offset, tag=""):
+        pixels = glyph.load()
+        width, height = glyph.size
+        for y in range(height):
+            for x in range(width):
+                if pixels[x, y]:
+                    px = x_offset + x * self.scale
+                    py = y_offset + y * self.scale
+                    self.canvas.create_rectangle(px, py,
+                                                 px + self.scale,
+                                                 py + self.scale,
+                                                 fill=self.glyph_color,
+                                                 outline="", tags=tag)
+
+    def _on_canvas_click(self, event):
+        """Toggle the glyph pixel under the pointer when editing."""
+        self.canvas.focus_set()
+        if self._editor is None or not self.edit_var.get():
+            return
+        editor = self._editor
+        cell_w = editor.width * self.scale + 20
+        cell_h = editor.height * self.scale + 30
+        x = int(self.canvas.canvasx(event.x))
+        y = int(self.canvas.canvasy(event.y))
+        col, px = divmod(x, cell_w)
+        row, py = divmod(y, cell_h)
+        index = row * self.cols + col
+        px, py = px // self.scale, py // self.scale
+        if (col >= self.cols or index >= len(editor.glyphs)
+                or px >= editor.width or py >= editor.height):
             return
-        bytes_per_col = y_size // 8
-        for x in range(x_size):
-            for row_block in range(bytes_per_col):
-                idx = (row_block * x_size) + x
-                if idx >= len(glyph_data):
-                    continue
-                byte_val = glyph_data[idx]
-                for bit in range(8):
-                    if byte_val & (1 << bit):
-                        px = x_offset + x * self.scale
-                        py = y_offset + (row_block * 8 + bit) * self.scale
-                        self.canvas.create_rectangle(
-                            px, py, px + self.scale,
-                            py + self.scale, fill=self.glyph_color,
-                            outline="")
+        editor.toggle(index, px, py)
+        self._redraw_glyph(index)
+
+    def _redraw_glyph(self, index):
+        """Redraw the one glyph cell that changed, and the emulator."""
+        editor = self._editor
+        glyph = editor.image(index)
+        self.canvas.delete(f"glyph{index}")
+        self._render_glyph_canvas(
+            glyph,
+            (index % self.cols) * (editor.width * self.scale + 20),
+            (index // self.cols) * (editor.height * self.scale + 30),
+            f"glyph{index}")
+        for pos, value in editor.glyph_bytes(index):
+            self.current_font_bytes[pos] = value
+        self._atlas.glyphs[self._atlas.codes[index]] = glyph
+        # Composed lines hold the old glyph
+        self._emulator = None
+        self._draw_emulator()
+        self._update_edit_buttons()
+
+    def _update_edit_buttons(self):
+        editor = self._editor
+        self.edit_check.config(state="normal" if editor else "disabled")
+        for button, history in ((self.undo_btn, editor and editor.can_undo),
+                                (self.redo_btn, editor and editor.can_redo),
+                                (self.save_btn, editor and editor.dirty())):
+            button.config(state="normal" if history else "disabled")
+
+    def undo_edit(self):
+        """Undo the last pixel edit."""
+        index = self._editor.undo() if self._editor else None
+        if index is not None:
+            self._redraw_glyph(index)
+
+    def redo_edit(self):
+        """Redo the last undone pixel edit."""
+        index = self._editor.redo() if self._editor else None
+        if index is not None:
+            self._redraw_glyph(index)
+
+    def save_edits(self):
+        """Write the edited glyphs back into the header, in place."""
+        if self._editor is None:
+            return
+        try:
+            saved = self._editor.save()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error: save_edits", str(e))
+            print(f"[fview] Error saving edits: {e}")
+            return
+        print(f"[fview] Saved {len(saved)} edited glyphs to {self._header.path}")
+        self._update_edit_buttons()
+
+    def compare_file(self):
+        """Compare the open font with another one, showing the changed
+        glyphs side by side with the changed pixels highlighted."""
+        other = self._select_file()
+        if not other or not self._font_path:
+            print("[fview] No file selected, compare cancelled.")
+            return
+        try:
+            started = time.perf_counter()
+            layout = self.addr_mode_var.get()
+            diff = diff_fonts(load_glyphs(other, layout), load_glyphs(self._font_path, layout))
+            seconds = time.perf_counter() - started
+            sheet = render_diff(diff, scale=self.scale)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error: compare_file", str(e))
+            print(f"[fview] Error comparing fonts: {e}")
+            return
+        print(f"[fview] {os.path.basename(other)} -> {os.path.basename(self._font_path)}: "
+              f"{diff.summary()} in {seconds * 1e3:.1f} ms")
+        self._show_diff(diff, sheet)
+
+    def _show_diff(self, diff, sheet):
+        window = tk.Toplevel(self)
+        window.title(f"Diff: {os.path.basename(diff.old.path)} -> "
+                     f"{os.path.basename(diff.new.path)}")
+        text = diff.summary()
+        if diff.added or diff.removed:
+            text += (f"\nAdded: {' '.join(f'U+{code:04X}' for code in diff.added[:32])}"
+                     f"\nRemoved: {' '.join(f'U+{code:04X}' for code in diff.removed[:32])}")
+        if len(diff.changed) > 256:
+            text += f"\nShowing the first 256 of {len(diff.changed)} changed glyphs"
+        tk.Label(window, text=text, justify="left").grid(row=0, column=0, columnspan=2,
+                                                         sticky="w", padx=5, pady=5)
+        if sheet is None:
+            return
+        canvas = tk.Canvas(window, bg=self.background_color,
+                           width=min(sheet.width, 900), height=min(sheet.height, 600))
+        canvas.grid(row=1, column=0, sticky="nsew")
+        v_scroll = tk.Scrollbar(window, orient=tk.VERTICAL, command=canvas.yview)
+        v_scroll.grid(row=1, column=1, sticky="ns")
+        h_scroll = tk.Scrollbar(window, orient=tk.HORIZONTAL, command=canvas.xview)
+        h_scroll.grid(row=2, column=0, sticky="ew")
+        canvas.configure(xscrollcommand=h_scroll.set, yscrollcommand=v_scroll.set,
+                         scrollregion=(0, 0, sheet.width, sheet.height))
+        # Each window keeps its own image alive
+        canvas.photo = tk.PhotoImage(data=png_data(sheet))
+        canvas.create_image(0, 0, image=canvas.photo, anchor="nw")
+        window.grid_rowconfigure(1, weight=1)
+        window.grid_columnconfigure(0, weight=1)
 
     def export_png(self):
         """Export currently loaded font to PNG image."""
@@ -256,7 +472,7 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
             print("[fview] Export path not valid, export cancelled.")
             return
         font_bytes = self.current_font_bytes
-        image = self._create_font_image(font_bytes)
+        image = self._create_font_image(font_bytes, len(self._atlas.codes))
         image.save(path, "PNG")
         messagebox.showinfo("Success", f"PNG exported:\n{path}")
 
@@ -273,30 +489,26 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
             filetypes=[("PNG Image", "*.png")]
         )
 
-    def _create_font_image(self, font_bytes):
+    def _create_font_image(self, font_bytes, num_chars=None):
         background_color = self._hex_to_rgb(self.background_color)
         x_size = font_bytes[0]
         y_size = font_bytes[1]
-        last_offset = font_bytes[3]
-        num_chars = last_offset + 1
+        if num_chars is None:
+            num_chars = font_bytes[3] + 1
         bytes_per_char = self._calc_bytes_per_char(x_size, y_size)
         cols = self.cols
         rows = math.ceil(num_chars / cols)
         img_width = cols * x_size
         img_height = rows * y_size
         image = Image.new("RGB", (img_width, img_height), background_color)
-        pixels = image.load()
         for idx in range(num_chars):
-            self._render_glyph(idx, font_bytes, bytes_per_char, pixels)
+            self._render_glyph(idx, font_bytes, bytes_per_char, image)
         return image
 
     def _calc_bytes_per_char(self, x_size, y_size):
-        if self.addr_mode_var.get() == "horizontal":
-            return math.ceil(x_size / 8) * y_size
-        return math.ceil(y_size / 8) * x_size
-
-    def _render_glyph(self, idx, font_bytes, bytes_per_char, pixels):
+        return get_packer(self.addr_mode_var.get()).bytes_per_glyph(x_size, y_size)
 
+    def _render_glyph(self, idx, font_bytes, bytes_per_char, image):
         glyph_color = self._hex_to_rgb(self.glyph_color) # blue
         start = 4 + idx * bytes_per_char
         end = start + bytes_per_char
@@ -305,46 +517,9 @@ class FontViewer(tk.Frame): # pylint: disable=too-many-instance-attributes
         y_size = font_bytes[1]
         col = idx % self.cols
         row = idx // self.cols
-        ctx = GlyphRenderContext(
-            pixels=pixels,
-            x_size=x_size,
-            y_size=y_size,
-            x_offset=col * x_size,
-            y_offset=row * y_size,
-            color=glyph_color,
-        )
-        if self.addr_mode_var.get() == "horizontal":
-            self._draw_horizontal(glyph_data, ctx)
-        else:
-            self._draw_vertical(glyph_data, ctx)
-
-    def _draw_horizontal(self, glyph_data, ctx):
-        row_bytes = ctx.x_size // 8
-        for y in range(ctx.y_size):
-            for byte_index in range(row_bytes):
-                i = y * row_bytes + byte_index
-                if i >= len(glyph_data):
-                    continue
-                byte_val = glyph_data[i]
-                for bit in range(8):
-                    if (byte_val >> (7 - bit)) & 1:
-                        px = ctx.x_offset + byte_index * 8 + bit
-                        py = ctx.y_offset + y
-                        ctx.pixels[px, py] = ctx.color
-
-    def _draw_vertical(self, glyph_data, ctx):
-        bytes_per_col = ctx.y_size // 8
-        for x in range(ctx.x_size):
-            for row_block in range(bytes_per_col):
-                i = row_block * ctx.x_size + x
-                if i >= len(glyph_data):
-                    continue
-                byte_val = glyph_data[i]
-                for bit in range(8):
-                    if byte_val & (1 << bit):
-                        px = ctx.x_offset + x
-                        py = ctx.y_offset + row_block * 8 + bit
-                        ctx.pixels[px, py] = ctx.color
+        # The decoded glyph is the paste mask, one bulk copy per glyph
+        glyph = self._decode_glyph(glyph_data, x_size, y_size)
+        image.paste(glyph_color, (col * x_size, row * y_size), glyph)
 
     def _hex_to_rgb(self, hex_color):
         """ Convert hex color string to RGB tuple, Pillow needs RGB tuples"""
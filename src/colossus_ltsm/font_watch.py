@@ -0,0 +1,216 @@
+"""
+Module with a watch mode that reconverts fonts when their inputs change.
+
+A jobs file lists the conversions, paths relative to the file:
+
+    {"jobs": [{"name": "ui", "ttf": "fonts/ui.ttf", "output": "src/ui_font.hpp",
+               "params": {"width": 16, "height": 16, "formats": ["gfx"]},
+               "corpus": ["src/ui"]}]}
+
+The font, corpus files and the jobs file itself are polled for changes to
+their modification time and size. A burst of changes, such as an editor
+saving several files, is coalesced: jobs are rebuilt once the files have
+been quiet for the settle time, and only the jobs whose inputs or
+definition changed. Each job keeps its engine, so a change that only
+affects thresholding re-packs the cached glyph cells.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from colossus_ltsm.font_engine import DEFAULT_PARAMS, FontEngine, make_params
+from colossus_ltsm.font_exporters import export_path
+from colossus_ltsm.font_subset import corpus_files, scan_corpus
+
+DEFAULT_INTERVAL = 0.5
+DEFAULT_SETTLE = 0.3
+
+
+@dataclass
+class WatchJob:
+    """One conversion of a jobs file, paths resolved."""
+    name: str
+    ttf: str
+    output: str
+    params: dict = field(default_factory=dict)
+    corpus: list = field(default_factory=list)
+
+    def outputs(self):
+        """The output and the files of any extra formats."""
+        return [self.output] + [str(export_path(self.output, name))
+                                for name in self.params.get('formats', [])]
+
+    def inputs(self):
+        """The font and the corpus files."""
+        return [self.ttf] + [str(path) for path in corpus_files(self.corpus)]
+
+    def depends_on(self, path):
+        """True for the font, a corpus file or a file under a corpus
+        directory, also when the file was just deleted."""
+        return path == self.ttf or any(path == corpus or path.startswith(corpus + os.sep)
+                                       for corpus in self.corpus)
+
+    def full_params(self):
+        """Conversion params, with the code points of the corpus."""
+        params = make_params(**self.params)
+        if self.corpus:
+            params['codepoints'] = scan_corpus(self.corpus)
+        return params
+
+
+def load_jobs(path):
+    """Jobs of a jobs file by name, raises ValueError for a malformed file."""
+    path = Path(path)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError as err:
+        raise ValueError(f"{path} is not valid JSON: {err}") from None
+    entries = data.get("jobs") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        raise ValueError(f"{path} must hold a list of jobs.")
+    base = path.resolve().parent
+    jobs = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not {"ttf", "output"} <= set(entry):
+            raise ValueError(f"Every job in {path} needs 'ttf' and 'output'.")
+        params = entry.get("params", {})
+        unknown = sorted(set(params) - set(DEFAULT_PARAMS))
+        if unknown:
+            raise ValueError(f"Unknown params in {path}: {', '.join(unknown)}")
+        job = WatchJob(entry.get("name") or entry["output"], str(base / entry["ttf"]),
+                       str(base / entry["output"]), dict(params),
+                       [str(base / corpus) for corpus in entry.get("corpus", [])])
+        if job.name in jobs:
+            raise ValueError(f"Duplicate job name '{job.name}' in {path}.")
+        jobs[job.name] = job
+    return jobs
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _write_if_changed(path, output):
+    """Write output unless the file already holds it, so unchanged
+    outputs keep their timestamp. Returns True when written."""
+    data = output if isinstance(output, bytes) else output.encode("utf-8")
+    path = Path(path)
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+class Watcher: # pylint: disable=too-many-instance-attributes
+    """Poll the inputs of a jobs file and reconvert what they affect."""
+
+    def __init__(self, jobs_path, settle=DEFAULT_SETTLE, log=print):
+        self.jobs_path = str(Path(jobs_path).resolve())
+        self.settle = settle
+        self.log = log
+        self.jobs = {}
+        self.engines = {}
+        self._stamps = {}
+        self._pending = set()
+        self._last_change = 0.0
+
+    def start(self):
+        """Load the jobs and convert them all. Returns the results."""
+        self.jobs = load_jobs(self.jobs_path)
+        self._stamps = self._scan()
+        return [self.regenerate(name) for name in self.jobs]
+
+    def _watched(self):
+        """Jobs file and every input, outputs excluded so that writing a
+        header into a corpus directory does not trigger another build."""
+        outputs = {output for job in self.jobs.values() for output in job.outputs()}
+        paths = {self.jobs_path}
+        for job in self.jobs.values():
+            paths.update(path for path in job.inputs() if path not in outputs)
+        return paths
+
+    def _scan(self):
+        return {path: _stamp(path) for path in self._watched()}
+
+    def tick(self, now=None):
+        """Poll once. Changes are collected until none was seen for the
+        settle time, then the affected jobs are rebuilt. Returns results."""
+        now = time.monotonic() if now is None else now
+        current = self._scan()
+        changed = {path for path in current.keys() | self._stamps.keys()
+                   if current.get(path) != self._stamps.get(path)}
+        self._stamps = current
+        if changed:
+            self._pending |= changed
+            self._last_change = now
+            return []
+        if not self._pending or now - self._last_change < self.settle:
+            return []
+        changed, self._pending = self._pending, set()
+        return self._rebuild(changed)
+
+    def _rebuild(self, changed):
+        names = set()
+        if self.jobs_path in changed:
+            try:
+                jobs = load_jobs(self.jobs_path)
+            except (OSError, ValueError) as err:
+                self.log(f"[watch] Keeping the previous jobs: {err}")
+            else:
+                names |= {name for name, job in jobs.items() if self.jobs.get(name) != job}
+                for name in set(self.engines) - set(jobs):
+                    del self.engines[name]
+                self.jobs = jobs
+                self._stamps = self._scan()
+        for name, job in self.jobs.items():
+            if any(job.depends_on(path) for path in changed):
+                names.add(name)
+        return [self.regenerate(name) for name in sorted(names)]
+
+    def regenerate(self, name):
+        """Convert one job and write the outputs that changed. Returns
+        (name, seconds, ok); errors are logged, not raised."""
+        job = self.jobs[name]
+        engine = self.engines.setdefault(name, FontEngine())
+        started = time.perf_counter()
+        try:
+            params = job.full_params()
+            engine.check_dimensions(params)
+            output = engine.convert_font(job.ttf, params)
+            with engine.instruments.phase("write"):
+                written = [job.output] if _write_if_changed(job.output, output) else []
+            with engine.instruments.phase("format"):
+                exported = engine.export_formats(params['formats'], params)
+            for fmt, text in exported.items():
+                path = str(export_path(job.output, fmt))
+                with engine.instruments.phase("write"):
+                    if _write_if_changed(path, text):
+                        written.append(path)
+        except (OSError, ValueError) as err:
+            self.log(f"[watch] {name}: failed, {err}")
+            return name, time.perf_counter() - started, False
+        seconds = time.perf_counter() - started
+        what = ", ".join(written) if written else "outputs unchanged"
+        self.log(f"[watch] {name}: {what} in {seconds * 1e3:.1f} ms | "
+                 f"{engine.instruments.summary()}")
+        return name, seconds, True
+
+    def run(self, interval=DEFAULT_INTERVAL):
+        """Build everything, then poll every interval seconds until
+        interrupted."""
+        self.start()
+        self.log(f"[watch] Watching {len(self._stamps)} files for {len(self.jobs)} jobs, "
+                 f"Ctrl+C to stop")
+        while True:
+            time.sleep(interval)
+            self.tick()
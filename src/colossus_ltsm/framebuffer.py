@@ -0,0 +1,175 @@
+"""
+Module emulating a display's framebuffer for previewing text, without Tk.
+
+Text is drawn with the glyph bytes of a generated font into a 1-bit screen,
+which is then stored in the controller's memory format: pages of 8 rows
+for monochrome OLED and LCD controllers, big-endian RGB565 for TFTs. The
+preview image is decoded back from those bytes, so it shows what the panel
+would hold. Glyphs are decoded once into a GlyphAtlas and text lines are
+composed once and kept, so typing re-blits a strip per line.
+"""
+
+import base64
+import io
+from collections import OrderedDict
+from dataclasses import dataclass
+from PIL import Image, ImageChops
+from colossus_ltsm.packers import get_packer
+
+# Composed text lines kept per emulator
+LINE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class Display:
+    """A display preset: resolution and memory format."""
+    name: str
+    width: int
+    height: int
+    memory: str
+    description: str
+
+    @property
+    def buffer_size(self):
+        """Bytes of controller memory for the whole screen."""
+        if self.memory == "pages":
+            return self.width * -(-self.height // 8)
+        return self.width * self.height * 2
+
+
+DISPLAYS = {display.name: display for display in (
+    Display("oled_128x64", 128, 64, "pages", "SSD1306/SH1106 OLED 128x64, page addressed"),
+    Display("oled_128x32", 128, 32, "pages", "SSD1306 OLED 128x32, page addressed"),
+    Display("lcd_84x48", 84, 48, "pages", "PCD8544 (Nokia 5110) LCD 84x48"),
+    Display("tft_160x128", 160, 128, "rgb565", "ST7735 TFT 160x128, RGB565"),
+    Display("tft_320x240", 320, 240, "rgb565", "ILI9341 TFT 320x240, RGB565"),
+)}
+
+
+def _rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def rgb565(color):
+    """'#RRGGBB' as a 16 bit RGB565 value."""
+    red, green, blue = _rgb(color)
+    return (red >> 3) << 11 | (green >> 2) << 5 | blue >> 3
+
+
+def png_data(image):
+    """Image as base64 PNG data for tk.PhotoImage(data=...)."""
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+class GlyphAtlas: # pylint: disable=too-few-public-methods
+    """Every glyph of a Colossus font decoded once into 1-bit images.
+
+    font_bytes are the control bytes and glyph data, as in the C array or
+    the data section of a .bin font. codes lists the code point of each
+    glyph for subset fonts, the range from the control bytes otherwise;
+    the codes attribute keeps that list, glyph index -> code point.
+    """
+
+    def __init__(self, font_bytes, layout, codes=None):
+        if len(font_bytes) < 4:
+            raise ValueError("Invalid font data, no control bytes.")
+        self.width, self.height, first, last = (int(b) for b in font_bytes[:4])
+        packer = get_packer(layout)
+        size = packer.bytes_per_glyph(self.width, self.height)
+        data = bytes(font_bytes[4:])
+        codes = list(codes) if codes else range(first, first + last + 1)
+        self.codes = list(codes[:len(data) // size])
+        self.glyphs = {code: packer.unpack(data[i * size:(i + 1) * size], self.width, self.height)
+                       for i, code in enumerate(self.codes)}
+
+    def get(self, char):
+        """Image of char, None when the font has no glyph for it."""
+        return self.glyphs.get(ord(char))
+
+
+class FramebufferEmulator:
+    """A display's screen, drawn with glyphs from an atlas."""
+
+    def __init__(self, display, atlas):
+        self.display = DISPLAYS[display] if isinstance(display, str) else display
+        self.atlas = atlas
+        self.screen = Image.new("1", (self.display.width, self.display.height), 0)
+        self._lines = OrderedDict()
+        self.missing = set()
+
+    def clear(self):
+        """Blank the screen."""
+        self.screen.paste(0, (0, 0, self.display.width, self.display.height))
+
+    def _line(self, line):
+        """Strip image of one line of cells, composed once."""
+        strip = self._lines.get(line)
+        if strip is not None:
+            self._lines.move_to_end(line)
+            return strip
+        width = self.atlas.width
+        strip = Image.new("1", (max(1, len(line) * width), self.atlas.height), 0)
+        for i, char in enumerate(line):
+            glyph = self.atlas.get(char)
+            if glyph is not None:
+                strip.paste(glyph, (i * width, 0))
+        self._lines[line] = strip
+        if len(self._lines) > LINE_CACHE_SIZE:
+            self._lines.popitem(last=False)
+        return strip
+
+    def layout(self, text, wrap=True):
+        """Split text into the lines of cells the screen shows, wrapped at
+        the right edge when wrap is set, clipped at the bottom."""
+        columns = max(1, self.display.width // self.atlas.width)
+        rows = self.display.height // self.atlas.height
+        lines = []
+        for line in text.split("\n"):
+            if wrap:
+                lines += [line[i:i + columns] for i in range(0, len(line), columns)] or [""]
+            else:
+                lines.append(line[:columns])
+        return lines[:rows]
+
+    def draw_text(self, text, wrap=True):
+        """Clear the screen and draw text on the cell grid, one paste per
+        line. Returns the number of cells drawn."""
+        self.clear()
+        lines = self.layout(text, wrap)
+        self.missing = {char for char in set("".join(lines)) if self.atlas.get(char) is None}
+        for row, line in enumerate(lines):
+            if line:
+                self.screen.paste(self._line(line), (0, row * self.atlas.height))
+        return sum(len(line) for line in lines)
+
+    def buffer(self, glyph_color="#FFFFFF", background_color="#000000"):
+        """The screen in controller memory: page bytes, LSB at the top,
+        or big-endian RGB565 words for TFTs."""
+        if self.display.memory == "pages":
+            return get_packer("vertical").pack(self.screen)
+        words = [rgb565(background_color), rgb565(glyph_color)]
+        mono = self.screen.convert("L")
+        high = mono.point([words[0] >> 8] * 128 + [words[1] >> 8] * 128)
+        low = mono.point([words[0] & 0xFF] * 128 + [words[1] & 0xFF] * 128)
+        return Image.merge("LA", (high, low)).tobytes()
+
+    def to_image(self, glyph_color="#FFFFFF", background_color="#000000", scale=1):
+        """RGB image decoded from buffer(), scaled up by whole pixels."""
+        size = (self.display.width, self.display.height)
+        data = self.buffer(glyph_color, background_color)
+        if self.display.memory == "pages":
+            lit = get_packer("vertical").unpack(data, *size)
+            image = Image.new("RGB", size, _rgb(background_color))
+            image.paste(_rgb(glyph_color), (0, 0), lit)
+        else:
+            high, low = Image.frombytes("LA", size, data).split()
+            green = ImageChops.add(high.point(lambda v: (v & 0x07) << 5),
+                                   low.point(lambda v: (v >> 5) << 2))
+            image = Image.merge("RGB", (high.point(lambda v: v & 0xF8), green,
+                                        low.point(lambda v: (v & 0x1F) << 3)))
+        if scale > 1:
+            image = image.resize((size[0] * scale, size[1] * scale), Image.Resampling.NEAREST)
+        return image
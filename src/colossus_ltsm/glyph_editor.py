@@ -0,0 +1,100 @@
+"""
+Module with the pixel editor model behind the viewer, without Tk.
+
+Glyphs are held as immutable packed bytes, one object per glyph. Toggling
+a pixel decodes that one glyph, flips the pixel and packs it into a new
+bytes object; every other glyph keeps its object. The undo history stores
+(glyph, previous bytes) pairs, so a step costs a reference to a bitmap
+that already existed, a few bytes per glyph, never a copy of the font.
+Saving writes only the glyphs that differ from the file, in place.
+"""
+
+from colossus_ltsm.font_header import HeaderFont
+from colossus_ltsm.packers import get_packer
+
+# Undo steps kept per editor
+UNDO_LIMIT = 1000
+
+
+class GlyphEditor: # pylint: disable=too-many-instance-attributes
+    """Pixel edits of the glyphs of a header font, with undo and redo."""
+
+    def __init__(self, header, layout):
+        self.header = header if isinstance(header, HeaderFont) else HeaderFont(header)
+        font_bytes = self.header.font_bytes
+        if len(font_bytes) < 4:
+            raise ValueError("Invalid font data, no control bytes.")
+        self.width, self.height = font_bytes[0], font_bytes[1]
+        self.packer = get_packer(layout)
+        self.size = self.packer.bytes_per_glyph(self.width, self.height)
+        count = (len(font_bytes) - 4) // self.size
+        self.glyphs = [bytes(font_bytes[4 + i * self.size:4 + (i + 1) * self.size])
+                       for i in range(count)]
+        self._saved = list(self.glyphs)
+        self._undo = []
+        self._redo = []
+
+    def image(self, index):
+        """1-bit image of glyph index."""
+        return self.packer.unpack(self.glyphs[index], self.width, self.height)
+
+    def toggle(self, index, x, y):
+        """Flip pixel (x, y) of glyph index. Returns the new pixel value."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"Pixel ({x}, {y}) is outside the {self.width}x{self.height} cell.")
+        glyph = self.image(index)
+        value = 0 if glyph.getpixel((x, y)) else 1
+        glyph.putpixel((x, y), value)
+        self._set(index, bytes(self.packer.pack(glyph)), self._undo)
+        del self._redo[:]
+        return value
+
+    def _set(self, index, data, history):
+        history.append((index, self.glyphs[index]))
+        del history[:-UNDO_LIMIT]
+        self.glyphs[index] = data
+
+    @property
+    def can_undo(self):
+        """True when there is an edit to undo."""
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        """True when there is an undone edit to redo."""
+        return bool(self._redo)
+
+    def undo(self):
+        """Revert the last edit. Returns the glyph index it touched, None
+        when there is nothing to undo."""
+        if not self._undo:
+            return None
+        index, data = self._undo.pop()
+        self._set(index, data, self._redo)
+        return index
+
+    def redo(self):
+        """Reapply the last undone edit, returns the glyph index or None."""
+        if not self._redo:
+            return None
+        index, data = self._redo.pop()
+        self._set(index, data, self._undo)
+        return index
+
+    def dirty(self):
+        """Indices of the glyphs that differ from the file."""
+        return [i for i, (data, saved) in enumerate(zip(self.glyphs, self._saved))
+                if data is not saved and data != saved]
+
+    def glyph_bytes(self, index):
+        """Positions in the font array and bytes of glyph index."""
+        return zip(self.header.glyph_range(index, self.size), self.glyphs[index])
+
+    def save(self):
+        """Write the changed glyphs to the header. Returns their indices."""
+        dirty = self.dirty()
+        self.header.write({pos: value for index in dirty
+                           for pos, value in self.glyph_bytes(index)})
+        for index in dirty:
+            self._saved[index] = self.glyphs[index]
+        return dirty
@@ -0,0 +1,93 @@
+"""
+Module with lightweight timers and counters for conversions.
+
+An Instruments object collects the time spent in each conversion phase
+(face loading, extent scanning, rasterization, packing, formatting and
+writing) and counters such as glyphs and cache hits. Phases may nest, the
+outer phase is only charged for its own time, so the phase times add up to
+the total. A summary line is logged after each conversion and the figures
+can be handed to a sink, a callable taking a dict, for example json_sink.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+# Display order of the summary, other phases follow in first-use order
+PHASES = ("load", "scan", "rasterize", "pack", "format", "write")
+
+
+class Instruments:
+    """Phase timers and counters for one conversion or a batch of them."""
+
+    def __init__(self, sink=None):
+        self.sink = sink
+        self.timings = {}
+        self.counters = {}
+        self._nested = []
+
+    def reset(self):
+        """Clear timings and counters, keeping the sink."""
+        self.timings = {}
+        self.counters = {}
+        self._nested = []
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as phase name."""
+        started = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            inner = self._nested.pop()
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed - inner
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def count(self, name, amount=1):
+        """Add amount to counter name."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, stats):
+        """Add the timings and counters of an as_dict() snapshot, used to
+        total a batch whose conversions ran in other processes."""
+        for name, seconds in stats.get('timings', {}).items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for name, amount in stats.get('counters', {}).items():
+            self.count(name, amount)
+
+    @property
+    def total(self):
+        """Seconds spent in all phases."""
+        return sum(self.timings.values())
+
+    def as_dict(self):
+        """Timings in seconds and counters, ready for JSON."""
+        return {'timings': dict(self.timings), 'counters': dict(self.counters),
+                'total': self.total}
+
+    def summary(self):
+        """One line of phase times in milliseconds and counters."""
+        names = [name for name in PHASES if name in self.timings]
+        names += [name for name in self.timings if name not in PHASES]
+        phases = ", ".join(f"{name} {self.timings[name] * 1e3:.1f}" for name in names)
+        line = f"Timing (ms): {phases or 'none'} | total {self.total * 1e3:.1f}"
+        if self.counters:
+            line += " | " + ", ".join(f"{name.replace('_', ' ')} {amount}"
+                                      for name, amount in self.counters.items())
+        return line
+
+    def emit(self, **extra):
+        """Hand the figures, with any extra fields, to the sink if set."""
+        if self.sink is not None:
+            self.sink(dict(self.as_dict(), **extra))
+
+
+def json_sink(path):
+    """Sink appending each record to path as one line of JSON."""
+    def write(record):
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, sort_keys=True) + "\n")
+    return write
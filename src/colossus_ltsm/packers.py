@@ -0,0 +1,171 @@
+"""
+Module holding the registry of glyph byte layouts.
+
+Each packer turns a 1-bit glyph image into the byte order a display
+controller expects, and each has a matching decoder used by the viewer.
+Packing and unpacking work on whole images through Pillow's raw bit
+codec plus bytes slicing and translate, no per-pixel Python loops.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+from PIL import Image
+
+# Byte -> same byte with its bit order reversed (MSB-first <-> LSB-first)
+_BIT_REVERSE = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+@dataclass(frozen=True)
+class Packer: # pylint: disable=too-many-instance-attributes
+    """A registered glyph byte layout."""
+    name: str
+    layout_id: int
+    description: str
+    pack: Callable
+    unpack: Callable
+    bytes_per_glyph: Callable
+    width_multiple: int = 1
+    height_multiple: int = 1
+
+
+PACKERS = {}
+
+
+def register_packer(packer):
+    """Add a packer to the registry, keyed by its name."""
+    if packer.name in PACKERS:
+        raise ValueError(f"Layout '{packer.name}' is already registered.")
+    PACKERS[packer.name] = packer
+    return packer
+
+
+def get_packer(name):
+    """Return the registered packer called name."""
+    try:
+        return PACKERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown data layout '{name}', "
+                         f"choose from: {', '.join(PACKERS)}") from None
+
+
+def layout_names():
+    """Names of all registered layouts, in registration order."""
+    return list(PACKERS)
+
+
+def _ceil_div(value, step):
+    return -(-value // step)
+
+
+def _reorder_words(raw, word_bytes):
+    """Reverse the byte order inside each word, big <-> little endian."""
+    out = bytearray(len(raw))
+    for k in range(word_bytes):
+        out[k::word_bytes] = raw[word_bytes - 1 - k::word_bytes]
+    return bytes(out)
+
+
+def _fit(data, size):
+    """Pad or trim decoder input to exactly size bytes."""
+    data = bytes(data)
+    return data[:size] + bytes(max(0, size - len(data)))
+
+
+# Rows, 8 columns per byte
+
+def _rows_bytes(width, height):
+    return _ceil_div(width, 8) * height
+
+
+def _pack_rows_msb(img):
+    return list(img.tobytes())
+
+
+def _pack_rows_lsb(img):
+    return list(img.tobytes().translate(_BIT_REVERSE))
+
+
+def _unpack_rows_msb(data, width, height):
+    return Image.frombytes("1", (width, height), _fit(data, _rows_bytes(width, height)))
+
+
+def _unpack_rows_lsb(data, width, height):
+    raw = _fit(data, _rows_bytes(width, height)).translate(_BIT_REVERSE)
+    return Image.frombytes("1", (width, height), raw)
+
+
+# Pages, 8 rows per byte, page after page of columns
+
+def _pages_bytes(width, height):
+    return _ceil_div(height, 8) * width
+
+
+def _pack_pages(img, reverse):
+    pages = _ceil_div(img.size[1], 8)
+    # Transposed rows are the original columns, MSB = top pixel
+    columns = img.transpose(Image.Transpose.TRANSPOSE).tobytes()
+    raw = b"".join(columns[page::pages] for page in range(pages))
+    if reverse:
+        raw = raw.translate(_BIT_REVERSE)
+    return list(raw)
+
+
+def _unpack_pages(data, width, height, reverse):
+    pages = _ceil_div(height, 8)
+    raw = _fit(data, pages * width)
+    if reverse:
+        raw = raw.translate(_BIT_REVERSE)
+    columns = bytearray(pages * width)
+    for page in range(pages):
+        columns[page::pages] = raw[page * width:(page + 1) * width]
+    return Image.frombytes("1", (height, width), bytes(columns)).transpose(
+        Image.Transpose.TRANSPOSE)
+
+
+# Rows padded to 16 or 32 bit words, MSB = leftmost pixel, words little-endian
+
+def _word_rows_bytes(width, height, bits):
+    return _ceil_div(width, bits) * bits // 8 * height
+
+
+def _pack_word_rows(img, bits):
+    width, height = img.size
+    padded = Image.new("1", (_ceil_div(width, bits) * bits, height), 0)
+    padded.paste(img, (0, 0))
+    return list(_reorder_words(padded.tobytes(), bits // 8))
+
+
+def _unpack_word_rows(data, width, height, bits):
+    padded_w = _ceil_div(width, bits) * bits
+    raw = _reorder_words(_fit(data, padded_w // 8 * height), bits // 8)
+    return Image.frombytes("1", (padded_w, height), raw).crop((0, 0, width, height))
+
+
+register_packer(Packer(
+    "horizontal", 0, "Rows, 8 columns per byte, MSB = leftmost pixel",
+    _pack_rows_msb, _unpack_rows_msb, _rows_bytes, width_multiple=8))
+register_packer(Packer(
+    "vertical", 1, "Pages of 8 rows, one byte per column, LSB = top pixel",
+    lambda img: _pack_pages(img, True),
+    lambda data, w, h: _unpack_pages(data, w, h, True),
+    _pages_bytes, height_multiple=8))
+register_packer(Packer(
+    "horizontal_lsb", 2, "Rows, 8 columns per byte, LSB = leftmost pixel",
+    _pack_rows_lsb, _unpack_rows_lsb, _rows_bytes, width_multiple=8))
+register_packer(Packer(
+    "vertical_msb", 3, "Pages of 8 rows, one byte per column, MSB = top pixel",
+    lambda img: _pack_pages(img, False),
+    lambda data, w, h: _unpack_pages(data, w, h, False),
+    _pages_bytes, height_multiple=8))
+register_packer(Packer(
+    "horizontal_word16", 4,
+    "Rows padded to 16 bit words, bit 15 = leftmost pixel, little-endian words",
+    lambda img: _pack_word_rows(img, 16),
+    lambda data, w, h: _unpack_word_rows(data, w, h, 16),
+    lambda w, h: _word_rows_bytes(w, h, 16), width_multiple=8))
+register_packer(Packer(
+    "horizontal_word32", 5,
+    "Rows padded to 32 bit words, bit 31 = leftmost pixel, little-endian words",
+    lambda img: _pack_word_rows(img, 32),
+    lambda data, w, h: _unpack_word_rows(data, w, h, 32),
+    lambda w, h: _word_rows_bytes(w, h, 32), width_multiple=8))
@@ -1,10 +1,31 @@
 """
 This module handles application settings using a configuration file.
 It provides methods to load, save, and access settings with defaults.
+The file is read on first access, not at import.
+
+Typed values are cached in memory and the file is only parsed again when
+its modification time changes, checked at most every CHECK_INTERVAL seconds.
+set() changes are coalesced into one save SAVE_DELAY seconds later (and at
+exit). Saves write a temporary file and rename it over the config, under a
+lock file, merging in any changes another process saved meanwhile, so the
+GUI and parallel workers can share one config.
 """
+import atexit
 import configparser
+import io
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows, saves are then only serialised in-process
+    fcntl = None
+
 CL_CONFIG_PATH = Path.home() / ".config" / "colossus_ltsm" / "colossus_ltsm.cfg"
 
 CL_DEFAULTS_DISPLAY = {
@@ -24,78 +45,225 @@ CL_DEFAULTS_DEBUG = {
     "debugOnOff": "0"
 }
 
-class Settings:
+CL_DEFAULTS = {
+    "Display": CL_DEFAULTS_DISPLAY,
+    "Debug": CL_DEFAULTS_DEBUG,
+    "Paths": CL_DEFAULTS_PATHS,
+}
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot: # pylint: disable=too-many-instance-attributes
+    """Typed values of the known settings, rebuilt when the file changes."""
+    scale: int
+    cols: int
+    screen_resolution: str
+    glyph_color: str
+    background_color: str
+    input_dir: str
+    output_dir: str
+    debug: bool
+
+
+@contextmanager
+def _file_lock(config_path):
+    """Exclusive lock on config_path.lock, shared by all processes."""
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(config_path.with_name(config_path.name + ".lock"), "a", encoding="utf-8") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_file_atomic(path, text):
+    """Write text to a temporary file beside path and rename it over path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent,
+                                     prefix=path.name, suffix=".tmp", delete=False) as f:
+        f.write(text)
+    os.replace(f.name, path)
+
+
+def _file_stamp(path):
+    """(mtime_ns, size) of path, None when it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class Settings: # pylint: disable=too-many-instance-attributes
     """Singleton class to manage application settings."""
 
+    # Seconds between modification time checks, and before a coalesced save
+    CHECK_INTERVAL = 1.0
+    SAVE_DELAY = 0.5
+
     def __init__(self):
         self.config = configparser.ConfigParser()
-        self.load()
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._stamp = None
+        self._checked = 0.0
+        self._cache = {}
+        self._snapshot = None
+        self._pending = {}
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _ensure_loaded(self):
+        """Load on first use, and again when the file changed on disk."""
+        if not self._loaded:
+            self.load()
+            return
+        now = time.monotonic()
+        if now - self._checked < self.CHECK_INTERVAL:
+            return
+        self._checked = now
+        if _file_stamp(CL_CONFIG_PATH) != self._stamp:
+            self.load()
 
     def load(self):
         """Load settings from the config file, or use defaults."""
-        try:
-            if CL_CONFIG_PATH.exists():
-                self.config.read(CL_CONFIG_PATH)
+        with self._lock:
+            self._loaded = True
+            self._checked = time.monotonic()
+            self._cache = {}
+            self._snapshot = None
+            try:
+                self._stamp = _file_stamp(CL_CONFIG_PATH)
+                self.config = self._read_config()
 
-            # --- Display Section ---
-            if "Display" not in self.config:
-                self.config["Display"] = CL_DEFAULTS_DISPLAY.copy()
-            else:
-                for key, val in CL_DEFAULTS_DISPLAY.items():
-                    self.config["Display"].setdefault(key, val)
+                # Create file if it doesn't exist
+                if self._stamp is None:
+                    print("[Settings] Config file not found, creating with defaults.")
+                    self.save()
 
-            # --- Debug Section ---
-            if "Debug" not in self.config:
-                self.config["Debug"] = CL_DEFAULTS_DEBUG.copy()
-            else:
-                for key, val in CL_DEFAULTS_DEBUG.items():
-                    self.config["Debug"].setdefault(key, val)
+            except Exception as e: # pylint: disable=broad-exception-caught
+                print(f"[Settings] Error loading config: {e}, using defaults")
+                for section, defaults in CL_DEFAULTS.items():
+                    self.config[section] = defaults.copy()
 
-            # --- Paths Section ---
-            if "Paths" not in self.config:
-                self.config["Paths"] = CL_DEFAULTS_PATHS.copy()
-            else:
-                for key, val in CL_DEFAULTS_PATHS.items():
-                    self.config["Paths"].setdefault(key, val)
+    def save(self):
+        """Save the current settings to the config file now, atomically.
+        Options another process saved since the last load are kept, unless
+        this process changed them too."""
+        with self._lock:
+            self._cancel_timer()
+            try:
+                with _file_lock(CL_CONFIG_PATH):
+                    if _file_stamp(CL_CONFIG_PATH) not in (None, self._stamp):
+                        # Another process saved, keep its options
+                        self.config = self._read_config()
+                        self._cache = {}
+                        self._snapshot = None
+                    buffer = io.StringIO()
+                    self.config.write(buffer)
+                    _write_file_atomic(CL_CONFIG_PATH, buffer.getvalue())
+                    self._stamp = _file_stamp(CL_CONFIG_PATH)
+                self._pending = {}
+            except (PermissionError, OSError) as e:
+                print(f"[Settings]  Error saving config: {e}")
 
-            # Create file if it doesn't exist
-            if not CL_CONFIG_PATH.exists():
-                print("[Settings] Config file not found, creating with defaults.")
+    def save_text(self, text):
+        """Replace the config file with text, as edited on the Settings
+        page, then reload it."""
+        with self._lock:
+            self._cancel_timer()
+            self._pending = {}
+            with _file_lock(CL_CONFIG_PATH):
+                _write_file_atomic(CL_CONFIG_PATH, text)
+            self.load()
+
+    def flush(self):
+        """Save now if set() left changes waiting for the coalesced save."""
+        with self._lock:
+            if self._pending:
                 self.save()
 
-        except Exception as e: # pylint: disable=broad-exception-caught
-            print(f"[Settings] Error loading config: {e}, using defaults")
-            self.config["Display"] = CL_DEFAULTS_DISPLAY.copy()
-            self.config["Debug"] = CL_DEFAULTS_DEBUG.copy()
-            self.config["Paths"] = CL_DEFAULTS_PATHS.copy()
+    def _read_config(self):
+        """The config file with defaults filled in and unsaved changes,
+        which win over the file, applied."""
+        config = configparser.ConfigParser()
+        if CL_CONFIG_PATH.exists():
+            config.read(CL_CONFIG_PATH, encoding="utf-8")
+        for section, defaults in CL_DEFAULTS.items():
+            if section not in config:
+                config[section] = defaults.copy()
+            else:
+                for key, val in defaults.items():
+                    config[section].setdefault(key, val)
+        for (section, option), value in self._pending.items():
+            if section not in config:
+                config[section] = {}
+            config[section][option] = value
+        return config
 
-    def save(self):
-        """Save the current settings to the config file."""
-        try:
-            CL_CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-            with CL_CONFIG_PATH.open("w", encoding="utf-8") as f:  # ← add encoding!
-                self.config.write(f)
-        except (PermissionError, OSError) as e:
-            print(f"[Settings]  Error saving config: {e}")
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _cached(self, getter, section, option, fallback):
+        """Value of configparser getter, parsed once per file version."""
+        key = (getter, section, option, fallback)
+        with self._lock:
+            self._ensure_loaded()
+            if key not in self._cache:
+                self._cache[key] = getattr(self.config, getter)(section, option,
+                                                                fallback=fallback)
+            return self._cache[key]
 
     def getint(self, section, option, fallback):
         """Get an integer setting with a fallback value."""
-        return self.config.getint(section, option, fallback=fallback)
+        return self._cached("getint", section, option, fallback)
 
     def getbool(self, section, option, fallback=False):
         """Get a boolean setting (0/1 or true/false)."""
-        return self.config.getboolean(section, option, fallback=fallback)
+        return self._cached("getboolean", section, option, fallback)
 
     def getstr(self, section, option, fallback=""):
         """Get a string setting with a fallback value."""
-        return self.config.get(section, option, fallback=fallback)
+        return self._cached("get", section, option, fallback)
+
+    def snapshot(self):
+        """Typed values of the known settings, for hot paths."""
+        with self._lock:
+            self._ensure_loaded()
+            if self._snapshot is None:
+                self._snapshot = SettingsSnapshot(
+                    scale=self.getint("Display", "scale", 4),
+                    cols=self.getint("Display", "cols", 16),
+                    screen_resolution=self.getstr("Display", "screen_resolution", "1000x800"),
+                    glyph_color=self.getstr("Display", "glyph_color", "#0078FF"),
+                    background_color=self.getstr("Display", "background_color", "#000000"),
+                    input_dir=self.getstr("Paths", "input_dir", str(Path.home())),
+                    output_dir=self.getstr("Paths", "output_dir", str(Path.home())),
+                    debug=self.getbool("Debug", "debugOnOff", False),
+                )
+            return self._snapshot
 
     def set(self, section, option, value):
-        """Set a config value and save."""
-        if section not in self.config:
-            self.config[section] = {}
-        self.config[section][option] = str(value)
-        self.save()
+        """Set a config value, saved with other changes made within
+        SAVE_DELAY seconds, or by flush()."""
+        with self._lock:
+            self._ensure_loaded()
+            if section not in self.config:
+                self.config[section] = {}
+            self.config[section][option] = str(value)
+            self._pending[(section, option)] = str(value)
+            self._cache = {}
+            self._snapshot = None
+            if self._timer is None:
+                self._timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
 
 # create settings instance singleton.
 settings = Settings()
@@ -0,0 +1,23 @@
+# pylint: disable=missing-docstring,redefined-outer-name
+import pytest
+from PIL import ImageFont
+
+
+@pytest.fixture
+def test_font():
+    """A 24px TrueType font, DejaVu if installed else the Pillow default."""
+    try:
+        return ImageFont.truetype("DejaVuSans.ttf", 24)
+    except OSError:
+        font = ImageFont.load_default(24)
+        if not hasattr(font, "getbbox"):
+            pytest.skip("No usable PIL font available for glyph rendering.")
+        return font
+
+
+@pytest.fixture
+def test_font_path(test_font):
+    """File path of test_font, skipping when it was not loaded from disk."""
+    if not isinstance(test_font.path, str):
+        pytest.skip("Needs a TrueType font file on disk.")
+    return test_font.path
@@ -0,0 +1,44 @@
+# pylint: disable=missing-docstring
+import pytest
+
+from colossus_ltsm import colossus_cli
+from colossus_ltsm.font_binary import read_blob_header
+
+
+def _font_path(test_font):
+    if not isinstance(test_font.path, str):
+        pytest.skip("Needs a TrueType font file on disk.")
+    return test_font.path
+
+
+def test_cli_converts_to_header_with_chosen_layout(tmp_path, test_font):
+    out = tmp_path / "small_font.h"
+    code = colossus_cli.main(["convert", _font_path(test_font), "-o", str(out),
+                              "--start", "65", "--end", "66", "-l", "vertical_msb",
+                              "--style", "c"])
+    text = out.read_text(encoding="utf-8")
+    assert code == 0
+    assert "vertical_msb-addressed" in text
+    assert "static const unsigned char small_font[68]" in text
+
+
+def test_cli_writes_binary_for_bin_output(tmp_path, test_font):
+    out = tmp_path / "font.bin"
+    code = colossus_cli.main(["convert", _font_path(test_font), "-o", str(out),
+                              "--start", "65", "--end", "65", "-l", "horizontal_word32"])
+    header = read_blob_header(out.read_bytes())
+    assert code == 0
+    assert header.layout == "horizontal_word32"
+    assert header.bytes_per_glyph == 64
+
+
+def test_cli_rejects_bad_dimensions(tmp_path, test_font, capsys):
+    code = colossus_cli.main(["convert", _font_path(test_font), "-o",
+                              str(tmp_path / "bad.hpp"), "-W", "12"])
+    assert code == 1
+    assert "multiple of 8" in capsys.readouterr().err
+
+
+def test_cli_lists_layouts(capsys):
+    assert colossus_cli.main(["layouts"]) == 0
+    assert "horizontal_lsb" in capsys.readouterr().out
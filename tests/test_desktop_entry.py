@@ -0,0 +1,35 @@
+# pylint: disable=missing-docstring
+import configparser
+import sys
+
+from colossus_ltsm import desktop_entry
+
+
+def test_install_writes_packaged_files_without_network(tmp_path, monkeypatch):
+    monkeypatch.setattr("subprocess.run", None)
+    written = desktop_entry.install_desktop_entry(tmp_path)
+    icon, desktop = desktop_entry.entry_paths(tmp_path)
+    assert written == [icon, desktop]
+    assert icon.read_bytes()[:8] == b"\x89PNG\r\n\x1a\n"
+    assert desktop_entry.desktop_entry_installed(tmp_path)
+    assert not desktop_entry.install_desktop_entry(tmp_path)
+
+
+def test_exec_line_targets_this_interpreter():
+    text = desktop_entry.desktop_file_text()
+    entry = configparser.ConfigParser(interpolation=None)
+    entry.read_string(text)
+    exec_line = entry["Desktop Entry"]["Exec"]
+    assert exec_line.startswith((sys.executable, f'"{sys.executable}"')) \
+        or exec_line.endswith("colossus")
+    assert entry["Desktop Entry"]["Icon"] == "colossus"
+
+
+def test_exec_prefers_the_console_script_and_quotes(tmp_path):
+    venv_bin = tmp_path / "my env" / "bin"
+    venv_bin.mkdir(parents=True)
+    python = venv_bin / "python"
+    assert desktop_entry.exec_command(python) == \
+        f'"{python}" -m colossus_ltsm.colossus_main'
+    (venv_bin / "colossus").write_text("#!/bin/sh\n", encoding="utf-8")
+    assert desktop_entry.exec_command(python) == f'"{venv_bin / "colossus"}"'
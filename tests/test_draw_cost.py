@@ -0,0 +1,73 @@
+# pylint: disable=missing-docstring,protected-access,redefined-outer-name
+import pytest
+from PIL import Image, ImageChops
+
+from colossus_ltsm.draw_cost import cell_draw_cost, format_cost_table
+from colossus_ltsm.font_engine import FontEngine, make_params
+
+
+def _same(first, second):
+    return ImageChops.difference(first.convert("L"), second.convert("L")).getbbox() is None
+
+
+@pytest.fixture
+def costs(test_font):
+    def simulate(target):
+        engine = FontEngine()
+        engine._log = lambda *args, **kwargs: None
+        params = make_params(width=16, height=24, start=32, end=126)
+        engine._generate_glyph_blocks(test_font, params)
+        return {cost.name: cost for cost in engine.draw_costs(params, "Ag 1!", target)}
+    return simulate
+
+
+def test_every_layout_replays_the_same_pixels(costs):
+    result = costs("pixel")
+    reference = result["horizontal"].image
+    assert reference.getbbox() is not None
+    for name in ("horizontal_lsb", "vertical", "vertical_msb", "horizontal_word16",
+                 "horizontal_word32"):
+        assert _same(result[name].image, reference), name
+    gfx = result["gfx"].image
+    assert _same(result["lvgl"].image, gfx)
+    assert _same(result["u8g2"].image.crop((0, 0) + gfx.size), gfx)
+
+
+def test_page_target_copies_vertical_bytes(costs):
+    result = costs("pages")
+    vertical, horizontal = result["vertical"], result["horizontal"]
+    assert vertical.bit_ops == 0
+    assert vertical.pixel_writes == vertical.bytes_read == 5 * 16 * 3
+    assert horizontal.bit_ops > 5 * 16 * 24
+
+
+def test_fill_writes_every_cell_pixel(costs):
+    assert costs("fill")["horizontal"].pixel_writes == 5 * 16 * 24
+    pixel = costs("pixel")["horizontal"]
+    assert pixel.pixel_writes == _ink(pixel.image)
+
+
+def _ink(image):
+    return sum(1 for value in image.getdata() if value)
+
+
+def test_cell_cost_counts_bytes_and_skips_unknown_codes():
+    glyph = Image.new("1", (8, 2), 0)
+    glyph.putpixel((0, 0), 1)
+    blocks = [("A", list(glyph.tobytes()))]
+    cost = cell_draw_cost("horizontal", blocks, (8, 2), "AéA")
+    assert (cost.bytes_read, cost.bit_ops, cost.pixel_writes) == (4, 32, 2)
+    assert "horizontal" in format_cost_table([cost], "AéA", "pixel")
+
+
+def test_large_cells_skip_formats_the_exporter_rejects(test_font_path):
+    engine = FontEngine()
+    logged = []
+    engine._log = lambda message, level="info": logged.append(message)
+    engine.convert_font(test_font_path, make_params(width=160, height=160, start=32, end=126,
+                                                    draw_sample="W@"))
+    costs = {cost.name: cost for cost in engine.draw_costs(
+        make_params(width=160, height=160, start=32, end=126), "W@")}
+    assert "too large for u8g2" in costs["u8g2"].skipped
+    assert costs["horizontal"].bytes_read > 0
+    assert any("u8g2" in message and "skipped:" in message for message in logged)
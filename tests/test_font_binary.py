@@ -0,0 +1,110 @@
+# pylint: disable=missing-docstring,protected-access,redefined-outer-name
+from types import SimpleNamespace
+
+import pytest
+
+from colossus_ltsm.font_binary import (BIN_HEADER, MappedFont, pack_font_blob,
+                                       read_blob_header)
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_viewer import FontViewer
+
+
+def _sample_blob(addr_mode="vertical"):
+    params = make_params(width=8, height=8, start=0x30, end=0x31, addr_mode=addr_mode)
+    control = [8, 8, 0x30, 0x01]
+    glyph_blocks = [("0", [0x7C, 0xC6, 0xCE, 0xD6, 0xE6, 0xC6, 0x7C, 0x00]),
+                    ("1", [0x18, 0x38, 0x18, 0x18, 0x18, 0x18, 0x7E, 0x00])]
+    return pack_font_blob(control, glyph_blocks, params), control, glyph_blocks
+
+
+def test_blob_header_carries_control_bytes_and_layout():
+    blob, control, glyph_blocks = _sample_blob()
+    header = read_blob_header(blob)
+
+    assert header.layout == "vertical"
+    assert (header.width, header.height) == (8, 8)
+    assert (header.first_code, header.last_offset) == (0x30, 0x01)
+    assert header.glyph_count == 2
+    assert header.bytes_per_glyph == 8
+    assert header.index_count == 0
+    data = blob[header.data_offset:header.data_offset + header.data_len]
+    assert list(data) == control + glyph_blocks[0][1] + glyph_blocks[1][1]
+
+
+def test_read_blob_header_rejects_bad_magic():
+    blob, _, _ = _sample_blob()
+    with pytest.raises(ValueError):
+        read_blob_header(b"XXXX" + blob[4:])
+    with pytest.raises(ValueError):
+        read_blob_header(blob[:BIN_HEADER.size - 1])
+
+
+def test_mapped_font_exposes_array_layout(tmp_path):
+    blob, control, _ = _sample_blob()
+    path = tmp_path / "font.bin"
+    path.write_bytes(blob)
+    with MappedFont(str(path)) as mapped:
+        assert list(mapped.font_bytes[:4]) == control
+        assert len(mapped.font_bytes) == 4 + 16
+        assert not mapped.index()
+
+
+def test_viewer_maps_bin_files_and_sets_addressing(tmp_path):
+    blob, control, _ = _sample_blob("vertical")
+    path = tmp_path / "font.bin"
+    path.write_bytes(blob)
+    mode = SimpleNamespace(value="horizontal")
+    viewer = object.__new__(FontViewer)
+    viewer.addr_mode_var = SimpleNamespace(
+        get=lambda: mode.value, set=lambda v: setattr(mode, "value", v))
+
+    font_bytes = viewer._parse_font_file(str(path))
+    assert list(font_bytes[:4]) == control
+    assert mode.value == "vertical"
+    viewer._close_font_map()
+
+
+def test_convert_font_returns_bytes_for_bin_extension(test_font):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    if not isinstance(test_font.path, str):
+        pytest.skip("Needs a TrueType font file on disk.")
+    params = make_params(width=16, height=16, start=65, end=66, ext="bin")
+    blob = engine.convert_font(test_font.path, params)
+    header = read_blob_header(blob)
+    assert isinstance(blob, bytes)
+    assert header.data_len == 4 + 2 * 32
+
+
+def test_blob_layout_byte_records_transform():
+    params = make_params(width=8, height=16, addr_mode="vertical",
+                         rotation=270, mirror="horizontal")
+    blob = pack_font_blob([16, 8, 0x41, 0], [("A", [0] * 16)], params)
+    header = read_blob_header(blob)
+    assert (header.layout, header.rotation, header.mirror) == ("vertical", 270, "horizontal")
+    assert (header.width, header.height) == (16, 8)
+
+
+def test_wide_ranges_keep_full_values_in_the_header(tmp_path, test_font_path):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    params = make_params(width=8, height=8, start=32, end=400, ext="bin")
+    path = tmp_path / "wide.bin"
+    path.write_bytes(engine.convert_font(test_font_path, params))
+    with MappedFont(str(path)) as mapped:
+        assert (mapped.header.first_code, mapped.header.glyph_count) == (32, 369)
+        assert mapped.header.last_offset == 368
+        assert list(mapped.font_bytes[2:4]) == [32, 0xFF]
+        assert mapped.codes() == list(range(32, 401))
+
+
+def test_codes_past_sixteen_bits_are_rejected():
+    params = make_params(width=8, height=8)
+    with pytest.raises(ValueError, match="0xFFFF"):
+        pack_font_blob([8, 8, 0x10000, 0], [("x", [0] * 8)], params)
+
+
+def test_cells_past_255_pixels_are_rejected():
+    params = make_params(width=256, height=8)
+    with pytest.raises(ValueError, match="255x255"):
+        pack_font_blob([256, 8, 32, 0], [(" ", [0] * 256)], params)
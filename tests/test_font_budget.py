@@ -0,0 +1,58 @@
+# pylint: disable=missing-docstring,protected-access
+import re
+
+import pytest
+
+from colossus_ltsm import colossus_cli
+from colossus_ltsm.font_budget import BudgetPlanner, array_size, parse_ranges
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_exporters import EXPORTERS
+
+
+def _engine():
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    return engine
+
+
+def test_parse_ranges():
+    assert parse_ranges("32-126, 0x30-0x39,65") == [(32, 126), (48, 57), (65, 65)]
+    with pytest.raises(ValueError):
+        parse_ranges("a-z")
+
+
+@pytest.mark.parametrize("layout,rotation", [("horizontal", 0), ("vertical", 90),
+                                             ("horizontal_word32", 0)])
+def test_array_size_matches_converted_output(test_font_path, layout, rotation):
+    params = make_params(width=16, height=24, start=48, end=57,
+                         addr_mode=layout, rotation=rotation)
+    text = _engine().convert_font(test_font_path, params)
+    total = int(re.search(r"// Total size: (\d+) bytes", text).group(1))
+    assert array_size(params, 10) == total
+    binary = _engine().convert_font(test_font_path, dict(params, ext="bin"))
+    assert array_size(params, 10, "bin") == len(binary)
+
+
+def test_u8g2_flash_size_matches_export(test_font_path):
+    engine = _engine()
+    params = make_params(start=32, end=126)
+    engine.convert_font(test_font_path, params)
+    text = engine.export_formats(["u8g2"], params)["u8g2"]
+    size = int(re.search(r"size (\d+) bytes", text).group(1))
+    assert EXPORTERS["u8g2"].flash_size(engine.export_glyphs(params)) == size
+
+
+def test_plan_keeps_within_budget_and_ranks_fidelity(test_font_path):
+    params = make_params(start=48, end=57)
+    plan = BudgetPlanner().plan(test_font_path, params, 400, [(8, 8), (16, 16), (24, 24)],
+                                formats=["array", "u8g2"])
+    assert plan and all(c.size <= 400 for c in plan)
+    sizes = [c.font_size for c in plan]
+    assert sizes == sorted(sizes, reverse=True)
+    assert {(c.width, c.fmt) for c in plan} >= {(8, "array"), (16, "array")}
+
+
+def test_cli_budget_reports_nothing_fits(test_font_path, capsys):
+    code = colossus_cli.main(["budget", test_font_path, "--budget", "10"])
+    assert code == 1
+    assert "Nothing fits" in capsys.readouterr().out
@@ -0,0 +1,68 @@
+# pylint: disable=missing-docstring
+import os
+import shutil
+from pathlib import Path
+
+from PIL import ImageFont
+
+from colossus_ltsm import colossus_cli
+from colossus_ltsm.font_catalog import FontCatalog, code_ranges, read_font_record
+
+EXTRAS_TTF = Path(__file__).resolve().parents[1] / "extras" / "ttf"
+
+
+def _font_dir(tmp_path):
+    fonts = tmp_path / "fonts"
+    fonts.mkdir()
+    for name in ("FreeSans.ttf", "OCRA.ttf"):
+        shutil.copy(EXTRAS_TTF / name, fonts / name)
+    (fonts / "broken.ttf").write_bytes(b"not a font")
+    return fonts
+
+
+def test_record_matches_pillow(test_font_path):
+    record = read_font_record(test_font_path)
+    assert (record.family, record.style) == ImageFont.truetype(test_font_path, 10).getname()
+    assert record.units_per_em > 0 and record.ascent > 0 > record.descent
+    assert record.covers(32, 126)
+    assert record.coverage(32, 126) == 1.0
+
+
+def test_code_ranges():
+    assert code_ranges([5, 1, 2, 3, 7]) == [[1, 3], [5, 5], [7, 7]]
+
+
+def test_scan_only_parses_changed_files(tmp_path):
+    fonts = _font_dir(tmp_path)
+    index = tmp_path / "catalog.json"
+    counts = FontCatalog(index).scan([fonts])
+    assert (counts["added"], counts["failed"]) == (2, 1)
+
+    catalog = FontCatalog(index)
+    assert len(catalog.records) == 2
+    assert catalog.scan([fonts])["unchanged"] == 2
+
+    ocra = fonts / "OCRA.ttf"
+    os.utime(ocra, ns=(ocra.stat().st_atime_ns, ocra.stat().st_mtime_ns + 10**9))
+    (fonts / "FreeSans.ttf").unlink()
+    counts = catalog.scan([fonts])
+    assert (counts["updated"], counts["removed"]) == (1, 1)
+    assert [r.family for r in FontCatalog(index).search()] == ["OCR A"]
+
+
+def test_search_by_words_and_coverage(tmp_path):
+    catalog = FontCatalog(tmp_path / "catalog.json")
+    catalog.scan([_font_dir(tmp_path)])
+    assert [r.family for r in catalog.search("free regular")] == ["FreeSans"]
+    assert [r.family for r in catalog.search(covering=[(0x410, 0x44F)])] == ["FreeSans"]
+    assert len(catalog.search(covering=[(32, 90)])) == 2
+    assert len(catalog.search(limit=1)) == 1
+
+
+def test_cli_fonts(tmp_path, capsys):
+    fonts = _font_dir(tmp_path)
+    index = str(tmp_path / "catalog.json")
+    assert colossus_cli.main(["fonts", "ocr", "--scan", str(fonts), "--index", index]) == 0
+    out = capsys.readouterr().out
+    assert "OCR A Regular" in out and str(fonts / "OCRA.ttf") in out
+    assert colossus_cli.main(["fonts", "no such font", "--index", index]) == 1
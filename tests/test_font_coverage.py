@@ -0,0 +1,76 @@
+# pylint: disable=missing-docstring,protected-access
+import struct
+from pathlib import Path
+
+import pytest
+from PIL import ImageFont
+
+from colossus_ltsm.font_coverage import font_coverage, read_cmap
+from colossus_ltsm.font_engine import FontEngine, make_params
+
+# Digits-and-ASCII-only font shipped for testing, nothing above 0x7E
+DIGITAL_TTF = Path(__file__).resolve().parents[1] / "extras" / "ttf" / "7linedigital.ttf"
+
+
+def _sfnt_with_cmap(subtable, platform=3, encoding=10):
+    cmap = struct.pack(">HHHHI", 0, 1, platform, encoding, 12) + subtable
+    directory = struct.pack(">4sHHHH", b"\x00\x01\x00\x00", 1, 16, 0, 0)
+    return directory + struct.pack(">4sIII", b"cmap", 0, 28, len(cmap)) + cmap
+
+
+def _engine():
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    return engine
+
+
+def test_read_cmap_format12_groups():
+    groups = [(0x41, 0x43, 5), (0x1F600, 0x1F601, 9)]
+    body = b"".join(struct.pack(">III", *group) for group in groups)
+    subtable = struct.pack(">HHIII", 12, 0, 16 + len(body), 0, len(groups)) + body
+    assert read_cmap(_sfnt_with_cmap(subtable)) == {0x41, 0x42, 0x43, 0x1F600, 0x1F601}
+
+
+def test_read_cmap_format4_segments():
+    # One delta-mapped segment 0x30-0x39 plus the required 0xFFFF terminator
+    seg_count = 2
+    subtable = struct.pack(">HHHHHHH", 4, 0, 0, seg_count * 2, 0, 0, 0)
+    subtable += struct.pack(">2H", 0x39, 0xFFFF) + b"\x00\x00"
+    subtable += struct.pack(">2H", 0x30, 0xFFFF)
+    subtable += struct.pack(">2h", -0x2F, 1)
+    subtable += struct.pack(">2H", 0, 0)
+    assert read_cmap(_sfnt_with_cmap(subtable, 3, 1)) == set(range(0x30, 0x3A))
+
+
+def test_read_cmap_rejects_non_font():
+    with pytest.raises(ValueError):
+        read_cmap(b"not a font at all")
+
+
+def test_font_coverage_is_cached_per_file():
+    first = font_coverage(str(DIGITAL_TTF))
+    assert first is font_coverage(str(DIGITAL_TTF))
+    assert first.missing(0x7D, 0x81) == [0x7F, 0x80, 0x81]
+    assert font_coverage("no/such/font.ttf") is None
+
+
+@pytest.mark.parametrize("mode", ["skip", "substitute", "flag"])
+def test_missing_code_points_follow_mode(mode):
+    font = ImageFont.truetype(str(DIGITAL_TTF), 16)
+    params = make_params(start=0x3F, end=0x80, missing=mode)
+    blocks = _engine()._generate_glyph_blocks(font, params)
+    question, missing = blocks[0][1], blocks[-1][1]
+    assert blocks[-1][0] == chr(0x80)
+    if mode == "skip":
+        assert not any(missing)
+    elif mode == "substitute":
+        assert missing == question
+    else:
+        assert missing != question
+
+
+def test_missing_glyphs_do_not_move_the_baseline():
+    font = ImageFont.truetype(str(DIGITAL_TTF), 16)
+    engine = _engine()
+    assert engine._scan_ink_extents(font, 0x20, 0xFF) == engine._scan_ink_extents(
+        font, 0x20, 0x7E)
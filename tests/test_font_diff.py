@@ -0,0 +1,74 @@
+# pylint: disable=missing-docstring,redefined-outer-name
+import pytest
+
+from colossus_ltsm import colossus_cli
+from colossus_ltsm.font_diff import (ADDED_COLOR, REMOVED_COLOR, FontGlyphs, diff_fonts,
+                                     load_glyphs, overlay, render_diff)
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.glyph_editor import GlyphEditor
+
+
+def _convert(engine, ttf, path, **params):
+    params = make_params(width=8, height=16, addr_mode="vertical", **params)
+    output = engine.convert_font(ttf, params)
+    if isinstance(output, bytes):
+        path.write_bytes(output)
+    else:
+        path.write_text(output, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def fonts(tmp_path, test_font_path):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None # pylint: disable=protected-access
+    old = _convert(engine, test_font_path, tmp_path / "old.hpp", start=65, end=70)
+    new = _convert(engine, test_font_path, tmp_path / "new.hpp", start=65, end=72)
+    editor = GlyphEditor(new, "vertical")
+    editor.toggle(1, 0, 0)
+    editor.save()
+    return old, new
+
+
+def test_only_edited_glyphs_differ(fonts):
+    old, new = fonts
+    diff = diff_fonts(load_glyphs(old), load_glyphs(new))
+    assert load_glyphs(new).layout == "vertical"
+    assert (diff.changed, diff.added, diff.removed) == ([66], [71, 72], [])
+    assert not diff.identical
+    assert diff_fonts(load_glyphs(old), load_glyphs(old)).identical
+
+
+def test_subset_fonts_compare_by_code_point(tmp_path, test_font_path):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None # pylint: disable=protected-access
+    old = _convert(engine, test_font_path, tmp_path / "a.hpp", codepoints=[65, 67, 90])
+    new = _convert(engine, test_font_path, tmp_path / "b.bin", ext="bin", codepoints=[65, 90])
+    assert list(load_glyphs(old).glyphs) == [65, 67, 90]
+    diff = diff_fonts(load_glyphs(old), load_glyphs(new))
+    assert (diff.changed, diff.added, diff.removed) == ([], [], [67])
+
+
+def test_overlay_colours_changed_pixels(fonts):
+    old, new = fonts
+    old, new = load_glyphs(old), load_glyphs(new)
+    image = overlay(old.image(66), new.image(66))
+    assert image.getpixel((0, 0)) in (ADDED_COLOR, REMOVED_COLOR)
+    assert render_diff(diff_fonts(old, new), scale=2).size == (3 * 16 + 16, 32 + 20)
+    assert render_diff(diff_fonts(old, old)) is None
+
+
+def test_thousands_of_glyphs_compare_by_bytes():
+    glyphs = {code: bytes([code & 0xFF]) * 16 for code in range(5000)}
+    edited = {**glyphs, 4000: bytes(16)}
+    diff = diff_fonts(FontGlyphs("a", 8, 16, "vertical", glyphs),
+                      FontGlyphs("b", 8, 16, "vertical", edited))
+    assert diff.changed == [4000]
+
+
+def test_cli_diff_writes_png(fonts, tmp_path):
+    old, new = fonts
+    png = tmp_path / "diff.png"
+    assert colossus_cli.main(["diff", str(old), str(new), "-o", str(png)]) == 1
+    assert png.stat().st_size > 0
+    assert colossus_cli.main(["diff", str(old), str(old)]) == 0
@@ -0,0 +1,133 @@
+# pylint: disable=missing-docstring,protected-access,redefined-outer-name
+import os
+import shutil
+
+import pytest
+from colossus_ltsm.font_engine import FontEngine, make_params
+
+
+def _make_engine():
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    return engine
+
+
+def _ink(glyph_blocks):
+    return sum(bin(b).count("1") for _, data in glyph_blocks for b in data)
+
+
+def test_make_params_fills_defaults():
+    params = make_params(width=32, addr_mode="vertical")
+    assert params["width"] == 32
+    assert params["height"] == 16
+    assert params["addr_mode"] == "vertical"
+    assert params["threshold"] == 128
+
+
+def test_repack_requires_cached_rasterization():
+    engine = _make_engine()
+    with pytest.raises(ValueError):
+        engine.repack_glyph_blocks(make_params())
+
+
+def test_repack_rethresholds_from_cache_without_font_calls(test_font):
+    engine = _make_engine()
+    params = make_params(width=24, height=32, start=65, end=70, antialias=True)
+    first = engine._generate_glyph_blocks(test_font, params)
+    cache = engine._glyph_cache
+
+    light = engine.repack_glyph_blocks(dict(params, threshold=250))
+    heavy = engine.repack_glyph_blocks(dict(params, threshold=10))
+    assert engine._glyph_cache is cache
+    assert _ink(light) < _ink(first) < _ink(heavy)
+    assert engine.repack_glyph_blocks(params) == first
+
+
+def test_embolden_adds_ink_and_keeps_block_size(test_font):
+    engine = _make_engine()
+    params = make_params(width=24, height=32, start=65, end=67)
+    plain = engine._generate_glyph_blocks(test_font, params)
+    bold = engine.repack_glyph_blocks(dict(params, embolden=1))
+
+    assert [len(data) for _, data in bold] == [len(data) for _, data in plain]
+    assert _ink(bold) > _ink(plain)
+
+
+def test_cache_is_rebuilt_when_cell_size_changes(test_font):
+    engine = _make_engine()
+    engine._generate_glyph_blocks(test_font, make_params(start=65, end=65))
+    first_cache = engine._glyph_cache
+    engine._generate_glyph_blocks(test_font, make_params(width=24, start=65, end=65))
+    assert engine._glyph_cache is not first_cache
+    assert engine._glyph_cache.glyphs[0].gray.size == (24, 16)
+
+
+def test_rotated_glyphs_swap_stored_dimensions(test_font):
+    engine = _make_engine()
+    params = make_params(width=24, height=16, start=65, end=65, addr_mode="vertical")
+    assert engine._validate_dimensions(dict(params, rotation=90)) is True
+    assert engine._validate_dimensions(dict(params, rotation=45)) is False
+    assert engine._glyph_dims(dict(params, rotation=270)) == (16, 24)
+
+    upright = engine._generate_glyph_blocks(test_font, params)
+    rotated = engine.repack_glyph_blocks(dict(params, rotation=90))
+    # 16 wide x 24 high, vertical pages: 3 pages of 16 columns
+    assert len(rotated[0][1]) == 48
+    assert len(upright[0][1]) == 48
+    assert rotated != upright
+
+
+def test_transforms_compose_like_the_image_operations(test_font):
+    engine = _make_engine()
+    params = make_params(width=24, height=24, start=66, end=66)
+    engine._generate_glyph_blocks(test_font, params)
+    half_turn = engine.repack_glyph_blocks(dict(params, rotation=180))
+    both_flips = engine.repack_glyph_blocks(dict(params, rotation=180, mirror="horizontal"))
+    flipped = engine.repack_glyph_blocks(dict(params, mirror="vertical"))
+    assert half_turn != engine.repack_glyph_blocks(params)
+    assert both_flips == flipped
+
+
+def test_auto_fit_picks_largest_size_that_fits(test_font_path):
+    engine = _make_engine()
+    params = make_params(width=16, height=24, auto_fit=True)
+    font = engine.open_font(test_font_path, params)
+    above, below, width = engine._scan_ink_bounds(font, range(32, 127))
+    assert above + below <= 24 and width <= 16
+    bigger = engine._scan_ink_bounds(font.font_variant(size=font.size + 1), range(32, 127))
+    assert bigger[0] + bigger[1] > 24 or bigger[2] > 16
+
+
+def test_auto_fit_needs_no_glyph_scaling(test_font_path):
+    engine = _make_engine()
+    params = make_params(width=16, height=16, start=32, end=126, auto_fit=True)
+    cache = engine._rasterize_glyphs(engine.open_font(test_font_path, params), params)
+    assert not cache.scaled_chars
+
+
+def test_font_size_overrides_cell_height(test_font_path):
+    font = _make_engine().open_font(test_font_path, make_params(height=16, font_size=11))
+    assert font.size == 11
+
+
+def test_parallel_rasterization_matches_serial(test_font_path):
+    params = make_params(width=16, height=24, start=32, end=160, antialias=True)
+    serial = _make_engine().convert_font(test_font_path, params)
+    parallel = _make_engine().convert_font(test_font_path, dict(params, jobs=2))
+    assert parallel == serial
+
+
+def test_font_file_overwritten_in_place_is_rasterized_again(tmp_path, test_font_path):
+    path = tmp_path / "font.ttf"
+    shutil.copy(test_font_path, path)
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    params = make_params(start=65, end=70)
+    engine.convert_font(str(path), params)
+    engine.convert_font(str(path), params)
+    assert engine.instruments.counters["cache_hits"] == 1
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    engine.convert_font(str(path), params)
+    assert engine.instruments.counters["cache_misses"] == 1
+    assert engine.repack_glyph_blocks(params)
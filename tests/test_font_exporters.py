@@ -0,0 +1,121 @@
+# pylint: disable=missing-docstring,protected-access,redefined-outer-name
+import re
+
+import pytest
+from PIL import Image
+
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_exporters import (_BitWriter, export_path, glyph_bitstream,
+                                          make_export_glyph)
+
+
+def _hex_bytes(text, array_start):
+    body = text[text.index(array_start):]
+    body = body[body.index("{") + 1:body.index("};")]
+    body = re.sub(r"//.*", "", body)
+    return [int(b, 16) for b in re.findall(r"0x([0-9A-F]{2})", body)]
+
+
+class _U8g2Reader:
+    """Mirror of u8g2_font_decode_get_unsigned_bits (LSB-first)."""
+
+    def __init__(self, data):
+        self.value = int.from_bytes(bytes(data), "little")
+        self.pos = 0
+
+    def get(self, bits):
+        val = (self.value >> self.pos) & ((1 << bits) - 1)
+        self.pos += bits
+        return val
+
+    def get_signed(self, bits):
+        return self.get(bits) - (1 << (bits - 1))
+
+
+def _u8g2_decode(font, code):
+    """Decode one glyph the way u8g2_font_decode_glyph does."""
+    bits = dict(zip(("r0", "r1", "w", "h", "x", "y", "d"), font[2:9]))
+    pos = 23 + ((font[19] << 8) | font[20] if code >= ord("a") else
+                (font[17] << 8) | font[18] if code >= ord("A") else 0)
+    while font[pos + 1] != 0:
+        if font[pos] == code:
+            break
+        pos += font[pos + 1]
+    else:
+        return None
+    reader = _U8g2Reader(font[pos + 2:pos + font[pos + 1]])
+    width, height = reader.get(bits["w"]), reader.get(bits["h"])
+    x_off, y_off = reader.get_signed(bits["x"]), reader.get_signed(bits["y"])
+    advance = reader.get_signed(bits["d"])
+    pixels = []
+    while width and len(pixels) < width * height:
+        zeros, ones = reader.get(bits["r0"]), reader.get(bits["r1"])
+        while True:
+            pixels += [0] * zeros + [1] * ones
+            if not reader.get(1):
+                break
+    return width, height, x_off, y_off, advance, pixels
+
+
+@pytest.fixture
+def exported(test_font):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    params = make_params(width=24, height=32, start=32, end=126, font_name="Test")
+    engine._generate_glyph_blocks(test_font, params)
+    outputs = engine.export_formats(["gfx", "u8g2", "lvgl"], params)
+    return engine, params, outputs
+
+
+def test_bit_writer_is_lsb_first():
+    writer = _BitWriter()
+    writer.put(0b101, 3)
+    writer.put_signed(-1, 4)
+    assert writer.to_bytes() == [0b00111101]
+
+
+def test_bitstream_is_continuous_msb_first():
+    mono = Image.new("1", (10, 10), 0)
+    for x in range(3, 6):
+        mono.putpixel((x, 4), 1)
+        mono.putpixel((x, 5), 1)
+    glyph = make_export_glyph(65, mono, origin_x=1, baseline_y=6, advance=7)
+    assert (glyph.width, glyph.height, glyph.x_offset, glyph.y_offset) == (3, 2, 2, -2)
+    assert glyph_bitstream(glyph) == [0b11111100]
+
+
+def test_u8g2_glyphs_decode_to_the_rasterized_pixels(exported):
+    engine, params, outputs = exported
+    font = _hex_bytes(outputs["u8g2"], "u8g2_font_Test")
+    cache = engine._glyph_cache
+    assert font[0] == 95
+    for cached in cache.glyphs:
+        glyph = make_export_glyph(cached.code, engine._threshold_glyph(cached.gray, params),
+                                  cached.origin_x, cache.baseline_y, cached.advance)
+        decoded = _u8g2_decode(font, cached.code)
+        assert decoded is not None
+        width, height, x_off, y_off, advance, pixels = decoded
+        assert (width, height, x_off, advance) == (glyph.width, glyph.height,
+                                                    glyph.x_offset, glyph.advance)
+        if width:
+            assert y_off == -(glyph.y_offset + glyph.height)
+            assert pixels[:width * height] == [
+                1 if p else 0 for p in glyph.bitmap.convert("L").tobytes()]
+
+
+def test_gfx_and_lvgl_list_every_glyph(exported):
+    _, _, outputs = exported
+    gfx = outputs["gfx"]
+    assert gfx.count("// 0x") == 95
+    assert "0x20, 0x7E, 32 };" in gfx
+    lvgl = outputs["lvgl"]
+    assert lvgl.count("/* U+") == 95
+    assert ".range_start = 32, .range_length = 95" in lvgl
+    assert "const lv_font_t lv_font_Test" in lvgl
+
+
+def test_export_path_sits_beside_main_output():
+    assert export_path("/tmp/fonts/my_font.hpp", "gfx") == "/tmp/fonts/my_font_gfx.h"
+    assert export_path("my_font.hpp", "lvgl") == "my_font_lvgl.c"
+    with pytest.raises(ValueError):
+        export_path("my_font.hpp", "bdf")
@@ -0,0 +1,60 @@
+# pylint: disable=missing-docstring,redefined-outer-name
+import pytest
+
+from colossus_ltsm.font_header import HeaderFont
+
+HEADER = """// Test font, /* not a block */
+const uint8_t Tiny[] = {
+0x08,0x02,0x7B,0x02,
+0x00,0xff, // '{'
+0x18,0x3C, // '|'
+0x3C,0x18, // '}'
+};
+const uint8_t Tiny_index[] = {1, 2};
+"""
+
+
+@pytest.fixture
+def header(tmp_path):
+    path = tmp_path / "tiny.hpp"
+    path.write_bytes(HEADER.encode("utf-8"))
+    return path
+
+
+def test_values_and_offsets(header):
+    font = HeaderFont(header)
+    assert font.font_bytes == [8, 2, 0x7B, 2, 0, 0xFF, 0x18, 0x3C, 0x3C, 0x18]
+    start, end = font.spans[5]
+    assert header.read_bytes()[start:end] == b"0xff"
+    assert list(font.glyph_range(2, 2)) == [8, 9]
+
+
+def test_write_patches_values_in_place(header):
+    font = HeaderFont(header)
+    assert font.write({5: 0x81, 8: 0x7E, 9: 0x18}) == [5, 8]
+    expected = HEADER.replace("0xff", "0x81").replace("0x3C,0x18, // '}'", "0x7E,0x18, // '}'")
+    assert header.read_text(encoding="utf-8") == expected
+    assert HeaderFont(header).font_bytes == font.font_bytes
+
+
+def test_wider_values_replace_the_file(tmp_path):
+    path = tmp_path / "dec.h"
+    path.write_text("char f[] = {8, 1, 65, 0, 7};\n", encoding="utf-8")
+    font = HeaderFont(path)
+    font.write({4: 200})
+    assert path.read_text(encoding="utf-8") == "char f[] = {8, 1, 65, 0, 200};\n"
+    assert font.spans[4] == (25, 28) and font.font_bytes[4] == 200
+
+
+def test_write_refuses_a_file_changed_on_disk(header):
+    font = HeaderFont(header)
+    header.write_text(HEADER + "// edited\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="changed on disk"):
+        font.write({4: 1})
+
+
+def test_missing_array_is_an_error(tmp_path):
+    path = tmp_path / "empty.h"
+    path.write_text("// nothing {here}\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="No font data"):
+        HeaderFont(path)
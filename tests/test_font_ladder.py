@@ -0,0 +1,41 @@
+# pylint: disable=missing-docstring
+from pathlib import Path
+
+import pytest
+
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_ladder import (compose_family, convert_ladder, ladder_path,
+                                       parse_sizes, size_params)
+
+
+def test_parse_sizes():
+    assert parse_sizes("8x8, 16X24,32") == [(8, 8), (16, 24), (32, 32)]
+    with pytest.raises(ValueError):
+        parse_sizes("8xeight")
+
+
+def test_ladder_path():
+    assert ladder_path("out/font.hpp", 16, 24) == Path("out/font_16x24.hpp")
+
+
+def test_ladder_matches_single_conversions(test_font_path):
+    params = make_params(start=65, end=70)
+    results = convert_ladder(test_font_path, params, [(8, 8), (16, 16)], jobs=1)
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None # pylint: disable=protected-access
+    for (width, height), (rung, output, messages) in zip([(8, 8), (16, 16)], results):
+        assert rung['font_name'] == f"MyFontName_{width}x{height}"
+        assert output == engine.convert_font(test_font_path, size_params(params, width, height))
+        assert messages
+    family = compose_family(results)
+    assert "MyFontName_8x8 = {" in family and "MyFontName_16x16 = {" in family
+
+
+def test_ladder_pool_matches_serial(test_font_path):
+    params = make_params(start=65, end=66, ext="bin")
+    sizes = [(8, 8), (16, 16), (24, 24)]
+    serial = convert_ladder(test_font_path, params, sizes, jobs=1)
+    pooled = convert_ladder(test_font_path, params, sizes, jobs=2)
+    assert [out for _, out, _ in pooled] == [out for _, out, _ in serial]
+    with pytest.raises(ValueError):
+        compose_family(pooled)
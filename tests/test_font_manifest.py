@@ -0,0 +1,65 @@
+# pylint: disable=missing-docstring
+import pytest
+
+from colossus_ltsm import colossus_cli
+from colossus_ltsm.font_manifest import depfile_text, is_up_to_date, manifest_path
+
+
+def _convert(test_font_path, out, *extra):
+    return colossus_cli.main(["convert", test_font_path, "-o", str(out), "--start", "65",
+                              "--end", "70", "--manifest", *extra])
+
+
+def test_manifest_skips_unchanged_conversion(tmp_path, test_font_path, capsys):
+    out = tmp_path / "font.hpp"
+    assert _convert(test_font_path, out) == 0
+    assert manifest_path(out).is_file()
+    capsys.readouterr()
+    assert _convert(test_font_path, out) == 0
+    assert "Up to date" in capsys.readouterr().out
+    assert _convert(test_font_path, out, "--threshold", "100") == 0
+    assert "Saved:" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("change", ["edit_output", "delete_output", "add_format"])
+def test_manifest_rebuilds_when_outputs_change(tmp_path, test_font_path, capsys, change):
+    out = tmp_path / "font.hpp"
+    _convert(test_font_path, out)
+    extra = []
+    if change == "edit_output":
+        out.write_text("// edited\n", encoding="utf-8")
+    elif change == "delete_output":
+        out.unlink()
+    else:
+        extra = ["-f", "gfx"]
+    capsys.readouterr()
+    _convert(test_font_path, out, *extra)
+    assert "Up to date" not in capsys.readouterr().out
+    assert "Generated font" in out.read_text(encoding="utf-8")
+
+
+def test_manifest_tracks_corpus_files(tmp_path, test_font_path, capsys):
+    out = tmp_path / "font.hpp"
+    corpus = tmp_path / "strings.txt"
+    corpus.write_text("ABC", encoding="utf-8")
+    _convert(test_font_path, out, "--corpus", str(corpus))
+    assert not is_up_to_date(manifest_path(out), [test_font_path], {}, [str(out)])
+    corpus.write_text("ABD", encoding="utf-8")
+    capsys.readouterr()
+    _convert(test_font_path, out, "--corpus", str(corpus))
+    assert "Up to date" not in capsys.readouterr().out
+
+
+def test_depfile_lists_font_and_corpus(tmp_path, test_font_path):
+    out = tmp_path / "font.hpp"
+    corpus = tmp_path / "strings.txt"
+    corpus.write_text("ABC", encoding="utf-8")
+    depfile = tmp_path / "font.hpp.d"
+    _convert(test_font_path, out, "--corpus", str(corpus), "--depfile", str(depfile))
+    text = depfile.read_text(encoding="utf-8")
+    assert text.startswith(f"{out}:")
+    assert test_font_path.replace(" ", "\\ ") in text and str(corpus) in text
+
+
+def test_depfile_escapes_make_characters():
+    assert depfile_text(["out dir/a.h"], ["f$#.ttf"]) == "out\\ dir/a.h: \\\n  f$$\\#.ttf\n"
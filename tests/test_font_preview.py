@@ -0,0 +1,82 @@
+# pylint: disable=missing-docstring,protected-access
+import base64
+import io
+
+import pytest
+from PIL import Image, ImageChops
+
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_preview import PreviewRenderer, preview_png
+
+
+def test_sheet_shows_the_first_glyphs_in_a_grid(test_font_path):
+    sheet = PreviewRenderer().render(test_font_path, make_params(), count=20, columns=8)
+    assert sheet.mode == "1"
+    assert sheet.size == (8 * 17 + 1, 3 * 17 + 1)
+
+
+def test_layouts_decode_to_the_same_pixels(test_font_path):
+    renderer = PreviewRenderer()
+    sheets = [renderer.render(test_font_path, make_params(addr_mode=layout))
+              for layout in ("horizontal", "vertical", "horizontal_word32")]
+    assert ImageChops.difference(sheets[0], sheets[1]).getbbox() is None
+    assert ImageChops.difference(sheets[0], sheets[2]).getbbox() is None
+
+
+def test_option_changes_reuse_face_and_cells(test_font_path):
+    renderer = PreviewRenderer()
+    renderer.render(test_font_path, make_params())
+    face = renderer._face
+    for change in ({"threshold": 40}, {"addr_mode": "vertical"}, {"rotation": 90}):
+        renderer.render(test_font_path, make_params(**change))
+        assert renderer.instruments.counters == {"cache_hits": 1}
+    renderer.render(test_font_path, make_params(width=24, height=16))
+    assert renderer._face is face
+    assert renderer.instruments.counters["cache_misses"] == 1
+
+
+def test_rotation_swaps_cells(test_font_path):
+    params = make_params(width=16, height=24, rotation=90, addr_mode="vertical")
+    sheet = PreviewRenderer().render(test_font_path, params, count=1)
+    assert sheet.size == (26, 18)
+
+
+def test_unsuitable_layout_raises(test_font_path):
+    with pytest.raises(ValueError):
+        PreviewRenderer().render(test_font_path, make_params(width=12))
+
+
+def test_preview_png_scales_and_colours():
+    sheet = Image.new("1", (10, 5), 0)
+    sheet.putpixel((0, 0), 1)
+    data = base64.b64decode(preview_png(sheet, "#FF0000", "#000000", max_width=40))
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.size == (40, 20)
+        assert image.convert("RGB").getpixel((3, 3)) == (255, 0, 0)
+        assert image.convert("RGB").getpixel((4, 4)) == (0, 0, 0)
+
+
+def test_preview_reuses_converted_cells_but_keeps_its_own(test_font_path):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    engine.convert_font(test_font_path, make_params(start=65, end=90))
+    converted = engine._glyph_cache
+    renderer = PreviewRenderer(engine)
+    renderer.render(test_font_path, make_params(start=65, end=90, addr_mode="vertical"))
+    assert renderer.instruments.counters == {"cache_hits": 1}
+    renderer.render(test_font_path, make_params(start=65, end=122))
+    assert renderer.instruments.counters["cache_misses"] == 1
+    assert engine._glyph_cache is converted
+
+
+def test_only_the_sample_is_rasterized_with_the_range_baseline(test_font_path):
+    params = make_params(start=32, end=255)
+    renderer = PreviewRenderer()
+    sheet = renderer.render(test_font_path, params, count=16, columns=16)
+    assert len(renderer._glyph_cache.glyphs) == 16
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    engine.convert_font(test_font_path, params)
+    assert renderer._glyph_cache.baseline_y == engine._glyph_cache.baseline_y
+    full = PreviewRenderer(engine).render(test_font_path, params, count=16, columns=16)
+    assert ImageChops.difference(sheet, full).getbbox() is None
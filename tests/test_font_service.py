@@ -0,0 +1,127 @@
+# pylint: disable=missing-docstring,redefined-outer-name,protected-access
+import asyncio
+import base64
+import json
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_service import ConversionService, RequestError, request_params
+
+PARAMS = {"start": 65, "end": 70}
+
+
+@pytest.fixture
+def service():
+    service = ConversionService(jobs=1, cache_size=2)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def running(service):
+    """The service listening on an ephemeral port, served from a thread."""
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(service.start(port=0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield service, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    loop.close()
+
+
+def _post(url, request):
+    data = json.dumps(request).encode()
+    with urllib.request.urlopen(urllib.request.Request(url + "/convert", data=data)) as reply:
+        return reply.headers["X-Colossus-Source"], json.loads(reply.read())
+
+
+def test_repeat_requests_come_from_cache(running, test_font_path):
+    _, url = running
+    source, first = _post(url, {"ttf": test_font_path, "params": PARAMS})
+    assert source == "converted"
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None # pylint: disable=protected-access
+    assert first["output"] == engine.convert_font(test_font_path, make_params(**PARAMS))
+    upload = base64.b64encode(Path(test_font_path).read_bytes()).decode()
+    source, again = _post(url, {"ttf_base64": upload, "params": dict(PARAMS, jobs=4)})
+    assert (source, again) == ("cache", first)
+    with urllib.request.urlopen(url + "/stats") as reply:
+        stats = json.loads(reply.read())
+    assert (stats["requests"], stats["converted"], stats["cache_hits"]) == (2, 1, 1)
+
+
+def test_binary_output_and_exports(running, test_font_path):
+    _, url = running
+    _, result = _post(url, {"ttf": test_font_path,
+                            "params": dict(PARAMS, ext="bin", formats=["gfx"])})
+    assert base64.b64decode(result["output_base64"])
+    assert "GFXfont" in result["exports"]["gfx"]
+
+
+@pytest.mark.parametrize("request_body, status", [
+    ({"ttf": "missing.ttf"}, 400),
+    ({"ttf": "x.ttf", "params": {"colour": 1}}, 400),
+    ("not an object", 400),
+])
+def test_bad_requests(running, request_body, status):
+    _, url = running
+    with pytest.raises(urllib.error.HTTPError) as err:
+        _post(url, request_body)
+    assert err.value.code == status
+    assert "error" in json.loads(err.value.read())
+
+
+def test_identical_requests_in_flight_convert_once(service, test_font_path):
+    async def both():
+        request = {"ttf": test_font_path, "params": PARAMS}
+        return await asyncio.gather(service.convert(request), service.convert(request))
+
+    (first, source1), (second, source2) = asyncio.run(both())
+    assert first == second
+    assert (source1, source2) == ("converted", "shared")
+    assert service.stats["converted"] == 1
+
+
+def test_cache_evicts_least_recent(service, test_font_path):
+    async def run():
+        for end in (66, 67, 68):
+            await service.convert({"ttf": test_font_path, "params": {"start": 65, "end": end}})
+    asyncio.run(run())
+    assert len(service.cache) == 2
+
+
+def test_request_params_checks_layout():
+    assert request_params({"width": 8})["jobs"] == 1
+    with pytest.raises(RequestError):
+        request_params({"width": 12})
+
+
+def test_draw_sample_is_part_of_the_cache_key(service, test_font_path):
+    async def run():
+        replies = []
+        for sample in ("AB", "CD", "AB"):
+            params = dict(PARAMS, draw_sample=sample)
+            replies.append(await service.convert({"ttf": test_font_path, "params": params}))
+        return replies
+    (first, source1), (second, source2), (_, source3) = asyncio.run(run())
+    assert (source1, source2, source3) == ("converted", "converted", "cache")
+    assert '"AB"' in json.loads(first)["log"][-1][1]
+    assert '"CD"' in json.loads(second)["log"][-1][1]
+
+
+def test_font_digests_are_bounded(service, tmp_path, test_font_path):
+    async def run():
+        for i in range(4):
+            path = tmp_path / f"font{i}.ttf"
+            path.write_bytes(Path(test_font_path).read_bytes())
+            await service._font_digest(path)
+    asyncio.run(run())
+    assert len(service._digests) == service.cache_size
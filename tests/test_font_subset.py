@@ -0,0 +1,78 @@
+# pylint: disable=missing-docstring
+from pathlib import Path
+
+from colossus_ltsm.font_binary import MappedFont
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.font_subset import CorpusScanner, corpus_files, corpus_strings, scan_corpus
+
+
+def _engine():
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None # pylint: disable=protected-access
+    return engine
+
+
+def test_c_literals_skip_comments_and_includes(tmp_path):
+    source = tmp_path / "ui.cpp"
+    source.write_text('#include "display.h"\n'
+                      '// "not shown"\n'
+                      'lcd.print("http://x\\t\\"ok\\"\\xB0"); char c = \'#\'; /* \'q\' */\n',
+                      encoding="utf-8")
+    assert corpus_strings(source) == ['http://x\t"ok"\xb0', "#"]
+
+
+def test_json_and_po_string_tables(tmp_path):
+    (tmp_path / "menu.json").write_text('{"title": "Menu", "items": ["Go", 7]}',
+                                        encoding="utf-8")
+    (tmp_path / "de.po").write_text('msgid ""\nmsgstr ""\n"Content-Type: text/plain\\n"\n\n'
+                                    'msgid "Go"\nmsgstr "Los "\n"jetzt"\n', encoding="utf-8")
+    assert corpus_strings(tmp_path / "menu.json") == ["Menu", "Go"]
+    assert corpus_strings(tmp_path / "de.po") == ["Go", "Los ", "jetzt"]
+    codes = scan_corpus([tmp_path])
+    assert "".join(map(chr, codes)) == " GLMejnostuz"
+
+
+def test_subset_header_lists_index_and_shrinks(test_font_path):
+    params = make_params(width=16, height=16, array_style="c",
+                         codepoints=[ord(c) for c in "HIé"])
+    text = _engine().convert_font(test_font_path, params)
+    full = _engine().convert_font(test_font_path, make_params(array_style="c"))
+    assert "static const unsigned char my_font_file[68] = {" in text
+    assert "0x10,0x10,0x48,0x01," in text
+    assert "my_font_file_index[2] = {\n0x48,0x49\n};" in text
+    assert len(text) < len(full)
+
+
+def test_subset_binary_stores_index(tmp_path, test_font_path):
+    params = make_params(ext="bin", codepoints=[ord("A"), ord("z")])
+    path = tmp_path / "font.bin"
+    path.write_bytes(_engine().convert_font(test_font_path, params))
+    with MappedFont(path) as font:
+        assert font.index() == [ord("A"), ord("z")]
+        assert font.header.glyph_count == 2
+
+
+def test_scanner_rereads_only_changed_files(tmp_path, monkeypatch):
+    (tmp_path / "a.c").write_text('puts("AB");', encoding="utf-8")
+    (tmp_path / "b.c").write_text('puts("C");', encoding="utf-8")
+    scanner = CorpusScanner()
+    assert scanner.scan([tmp_path]) == scan_corpus([tmp_path]) == [65, 66, 67]
+    read = []
+    original = Path.read_text
+    monkeypatch.setattr(Path, "read_text",
+                        lambda self, *a, **k: read.append(self.name) or original(self, *a, **k))
+    (tmp_path / "b.c").write_text('puts("Cd");', encoding="utf-8")
+    assert scanner.scan([tmp_path]) == [65, 66, 67, 100]
+    assert read == ["b.c"]
+
+
+def test_directory_corpus_skips_binary_files(tmp_path):
+    (tmp_path / "main.c").write_text('puts("Hi");', encoding="utf-8")
+    (tmp_path / "notes.txt").write_text("ok", encoding="utf-8")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "main.o").write_bytes(bytes(range(256)))
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\r\n\x1a\n\xff\xfe")
+    assert [path.name for path in corpus_files([tmp_path])] == ["main.c", "notes.txt"]
+    assert scan_corpus([tmp_path]) == [ord(char) for char in "Hiko"]
+    # A file named directly is always read
+    assert corpus_files([tmp_path / "logo.png"]) == [tmp_path / "logo.png"]
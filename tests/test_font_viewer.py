@@ -1,12 +1,29 @@
 # pylint: disable=missing-docstring,protected-access
 from types import SimpleNamespace
 
+from PIL import ImageChops
+
+from colossus_ltsm.font_engine import FontEngine, make_params
 from colossus_ltsm.font_viewer import FontViewer
+from colossus_ltsm.framebuffer import GlyphAtlas
+from colossus_ltsm.glyph_editor import GlyphEditor
+from colossus_ltsm.packers import get_packer
+
+
+class _Var:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
 
 
 def _make_viewer():
     viewer = object.__new__(FontViewer)
-    viewer.addr_mode_var = SimpleNamespace(get=lambda: "horizontal")
+    viewer.addr_mode_var = _Var("horizontal")
     return viewer
 
 
@@ -27,3 +44,115 @@ def test_calc_bytes_per_char_rounds_up_to_full_bytes():
     assert viewer._calc_bytes_per_char(8, 1) == 1
     assert viewer._calc_bytes_per_char(9, 1) == 2
     assert viewer._calc_bytes_per_char(16, 16) == 32
+
+
+def test_decode_glyph_uses_selected_layout():
+    viewer = _make_viewer()
+    glyph = viewer._decode_glyph([0x80, 0x01], 8, 2)
+    assert glyph.size == (8, 2)
+    assert glyph.getpixel((0, 0)) and glyph.getpixel((7, 1))
+    viewer.addr_mode_var = SimpleNamespace(get=lambda: "horizontal_lsb")
+    glyph = viewer._decode_glyph([0x80, 0x01], 8, 2)
+    assert glyph.getpixel((7, 0)) and glyph.getpixel((0, 1))
+
+
+def test_subset_header_glyphs_map_to_their_code_points(tmp_path, test_font_path):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    path = tmp_path / "subset.hpp"
+    path.write_text(engine.convert_font(test_font_path, make_params(
+        width=8, height=16, codepoints=[65, 67, 90])), encoding="utf-8")
+    viewer = _make_viewer()
+    viewer._font_map = None
+    font_bytes = viewer._parse_font_file(str(path))
+    assert viewer._glyph_codes() == [65, 67, 90]
+    atlas = GlyphAtlas(font_bytes, "horizontal", viewer._glyph_codes())
+    assert atlas.codes == [65, 67, 90] and atlas.get("B") is None
+    expected = get_packer("horizontal").unpack(font_bytes[4 + 2 * 16:4 + 3 * 16], 8, 16)
+    assert ImageChops.difference(atlas.get("Z").convert("L"),
+                                 expected.convert("L")).getbbox() is None
+
+
+class _Canvas:
+    """Records the items a viewer draws."""
+
+    def __init__(self):
+        self.labels = []
+        self.rectangles = []
+
+    def create_text(self, *_args, text, **_kwargs):
+        self.labels.append(text)
+
+    def create_rectangle(self, *args, tags="", **_kwargs):
+        self.rectangles.append((tags, args))
+
+    def delete(self, tag):
+        self.rectangles = [item for item in self.rectangles if tag not in ("all", item[0])]
+
+    def config(self, **_kwargs):
+        pass
+
+    def bbox(self, _tag):
+        return None
+
+
+def test_subset_labels_and_edits_use_the_glyph_code_points(tmp_path, test_font_path):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    path = tmp_path / "subset.hpp"
+    path.write_text(engine.convert_font(test_font_path, make_params(
+        width=8, height=16, codepoints=[65, 67, 90])), encoding="utf-8")
+    viewer = _make_viewer()
+    viewer._font_map = None
+    viewer.canvas = _Canvas()
+    viewer.scale, viewer.cols, viewer.glyph_color = 1, 16, "#FFFFFF"
+    font_bytes = viewer._parse_font_file(str(path))
+    viewer.render_font(font_bytes, viewer._glyph_codes())
+    assert viewer.canvas.labels == ["A", "C", "Z"]
+
+    viewer.current_font_bytes = font_bytes
+    viewer._atlas = GlyphAtlas(font_bytes, "horizontal", viewer._glyph_codes())
+    viewer._editor = GlyphEditor(viewer._header, "horizontal")
+    viewer._draw_emulator = viewer._update_edit_buttons = lambda: None
+    c_glyph = viewer._atlas.get("C")
+    viewer._editor.toggle(2, 0, 0)
+    viewer._redraw_glyph(2)
+    assert viewer._atlas.get("C") is c_glyph
+    assert viewer._atlas.get("Z").getpixel((0, 0)) == viewer._editor.image(2).getpixel((0, 0))
+
+
+
+def _layout_viewer(tmp_path, test_font_path, layout):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    path = tmp_path / "font.hpp"
+    path.write_text(engine.convert_font(test_font_path, make_params(
+        width=8, height=16, start=65, end=70, addr_mode=layout)), encoding="utf-8")
+    viewer = _make_viewer()
+    viewer._font_map = None
+    viewer.current_font_bytes = viewer._parse_font_file(str(path))
+    viewer._layout = viewer.addr_mode_var.get()
+    viewer._editor = GlyphEditor(viewer._header, viewer._layout)
+    rendered = []
+    viewer._validate_and_render = rendered.append
+    return viewer, rendered
+
+
+def test_header_layout_comment_selects_the_layout(tmp_path, test_font_path):
+    viewer, rendered = _layout_viewer(tmp_path, test_font_path, "vertical")
+    assert viewer._layout == "vertical"
+    viewer.addr_mode_var.set("horizontal")
+    viewer._on_layout_change()
+    assert rendered == [viewer.current_font_bytes]
+
+
+def test_layout_change_is_refused_with_unsaved_edits(tmp_path, test_font_path, monkeypatch):
+    viewer, rendered = _layout_viewer(tmp_path, test_font_path, "vertical")
+    warnings = []
+    monkeypatch.setattr("colossus_ltsm.font_viewer.messagebox.showwarning",
+                        lambda *args: warnings.append(args))
+    viewer._editor.toggle(0, 0, 0)
+    viewer.addr_mode_var.set("horizontal")
+    viewer._on_layout_change()
+    assert viewer.addr_mode_var.get() == "vertical"
+    assert not rendered and len(warnings) == 1
@@ -0,0 +1,92 @@
+# pylint: disable=missing-docstring,redefined-outer-name
+import json
+import os
+import shutil
+
+import pytest
+
+from colossus_ltsm import colossus_cli
+from colossus_ltsm.font_watch import Watcher, load_jobs
+
+
+def _touch(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+@pytest.fixture
+def project(tmp_path, test_font_path):
+    shutil.copy(test_font_path, tmp_path / "a.ttf")
+    shutil.copy(test_font_path, tmp_path / "b.ttf")
+    (tmp_path / "strings").mkdir()
+    (tmp_path / "strings" / "menu.json").write_text('{"title": "ABC"}', encoding="utf-8")
+    jobs = {"jobs": [
+        {"name": "a", "ttf": "a.ttf", "output": "out/a.hpp",
+         "params": {"start": 65, "end": 70}},
+        {"name": "b", "ttf": "b.ttf", "output": "strings/b.hpp",
+         "params": {"formats": ["gfx"]}, "corpus": ["strings"]},
+    ]}
+    (tmp_path / "fonts.json").write_text(json.dumps(jobs), encoding="utf-8")
+    return tmp_path
+
+
+def _names(results):
+    return [name for name, _, ok in results if ok]
+
+
+def test_start_builds_every_job(project):
+    watcher = Watcher(project / "fonts.json", log=lambda message: None)
+    assert _names(watcher.start()) == ["a", "b"]
+    assert (project / "out" / "a.hpp").is_file()
+    assert (project / "strings" / "b_gfx.h").is_file()
+    assert watcher.tick(now=100) == []
+
+
+def test_bursts_are_coalesced_and_only_affected_jobs_rebuilt(project):
+    watcher = Watcher(project / "fonts.json", settle=0.3, log=lambda message: None)
+    watcher.start()
+    _touch(project / "b.ttf")
+    assert watcher.tick(now=10.0) == []
+    (project / "strings" / "more.json").write_text('{"x": "xyz"}', encoding="utf-8")
+    assert watcher.tick(now=10.1) == []
+    assert watcher.tick(now=10.2) == []
+    assert _names(watcher.tick(now=10.5)) == ["b"]
+    assert "0x78" in (project / "strings" / "b.hpp").read_text(encoding="utf-8")
+    # Writing b.hpp into its own corpus directory does not trigger a build
+    assert watcher.tick(now=20) == [] and watcher.tick(now=21) == []
+
+
+def test_job_file_edit_rebuilds_changed_jobs_only(project):
+    watcher = Watcher(project / "fonts.json", settle=0, log=lambda message: None)
+    watcher.start()
+    before = (project / "out" / "a.hpp").read_text(encoding="utf-8")
+    jobs = json.loads((project / "fonts.json").read_text(encoding="utf-8"))
+    jobs["jobs"][0]["params"]["embolden"] = 1
+    (project / "fonts.json").write_text(json.dumps(jobs), encoding="utf-8")
+    _touch(project / "fonts.json")
+    watcher.tick(now=1)
+    assert _names(watcher.tick(now=2)) == ["a"]
+    assert (project / "out" / "a.hpp").read_text(encoding="utf-8") != before
+    assert watcher.engines["a"].instruments.counters["cache_hits"] == 1
+
+
+def test_failed_job_keeps_watching(project, capsys):
+    watcher = Watcher(project / "fonts.json", settle=0)
+    watcher.start()
+    (project / "a.ttf").write_bytes(b"half written")
+    watcher.tick(now=1)
+    assert watcher.tick(now=2) == [("a", pytest.approx(0, abs=5), False)]
+    assert "a: failed" in capsys.readouterr().out
+
+
+def test_load_jobs_rejects_unknown_params(tmp_path):
+    path = tmp_path / "fonts.json"
+    path.write_text('[{"ttf": "x.ttf", "output": "x.hpp", "params": {"colour": 1}}]',
+                    encoding="utf-8")
+    with pytest.raises(ValueError, match="colour"):
+        load_jobs(path)
+
+
+def test_cli_watch_once(project):
+    assert colossus_cli.main(["watch", str(project / "fonts.json"), "--once"]) == 0
+    assert (project / "out" / "a.hpp").is_file()
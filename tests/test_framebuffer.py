@@ -0,0 +1,70 @@
+# pylint: disable=missing-docstring,protected-access,redefined-outer-name
+import pytest
+from PIL import ImageChops
+
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.framebuffer import DISPLAYS, FramebufferEmulator, GlyphAtlas, rgb565
+
+
+@pytest.fixture
+def font_bytes(test_font):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    params = make_params(width=8, height=16, start=32, end=126, addr_mode="vertical")
+    blocks = engine._generate_glyph_blocks(test_font.font_variant(size=16), params)
+    return [8, 16, 32, 94] + [byte for _, data in blocks for byte in data]
+
+
+def test_atlas_decodes_every_glyph(font_bytes):
+    atlas = GlyphAtlas(font_bytes, "vertical")
+    assert len(atlas.glyphs) == 95
+    assert atlas.get("A").size == (8, 16)
+    assert atlas.get("é") is None
+
+
+def test_text_is_blitted_on_the_cell_grid(font_bytes):
+    atlas = GlyphAtlas(font_bytes, "vertical")
+    emulator = FramebufferEmulator("oled_128x64", atlas)
+    assert emulator.draw_text("AB\nC") == 3
+    cell = emulator.screen.crop((8, 0, 16, 16))
+    assert ImageChops.difference(cell.convert("L"), atlas.get("B").convert("L")).getbbox() is None
+    assert emulator.screen.crop((8, 16, 16, 32)).getbbox() is None
+
+
+def test_long_text_wraps_and_clips(font_bytes):
+    emulator = FramebufferEmulator("oled_128x64", GlyphAtlas(font_bytes, "vertical"))
+    assert emulator.layout("x" * 20) == ["x" * 16, "x" * 4]
+    assert emulator.layout("x" * 20, wrap=False) == ["x" * 16]
+    assert emulator.draw_text("y" * 1000) == 16 * 4
+    emulator.draw_text("café")
+    assert emulator.missing == {"é"}
+
+
+def test_page_buffer_round_trips(font_bytes):
+    emulator = FramebufferEmulator("oled_128x64", GlyphAtlas(font_bytes, "vertical"))
+    emulator.draw_text("Hello")
+    buffer = emulator.buffer()
+    assert len(buffer) == DISPLAYS["oled_128x64"].buffer_size == 1024
+    image = emulator.to_image("#FFFFFF", "#000000")
+    assert ImageChops.difference(image.convert("1"), emulator.screen).getbbox() is None
+
+
+def test_rgb565_buffer_holds_quantized_colours(font_bytes):
+    emulator = FramebufferEmulator("tft_320x240", GlyphAtlas(font_bytes, "vertical"))
+    emulator.draw_text("#" * 40)
+    buffer = emulator.buffer("#0078FF", "#000000")
+    assert len(buffer) == 320 * 240 * 2
+    lit = next(i for i in range(0, 320 * 16 * 2, 2) if buffer[i] or buffer[i + 1])
+    assert buffer[lit] << 8 | buffer[lit + 1] == rgb565("#0078FF") == 0x03DF
+    image = emulator.to_image("#0078FF", "#000000", scale=2)
+    assert image.size == (640, 480)
+    assert (0, 120, 248) in {color for _, color in image.getcolors()}
+
+
+def test_lines_are_composed_once(font_bytes):
+    emulator = FramebufferEmulator("tft_320x240", GlyphAtlas(font_bytes, "vertical"))
+    emulator.draw_text("first line\nsecond line")
+    strips = dict(emulator._lines)
+    emulator.draw_text("first line\nsecond line!")
+    assert emulator._lines["first line"] is strips["first line"]
+    assert len(emulator._lines) == 3
@@ -0,0 +1,44 @@
+# pylint: disable=missing-docstring,redefined-outer-name
+import pytest
+
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.glyph_editor import GlyphEditor
+
+
+@pytest.fixture
+def header(tmp_path, test_font_path):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None # pylint: disable=protected-access
+    params = make_params(width=8, height=16, start=65, end=70, addr_mode="vertical")
+    path = tmp_path / "font.hpp"
+    path.write_text(engine.convert_font(test_font_path, params), encoding="utf-8")
+    return path
+
+
+def test_toggle_undo_and_redo(header):
+    editor = GlyphEditor(header, "vertical")
+    before = editor.glyphs[1]
+    others = list(editor.glyphs)
+    assert editor.toggle(1, 0, 0) == 1
+    assert editor.image(1).getpixel((0, 0))
+    assert editor.dirty() == [1]
+    # Untouched glyphs keep their bitmap objects
+    assert all(editor.glyphs[i] is others[i] for i in (0, 2, 3, 4, 5))
+    assert editor.undo() == 1 and editor.glyphs[1] is before
+    assert editor.dirty() == [] and not editor.can_undo and editor.undo() is None
+    assert editor.redo() == 1 and editor.dirty() == [1]
+    with pytest.raises(ValueError):
+        editor.toggle(1, 8, 0)
+
+
+def test_save_rewrites_only_the_edited_glyph_line(header):
+    original = header.read_text(encoding="utf-8").splitlines()
+    editor = GlyphEditor(header, "vertical")
+    editor.toggle(2, 7, 15)
+    assert editor.save() == [2]
+    assert editor.dirty() == []
+    lines = header.read_text(encoding="utf-8").splitlines()
+    changed = [i for i, (old, new) in enumerate(zip(original, lines)) if old != new]
+    assert len(lines) == len(original) and len(changed) == 1
+    assert lines[changed[0]].endswith("// 'C'")
+    assert GlyphEditor(header, "vertical").glyphs == editor.glyphs
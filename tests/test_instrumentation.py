@@ -0,0 +1,62 @@
+# pylint: disable=missing-docstring,protected-access
+import json
+import time
+
+from colossus_ltsm import colossus_cli
+from colossus_ltsm.font_engine import FontEngine, make_params
+from colossus_ltsm.instrumentation import Instruments, json_sink
+
+
+def test_nested_phases_are_charged_exclusively():
+    instruments = Instruments()
+    with instruments.phase("load"):
+        with instruments.phase("scan"):
+            time.sleep(0.02)
+    assert instruments.timings["scan"] >= 0.02
+    assert instruments.timings["load"] < 0.01
+    assert instruments.total == sum(instruments.timings.values())
+
+
+def test_merge_and_summary():
+    batch = Instruments()
+    for _ in range(2):
+        one = Instruments()
+        with one.phase("pack"):
+            pass
+        one.count("glyphs", 95)
+        batch.merge(one.as_dict())
+    assert batch.counters == {"glyphs": 190}
+    assert batch.summary().startswith("Timing (ms): pack ")
+    assert batch.summary().endswith("| glyphs 190")
+
+
+def test_engine_records_phases_and_cache_hits(test_font):
+    engine = FontEngine()
+    engine._log = lambda *args, **kwargs: None
+    params = make_params(start=32, end=126)
+    engine._generate_glyph_blocks(test_font, params)
+    engine._generate_glyph_blocks(test_font, params)
+    counters = engine.instruments.counters
+    assert (counters["cache_misses"], counters["cache_hits"], counters["glyphs"]) == (1, 1, 95)
+    assert {"scan", "rasterize", "pack"} <= set(engine.instruments.timings)
+
+
+def test_cli_stats_appends_json_lines(tmp_path, test_font_path, capsys):
+    stats = tmp_path / "stats.jsonl"
+    for _ in range(2):
+        colossus_cli.main(["convert", test_font_path, "-o", str(tmp_path / "font.hpp"),
+                           "--stats", str(stats)])
+    records = [json.loads(line) for line in stats.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == 2
+    assert set(records[0]["timings"]) >= {"load", "scan", "rasterize", "pack", "format",
+                                          "write"}
+    assert records[0]["counters"]["output_bytes"] > 0
+    assert "Timing (ms): load" in capsys.readouterr().out
+
+
+def test_json_sink_appends(tmp_path):
+    path = tmp_path / "out.jsonl"
+    sink = json_sink(path)
+    sink({"a": 1})
+    sink({"b": 2})
+    assert path.read_text(encoding="utf-8") == '{"a": 1}\n{"b": 2}\n'
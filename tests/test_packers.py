@@ -0,0 +1,80 @@
+# pylint: disable=missing-docstring
+import random
+
+import pytest
+from PIL import Image
+
+from colossus_ltsm.packers import PACKERS, get_packer, layout_names
+
+
+def _random_glyph(width, height, seed=7):
+    rng = random.Random(seed)
+    img = Image.new("1", (width, height), 0)
+    for y in range(height):
+        for x in range(width):
+            if rng.random() < 0.4:
+                img.putpixel((x, y), 1)
+    return img
+
+
+def _legacy_horizontal(img, width, height):
+    glyph_bytes = []
+    for y in range(height):
+        for x_block in range(0, width, 8):
+            byte_val = 0
+            for bit in range(8):
+                xx = x_block + bit
+                pixel = img.getpixel((xx, y)) if xx < width else 0
+                byte_val = (byte_val << 1) | (1 if pixel else 0)
+            glyph_bytes.append(byte_val)
+    return glyph_bytes
+
+
+def _legacy_vertical(img, width, height):
+    glyph_bytes = []
+    for y_block in range(0, height, 8):
+        for x in range(width):
+            byte_val = 0
+            for bit in range(8):
+                yy = y_block + bit
+                if yy < height:
+                    byte_val |= (1 if img.getpixel((x, yy)) else 0) << bit
+            glyph_bytes.append(byte_val)
+    return glyph_bytes
+
+
+@pytest.mark.parametrize("name", layout_names())
+@pytest.mark.parametrize("size", [(8, 8), (16, 24), (24, 16), (40, 32)])
+def test_every_layout_round_trips(name, size):
+    packer = get_packer(name)
+    glyph = _random_glyph(*size)
+    data = packer.pack(glyph)
+
+    assert len(data) == packer.bytes_per_glyph(*size)
+    assert all(0 <= byte <= 0xFF for byte in data)
+    assert packer.unpack(data, *size).tobytes() == glyph.tobytes()
+
+
+@pytest.mark.parametrize("size", [(8, 8), (16, 16), (24, 32), (12, 10)])
+def test_vectorized_packers_match_legacy_bit_loops(size):
+    glyph = _random_glyph(*size, seed=3)
+    assert get_packer("horizontal").pack(glyph) == _legacy_horizontal(glyph, *size)
+    assert get_packer("vertical").pack(glyph) == _legacy_vertical(glyph, *size)
+
+
+def test_bit_and_word_orders():
+    glyph = Image.new("1", (16, 8), 0)
+    glyph.putpixel((0, 0), 1)
+    assert PACKERS["horizontal"].pack(glyph)[0] == 0x80
+    assert PACKERS["horizontal_lsb"].pack(glyph)[0] == 0x01
+    assert PACKERS["vertical"].pack(glyph)[0] == 0x01
+    assert PACKERS["vertical_msb"].pack(glyph)[0] == 0x80
+    # bit 15 of a little-endian word lives in the second byte
+    assert PACKERS["horizontal_word16"].pack(glyph)[:2] == [0x00, 0x80]
+    assert PACKERS["horizontal_word32"].pack(glyph)[:4] == [0x00, 0x00, 0x00, 0x80]
+    assert len(PACKERS["horizontal_word32"].pack(glyph)) == 4 * 8
+
+
+def test_unknown_layout_raises_value_error():
+    with pytest.raises(ValueError):
+        get_packer("diagonal")
@@ -21,6 +21,7 @@ def test_settings_save_and_reload_writes_config(tmp_path, monkeypatch):
     settings.set("display", "scale", 12)
     settings.set("debug", "debugOnOff", 1)
     settings.set("paths", "output_dir", "/tmp")
+    settings.flush()
 
     parser = configparser.ConfigParser()
     parser.read(config_path)
@@ -28,3 +29,50 @@ def test_settings_save_and_reload_writes_config(tmp_path, monkeypatch):
     assert parser.getint("display", "scale") == 12
     assert parser.getboolean("debug", "debugOnOff") is True
     assert parser.get("paths", "output_dir") == "/tmp"
+
+
+def _fresh_settings(tmp_path, monkeypatch):
+    config_path = tmp_path / "colossus_ltsm" / "colossus_ltsm.cfg"
+    monkeypatch.setattr(settings_module, "CL_CONFIG_PATH", config_path)
+    monkeypatch.setattr(settings_module.Settings, "CHECK_INTERVAL", 0)
+    return settings_module.Settings(), config_path
+
+
+def test_set_is_coalesced_into_one_atomic_save(tmp_path, monkeypatch):
+    settings, config_path = _fresh_settings(tmp_path, monkeypatch)
+    settings.getint("Display", "scale", 4)
+    before = config_path.read_text(encoding="utf-8")
+    settings.set("Display", "scale", 6)
+    settings.set("Display", "cols", 8)
+    assert config_path.read_text(encoding="utf-8") == before
+    assert settings.getint("Display", "scale", 4) == 6
+    settings.flush()
+    parser = configparser.ConfigParser()
+    parser.read(config_path)
+    assert (parser.getint("Display", "scale"), parser.getint("Display", "cols")) == (6, 8)
+    assert not list(config_path.parent.glob("*.tmp"))
+
+
+def test_snapshot_is_typed_and_refreshed_when_file_changes(tmp_path, monkeypatch):
+    settings, config_path = _fresh_settings(tmp_path, monkeypatch)
+    snapshot = settings.snapshot()
+    assert snapshot.debug is False and snapshot.scale == 4
+    assert settings.snapshot() is snapshot
+    text = config_path.read_text(encoding="utf-8").replace("debugonoff = 0", "debugonoff = 1")
+    config_path.write_text(text + "\n", encoding="utf-8")
+    assert settings.snapshot().debug is True
+
+
+def test_save_keeps_options_saved_by_another_process(tmp_path, monkeypatch):
+    first, config_path = _fresh_settings(tmp_path, monkeypatch)
+    second = settings_module.Settings()
+    first.getint("Display", "scale", 4)
+    second.getint("Display", "scale", 4)
+    second.set("Paths", "output_dir", "/srv/fonts")
+    second.flush()
+    first.set("Display", "scale", 9)
+    first.flush()
+    parser = configparser.ConfigParser()
+    parser.read(config_path)
+    assert parser.get("Paths", "output_dir") == "/srv/fonts"
+    assert parser.getint("Display", "scale") == 9
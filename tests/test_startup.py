@@ -0,0 +1,39 @@
+# pylint: disable=missing-docstring
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import colossus_ltsm
+
+SRC = str(Path(colossus_ltsm.__file__).resolve().parents[1])
+# Generous, the deferred modules below are the real guard against regressions
+IMPORT_BUDGET_US = 500_000
+DEFERRED = ("PIL", "colossus_ltsm.font_engine", "colossus_ltsm.font_converter",
+            "colossus_ltsm.font_viewer")
+
+
+def _import_times(module, home):
+    """Module -> cumulative microseconds, from python -X importtime."""
+    env = dict(os.environ, PYTHONPATH=SRC, HOME=str(home))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_gui_import_defers_pillow_and_pages(tmp_path):
+    times = _import_times("colossus_ltsm.colossus_main", tmp_path)
+    assert "colossus_ltsm.colossus_main" in times
+    assert not [name for name in times if name.split(".")[0] == "PIL" or name in DEFERRED]
+    assert times["colossus_ltsm.colossus_main"] < IMPORT_BUDGET_US
+
+
+def test_settings_import_does_not_touch_config(tmp_path):
+    _import_times("colossus_ltsm.settings", tmp_path)
+    assert not (tmp_path / ".config").exists()